@@ -2,41 +2,132 @@ from __future__ import annotations
 
 import datetime as dt
 import hashlib
+import os
+import time
 from contextlib import contextmanager
-from typing import Dict, Generator, Optional
+from typing import Dict, Generator, Optional, Sequence, Tuple
 
-from sqlalchemy import case, create_engine, func, select
-from sqlalchemy.pool import StaticPool
+from sqlalchemy import case, create_engine, delete, func, insert, or_, select, update
+from sqlalchemy.pool import NullPool, QueuePool, StaticPool
 from sqlalchemy.engine import Engine
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.exc import TimeoutError as SATimeoutError
 from sqlalchemy.orm import Session, sessionmaker, selectinload
 
+from . import metrics
 from .config import get_settings
-from .models import Audit, Base, Features, Job, JobStatus, Payload, Result, Tenant
+from .models import (
+    Audit,
+    Base,
+    Features,
+    Job,
+    JobStageTiming,
+    JobStatus,
+    Payload,
+    Result,
+    StageOutput,
+    StatementAggregate,
+    Tenant,
+    WebhookDelivery,
+    WebhookDeliveryStatus,
+    _uuid,
+)
+from .utils.timing import STAGES, seconds_since
 
 _engine: Optional[Engine] = None
+_engine_pid: Optional[int] = None
 _SessionLocal: Optional[sessionmaker] = None
 
 
+class _InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long checkouts wait and how often they time out."""
+
+    def _do_get(self):  # type: ignore[override]
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except SATimeoutError:
+            metrics.db_pool_timeouts_total.labels().inc()
+            raise
+        finally:
+            metrics.db_pool_wait_seconds.labels().observe(time.perf_counter() - start)
+
+
+def _pool_stats() -> dict[str, float]:
+    engine = _engine
+    if engine is None or not isinstance(engine.pool, QueuePool):
+        return {}
+    pool = engine.pool
+    return {"checked_out": pool.checkedout(), "overflow": max(pool.overflow(), 0), "size": pool.size()}
+
+
+def _build_engine(settings) -> Engine:
+    connect_args: dict[str, object] = {}
+    pool_args: dict[str, object] = {}
+    if settings.database_url.startswith('sqlite'):
+        connect_args['check_same_thread'] = False
+        if ':memory:' in settings.database_url:
+            pool_args['poolclass'] = StaticPool
+        return create_engine(
+            settings.database_url, pool_pre_ping=True, future=True, connect_args=connect_args, **pool_args
+        )
+
+    if settings.db_pgbouncer:
+        # psycopg 3: never promote queries to named server-side prepared statements.
+        connect_args['prepare_threshold'] = None
+    if settings.db_pool_class == "null":
+        pool_args['poolclass'] = NullPool
+    else:
+        pool_args.update(
+            poolclass=_InstrumentedQueuePool,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout,
+            pool_recycle=settings.db_pool_recycle,
+        )
+    return create_engine(
+        settings.database_url,
+        pool_pre_ping=settings.db_pool_pre_ping,
+        future=True,
+        connect_args=connect_args,
+        **pool_args,
+    )
+
+
 def get_engine() -> Engine:
-    global _engine
+    global _engine, _engine_pid
+    if _engine is not None and _engine_pid != os.getpid():
+        # Inherited across fork (Celery prefork, gunicorn): never reuse the parent's sockets.
+        dispose_engine_after_fork()
     if _engine is None:
-        settings = get_settings()
-        connect_args: dict[str, object] = {}
-        pool_args = {}
-        if settings.database_url.startswith('sqlite'):
-            connect_args['check_same_thread'] = False
-            if ':memory:' in settings.database_url:
-                pool_args['poolclass'] = StaticPool
-        _engine = create_engine(settings.database_url, pool_pre_ping=True, future=True, connect_args=connect_args, **pool_args)
+        _engine = _build_engine(get_settings())
+        _engine_pid = os.getpid()
     return _engine
 
 
+def dispose_engine_after_fork() -> None:
+    """Drop pooled connections inherited from a parent process without closing them.
+
+    ``close=False`` leaves the parent's sockets alone; the child simply starts a fresh
+    pool on next use. Wired to Celery's ``worker_process_init``.
+    """
+    global _engine, _engine_pid, _SessionLocal
+    if _engine is not None:
+        _engine.dispose(close=False)
+    _engine = None
+    _engine_pid = None
+    _SessionLocal = None
+
+
+metrics.register_db_pool_stats(_pool_stats)
+
+
 def get_session_factory() -> sessionmaker:
     global _SessionLocal
+    engine = get_engine()  # resets the factory too if we are in a freshly forked child
     if _SessionLocal is None:
         _SessionLocal = sessionmaker(
-            bind=get_engine(),
+            bind=engine,
             autoflush=False,
             autocommit=False,
             future=True,
@@ -87,6 +178,11 @@ def hash_header(value: str | None) -> Optional[str]:
     return hashlib.sha256(value.encode()).hexdigest()
 
 
+def hash_account(bank_code: str, account_number: str) -> str:
+    normalized = " ".join(account_number.split())
+    return hashlib.sha256(f"{bank_code}:{normalized}".encode()).hexdigest()
+
+
 def hash_body(body: bytes) -> str:
     return hashlib.sha256(body).hexdigest()
 
@@ -124,9 +220,9 @@ def get_job_by_idempotency(session: Session, tenant_id: str, idem_hash: str) ->
     return session.execute(stmt).scalar_one_or_none()
 
 
-def get_job_by_request_hash(session: Session, tenant_id: str, request_hash: str) -> Optional[Job]:
-    stmt = select(Job).where(Job.tenant_id == tenant_id, Job.request_hash == request_hash)
-    return session.execute(stmt).scalar_one_or_none()
+def get_job_by_request_hash(session: Session, tenant_id: str, *request_hashes: str) -> Optional[Job]:
+    stmt = select(Job).where(Job.tenant_id == tenant_id, Job.request_hash.in_(request_hashes)).limit(1)
+    return session.execute(stmt).scalars().first()
 
 
 def create_job(
@@ -154,12 +250,217 @@ def create_job(
     return job
 
 
-def persist_features(session: Session, job: Job, features: Dict) -> None:
-    record = session.get(Features, job.id)
-    if not record:
-        record = Features(job_id=job.id)
-    record.json_encrypted = features
-    session.add(record)
+def find_existing_jobs(
+    session: Session,
+    tenant_id: str,
+    *,
+    client_job_ids: Sequence[str],
+    request_hashes: Sequence[str],
+) -> list[Job]:
+    """Jobs matching any of the client ids or request hashes, in one query."""
+    if not client_job_ids and not request_hashes:
+        return []
+    stmt = select(Job).where(
+        Job.tenant_id == tenant_id,
+        or_(Job.client_job_id.in_(client_job_ids), Job.request_hash.in_(request_hashes)),
+    )
+    return list(session.execute(stmt).scalars())
+
+
+def create_jobs_bulk(
+    session: Session,
+    tenant: Tenant,
+    items: Sequence[Tuple[Dict, str, str]],
+) -> list[str]:
+    """Insert jobs, payloads and ``job_queued`` audits with one multi-row INSERT per table.
+
+    ``items`` are ``(payload, request_hash, callback_url)`` tuples. Returns, in the same
+    order, the new job id, or None where a concurrent request already created a job with
+    that ``job_id`` (the job INSERT skips conflicts on ``uq_jobs_tenant_client``).
+    """
+    job_rows: list[Dict] = []
+    payload_rows: list[Dict] = []
+    audit_rows: list[Dict] = []
+    for payload, request_hash, callback_url in items:
+        job_id = _uuid("uwo")
+        job_rows.append(
+            {
+                "id": job_id,
+                "tenant_id": tenant.id,
+                "client_job_id": payload.get("job_id"),
+                "status": JobStatus.queued,
+                "callback_url": callback_url,
+                "request_hash": request_hash,
+            }
+        )
+        payload_rows.append({"job_id": job_id, "json_encrypted": payload})
+        audit_rows.append({"job_id": job_id, "actor": "api", "action": "job_queued", "hash": request_hash})
+
+    if not job_rows:
+        return []
+    dialect_insert = _dialect_insert(session)
+    if dialect_insert is None:  # pragma: no cover - only postgres and sqlite are deployed
+        session.execute(insert(Job), job_rows)
+        created = {row["id"] for row in job_rows}
+    else:
+        stmt = (
+            dialect_insert(Job)
+            .values(job_rows)
+            .on_conflict_do_nothing(index_elements=["tenant_id", "client_job_id"])
+            .returning(Job.id)
+        )
+        created = set(session.execute(stmt).scalars())
+    if created:
+        session.execute(insert(Payload), [row for row in payload_rows if row["job_id"] in created])
+        session.execute(insert(Audit), [row for row in audit_rows if row["job_id"] in created])
+    return [row["id"] if row["id"] in created else None for row in job_rows]
+
+
+def _dialect_insert(session: Session):
+    """``insert`` with ON CONFLICT support for the session's dialect, None if it has none."""
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return None
+    return dialect_insert
+
+
+def _upsert(session: Session, model: type, values: Dict | Sequence[Dict], key: Sequence[str]) -> None:
+    """Single-statement (multi-row) INSERT ... ON CONFLICT DO UPDATE; ``merge`` elsewhere."""
+    rows = [values] if isinstance(values, dict) else list(values)
+    if not rows:
+        return
+    dialect_insert = _dialect_insert(session)
+    if dialect_insert is None:  # pragma: no cover - only postgres and sqlite are deployed
+        for row in rows:
+            session.merge(model(**row))
+        return
+    stmt = dialect_insert(model).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=list(key),
+        set_={column: stmt.excluded[column] for column in rows[0] if column not in key},
+    )
+    session.execute(stmt)
+
+
+def persist_features(session: Session, job_id: str, features: Dict) -> None:
+    _upsert(session, Features, {"job_id": job_id, "json_encrypted": features}, ("job_id",))
+
+
+def save_stage_output(session: Session, job_id: str, stage: str, data: Dict) -> None:
+    _upsert(session, StageOutput, {"job_id": job_id, "stage": stage, "json_encrypted": data}, ("job_id", "stage"))
+
+
+def load_stage_output(session: Session, job_id: str, stage: str) -> Optional[Dict]:
+    record = session.get(StageOutput, (job_id, stage))
+    if record is None:
+        return None
+    return record.json_encrypted
+
+
+def clear_stage_outputs(session: Session, job_id: str) -> None:
+    session.execute(delete(StageOutput).where(StageOutput.job_id == job_id))
+
+
+def load_statement_aggregate(session: Session, tenant_id: str, account_hash: str) -> Optional[Dict]:
+    record = session.get(StatementAggregate, (tenant_id, account_hash))
+    if record is None:
+        return None
+    return record.json_encrypted
+
+
+def save_statement_aggregate(
+    session: Session,
+    tenant_id: str,
+    account_hash: str,
+    bank_code: str,
+    data: Dict,
+    *,
+    period_from: Optional[dt.date],
+    period_to: Optional[dt.date],
+) -> None:
+    _upsert(
+        session,
+        StatementAggregate,
+        {
+            "tenant_id": tenant_id,
+            "account_hash": account_hash,
+            "bank_code": bank_code,
+            "period_from": period_from,
+            "period_to": period_to,
+            "json_encrypted": data,
+            "updated_at": dt.datetime.now(dt.timezone.utc),
+        },
+        ("tenant_id", "account_hash"),
+    )
+
+
+def record_stage_timings(session: Session, job_id: str, tenant_id: str, timings: Dict[str, float]) -> None:
+    """Persist the top-level stages; dotted sub-stages (``parser.tables``) are benchmark-only."""
+    rows = [
+        {"job_id": job_id, "tenant_id": tenant_id, "stage": stage, "seconds": float(seconds)}
+        for stage, seconds in timings.items()
+        if stage in STAGES
+    ]
+    _upsert(session, JobStageTiming, rows, ("job_id", "stage"))
+
+
+def _percentile(sorted_values: Sequence[float], fraction: float) -> float:
+    """Linear interpolation between closest ranks (matches Postgres ``percentile_cont``)."""
+    if len(sorted_values) == 1:
+        return sorted_values[0]
+    position = fraction * (len(sorted_values) - 1)
+    lower = int(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+def stage_timing_percentiles(
+    session: Session, since: dt.datetime, tenant_id: Optional[str] = None
+) -> Dict[tuple[str, str], Dict[str, float]]:
+    """p50/p90/p99/mean/count per ``(tenant_id, stage)`` for ledger rows newer than ``since``."""
+    filters = [JobStageTiming.created_at >= since]
+    if tenant_id:
+        filters.append(JobStageTiming.tenant_id == tenant_id)
+
+    if session.get_bind().dialect.name == "postgresql":
+        stmt = (
+            select(
+                JobStageTiming.tenant_id,
+                JobStageTiming.stage,
+                func.count(),
+                func.avg(JobStageTiming.seconds),
+                *(
+                    func.percentile_cont(fraction).within_group(JobStageTiming.seconds)
+                    for fraction in (0.5, 0.9, 0.99)
+                ),
+            )
+            .where(*filters)
+            .group_by(JobStageTiming.tenant_id, JobStageTiming.stage)
+        )
+        return {
+            (tenant, stage): {"count": count, "mean": mean, "p50": p50, "p90": p90, "p99": p99}
+            for tenant, stage, count, mean, p50, p90, p99 in session.execute(stmt)
+        }
+
+    grouped: Dict[tuple[str, str], list[float]] = {}
+    stmt = select(JobStageTiming.tenant_id, JobStageTiming.stage, JobStageTiming.seconds).where(*filters)
+    for tenant, stage, seconds in session.execute(stmt):
+        grouped.setdefault((tenant, stage), []).append(seconds)
+    breakdown: Dict[tuple[str, str], Dict[str, float]] = {}
+    for key, values in grouped.items():
+        values.sort()
+        breakdown[key] = {
+            "count": len(values),
+            "mean": sum(values) / len(values),
+            "p50": _percentile(values, 0.5),
+            "p90": _percentile(values, 0.9),
+            "p99": _percentile(values, 0.99),
+        }
+    return breakdown
 
 
 def persist_result(
@@ -197,6 +498,181 @@ def update_job_status(session: Session, job: Job, status: JobStatus) -> None:
     session.add(job)
 
 
+def set_job_status(session: Session, job_id: str, status: JobStatus) -> None:
+    """Status change by id, for callers that do not hold a loaded ``Job``."""
+    session.execute(update(Job).where(Job.id == job_id).values(status=status, updated_at=func.now()))
+
+
+def complete_job(
+    session: Session,
+    job_id: str,
+    *,
+    memo_markdown: str,
+    risk_score: Optional[float],
+    decision: Optional[str],
+    interest_rate: Optional[float],
+    json_tail: Dict,
+    audit_id: str,
+    webhook: Optional[Dict] = None,
+) -> None:
+    """Write a finished job as one batch of statements inside the caller's transaction.
+
+    Upserts the result, marks the job succeeded, appends the ``job_completed`` audit,
+    queues the outbox row (``webhook`` holds ``tenant_id``/``url``/``event``/``payload``)
+    and drops the intermediate stage outputs. Nothing is flushed through the ORM.
+    """
+    _upsert(
+        session,
+        Result,
+        {
+            "job_id": job_id,
+            "memo_markdown": memo_markdown,
+            "memo_pdf_url": None,
+            "risk_score": risk_score,
+            "decision": decision,
+            "interest_rate_suggestion": interest_rate,
+            "json_tail": json_tail,
+        },
+        ("job_id",),
+    )
+    set_job_status(session, job_id, JobStatus.succeeded)
+    session.execute(
+        insert(Audit).values(
+            id=audit_id, job_id=job_id, actor="underwrite_worker", action="job_completed", hash=None
+        )
+    )
+    if webhook is not None:
+        session.execute(
+            insert(WebhookDelivery).values(
+                job_id=job_id,
+                status=WebhookDeliveryStatus.pending,
+                attempts=0,
+                next_attempt_at=dt.datetime.now(dt.timezone.utc),
+                **webhook,
+            )
+        )
+    clear_stage_outputs(session, job_id)
+
+
+def enqueue_webhook(
+    session: Session,
+    *,
+    tenant_id: str,
+    url: str,
+    event: str,
+    payload: Dict,
+    job: Optional[Job] = None,
+) -> WebhookDelivery:
+    # the id default only fires on flush; callers hand it back before the commit
+    delivery = WebhookDelivery(
+        id=_uuid("whk"),
+        job_id=job.id if job is not None else None,
+        tenant_id=tenant_id,
+        event=event,
+        url=url,
+        payload=payload,
+        status=WebhookDeliveryStatus.pending,
+        attempts=0,
+        next_attempt_at=dt.datetime.now(dt.timezone.utc),
+    )
+    session.add(delivery)
+    return delivery
+
+
+def claim_due_webhooks(
+    session: Session, *, limit: int, lease_seconds: int, now: Optional[dt.datetime] = None
+) -> list[WebhookDelivery]:
+    """Lease due deliveries so concurrent dispatchers skip them until the lease expires."""
+    now = now or dt.datetime.now(dt.timezone.utc)
+    stmt = (
+        select(WebhookDelivery)
+        .where(
+            WebhookDelivery.status == WebhookDeliveryStatus.pending,
+            WebhookDelivery.next_attempt_at <= now,
+        )
+        .order_by(WebhookDelivery.next_attempt_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+        .options(selectinload(WebhookDelivery.tenant))
+    )
+    deliveries = list(session.execute(stmt).scalars())
+    lease_until = now + dt.timedelta(seconds=lease_seconds)
+    for delivery in deliveries:
+        delivery.next_attempt_at = lease_until
+        session.add(delivery)
+    return deliveries
+
+
+def mark_webhook_delivered(session: Session, delivery_id: str) -> None:
+    delivery = session.get(WebhookDelivery, delivery_id)
+    if delivery is None:
+        return
+    delivery.status = WebhookDeliveryStatus.delivered
+    delivery.attempts += 1
+    delivery.delivered_at = dt.datetime.now(dt.timezone.utc)
+    delivery.last_error = None
+    session.add(delivery)
+    if delivery.job_id:
+        # Outbox insert to acknowledged delivery, retries and back-off included.
+        record_stage_timings(
+            session, delivery.job_id, delivery.tenant_id, {"webhook": seconds_since(delivery.created_at)}
+        )
+
+
+def mark_webhook_failed(
+    session: Session,
+    delivery_id: str,
+    *,
+    error: str,
+    retry_at: Optional[dt.datetime],
+    count_attempt: bool = True,
+) -> Optional[WebhookDelivery]:
+    """Record a failed attempt; ``retry_at=None`` moves the delivery to the dead-letter state."""
+    delivery = session.get(WebhookDelivery, delivery_id)
+    if delivery is None:
+        return None
+    if count_attempt:
+        delivery.attempts += 1
+    delivery.last_error = error[:2000]
+    if retry_at is None:
+        delivery.status = WebhookDeliveryStatus.dead
+    else:
+        delivery.next_attempt_at = retry_at
+    session.add(delivery)
+    return delivery
+
+
+def requeue_webhook(session: Session, delivery_id: str) -> Optional[WebhookDelivery]:
+    delivery = session.get(WebhookDelivery, delivery_id)
+    if delivery is None:
+        return None
+    delivery.status = WebhookDeliveryStatus.pending
+    delivery.attempts = 0
+    delivery.next_attempt_at = dt.datetime.now(dt.timezone.utc)
+    session.add(delivery)
+    return delivery
+
+
+def list_webhook_deliveries(
+    session: Session,
+    *,
+    tenant_id: Optional[str] = None,
+    status: Optional[WebhookDeliveryStatus] = None,
+    limit: int = 50,
+) -> list[WebhookDelivery]:
+    stmt = select(WebhookDelivery).order_by(WebhookDelivery.updated_at.desc()).limit(limit)
+    if tenant_id is not None:
+        stmt = stmt.where(WebhookDelivery.tenant_id == tenant_id)
+    if status is not None:
+        stmt = stmt.where(WebhookDelivery.status == status)
+    return list(session.execute(stmt).scalars())
+
+
+def pending_webhook_count(session: Session) -> int:
+    stmt = select(func.count()).where(WebhookDelivery.status == WebhookDeliveryStatus.pending)
+    return int(session.execute(stmt).scalar_one())
+
+
 def reserve_next_job(session: Session, tenant_id: str) -> Optional[Job]:
     stmt = (
         select(Job)
@@ -248,6 +724,8 @@ def get_job_with_details(session: Session, job_id: str) -> Optional[Job]:
             selectinload(Job.features),
             selectinload(Job.audits),
             selectinload(Job.tenant),
+            selectinload(Job.webhook_deliveries),
+            selectinload(Job.stage_timings),
         )
     )
     return session.execute(stmt).scalar_one_or_none()
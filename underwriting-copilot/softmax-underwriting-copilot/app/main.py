@@ -6,6 +6,7 @@ import uuid
 import structlog
 from fastapi import FastAPI, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from starlette.middleware.base import BaseHTTPMiddleware
 
 from .config import get_settings
@@ -66,7 +67,7 @@ class RequestContextMiddleware(BaseHTTPMiddleware):
         return response
 
 
-app = FastAPI(title=settings.app_name, version="0.1.0")
+app = FastAPI(title=settings.app_name, version="0.1.0", default_response_class=ORJSONResponse)
 init_observability("api", fastapi_app=app)
 app.add_middleware(RequestContextMiddleware)
 app.add_middleware(
@@ -99,6 +99,13 @@ llm_seconds = HistogramWrapper(
     )
 )
 
+risk_prescore_total = CounterWrapper(
+    _METER.create_counter(
+        "underwriting_risk_prescore_total",
+        description="Risk pre-scores by outcome (llm, auto_approve, auto_decline)",
+    )
+)
+
 webhook_attempts_total = CounterWrapper(
     _METER.create_counter(
         "underwriting_webhook_attempts_total",
@@ -113,6 +120,29 @@ webhook_failures_total = CounterWrapper(
     )
 )
 
+webhook_dead_letter_total = CounterWrapper(
+    _METER.create_counter(
+        "underwriting_webhook_dead_letter_total",
+        description="Webhook deliveries moved to the dead-letter state",
+    )
+)
+
+webhook_delivery_seconds = HistogramWrapper(
+    _METER.create_histogram(
+        "underwriting_webhook_delivery_duration_seconds",
+        unit="s",
+        description="Webhook delivery attempt duration",
+    )
+)
+
+queue_wait_seconds = HistogramWrapper(
+    _METER.create_histogram(
+        "underwriting_queue_wait_seconds",
+        unit="s",
+        description="Time a job waited in the fair-share queue before dispatch",
+    )
+)
+
 http_requests_total = CounterWrapper(
     _METER.create_counter(
         "http_requests_total",
@@ -144,7 +174,7 @@ def _queue_depth_observer(_: CallbackOptions) -> Iterable[Observation]:
         try:
             values = list(callback())
         except Exception as exc:  # pragma: no cover - defensive guard
-            _logger.warning("queue_depth_callback_failed", error=str(exc))
+            _logger.warning("queue_depth_callback_failed: %s", exc)
             continue
         measurements.extend(values)
     return measurements
@@ -161,6 +191,56 @@ def register_queue_depth_callback(callback: Callable[[], Iterable[Observation]])
     _QUEUE_DEPTH_CALLBACKS.append(callback)
 
 
+_DB_POOL_STATS: list[Callable[[], dict[str, float]]] = []
+
+
+def _db_pool_observer(stat: str) -> Callable[[CallbackOptions], Iterable[Observation]]:
+    def _observe(_: CallbackOptions) -> Iterable[Observation]:
+        measurements: List[Observation] = []
+        for callback in list(_DB_POOL_STATS):
+            try:
+                stats = callback()
+            except Exception as exc:  # pragma: no cover - defensive guard
+                _logger.warning("db_pool_stats_failed: %s", exc)
+                continue
+            if stat in stats:
+                measurements.append(Observation(stats[stat]))
+        return measurements
+
+    return _observe
+
+
+for _stat, _description in (
+    ("checked_out", "Connections currently checked out of the SQLAlchemy pool"),
+    ("overflow", "Connections opened beyond pool_size"),
+    ("size", "Configured pool size"),
+):
+    _METER.create_observable_gauge(
+        f"underwriting_db_pool_{_stat}",
+        callbacks=[_db_pool_observer(_stat)],
+        description=_description,
+    )
+
+db_pool_wait_seconds = HistogramWrapper(
+    _METER.create_histogram(
+        "underwriting_db_pool_wait_seconds",
+        unit="s",
+        description="Time spent waiting to check a connection out of the pool",
+    )
+)
+
+db_pool_timeouts_total = CounterWrapper(
+    _METER.create_counter(
+        "underwriting_db_pool_timeouts_total",
+        description="Checkouts that gave up after DB_POOL_TIMEOUT",
+    )
+)
+
+
+def register_db_pool_stats(callback: Callable[[], dict[str, float]]) -> None:
+    _DB_POOL_STATS.append(callback)
+
+
 @contextmanager
 def latency_timer(metric: HistogramWrapper, **attributes: str) -> Generator[None, None, None]:
     start = time.perf_counter()
@@ -6,8 +6,10 @@ from enum import Enum
 from typing import Any, Optional
 
 from sqlalchemy import (
+    Date,
     DateTime,
     Enum as SAEnum,
+    Float,
     ForeignKey,
     Index,
     Integer,
@@ -37,6 +39,22 @@ class JobStatus(str, Enum):
     failed = "failed"
 
 
+class WebhookDeliveryStatus(str, Enum):
+    pending = "pending"
+    delivered = "delivered"
+    dead = "dead"
+
+
+class PriorityLane(str, Enum):
+    interactive = "interactive"
+    bulk = "bulk"
+
+
+class WebhookPayloadMode(str, Enum):
+    full = "full"
+    reference = "reference"
+
+
 class EncryptedJSON(TypeDecorator[Any]):
     impl = LargeBinary
     cache_ok = True
@@ -91,6 +109,8 @@ class Job(Base):
     features: Mapped[Optional["Features"]] = relationship(back_populates="job", uselist=False)
     result: Mapped[Optional["Result"]] = relationship(back_populates="job", uselist=False)
     audits: Mapped[list["Audit"]] = relationship(back_populates="job")
+    webhook_deliveries: Mapped[list["WebhookDelivery"]] = relationship(back_populates="job")
+    stage_timings: Mapped[list["JobStageTiming"]] = relationship(back_populates="job")
 
 
 class Payload(Base):
@@ -115,6 +135,57 @@ class Features(Base):
     job: Mapped["Job"] = relationship(back_populates="features")
 
 
+class StageOutput(Base):
+    """Intermediate output handed from one pipeline stage to the next by job id."""
+
+    __tablename__ = "stage_outputs"
+
+    job_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True
+    )
+    stage: Mapped[str] = mapped_column(String(32), primary_key=True)
+    json_encrypted: Mapped[Optional[dict[str, Any]]] = mapped_column(EncryptedJSON, nullable=True)
+    created_at: Mapped[dt.datetime] = mapped_column(DateTime(timezone=True), default=func.now())
+
+
+class JobStageTiming(Base):
+    """One row per job and pipeline stage: the per-job timing ledger."""
+
+    __tablename__ = "job_stage_timings"
+    __table_args__ = (Index("ix_job_stage_timings_tenant_stage", "tenant_id", "stage", "created_at"),)
+
+    job_id: Mapped[str] = mapped_column(
+        String(36), ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True
+    )
+    stage: Mapped[str] = mapped_column(String(32), primary_key=True)
+    tenant_id: Mapped[str] = mapped_column(String(64), nullable=False)
+    seconds: Mapped[float] = mapped_column(Float, nullable=False)
+    created_at: Mapped[dt.datetime] = mapped_column(DateTime(timezone=True), default=func.now())
+
+    job: Mapped["Job"] = relationship(back_populates="stage_timings")
+
+
+class StatementAggregate(Base):
+    """Running statement aggregates of one account, so a later statement only adds its new rows.
+
+    Keyed by a hash of bank code and account number; the aggregates themselves
+    (monthly buckets, counterparties, covered days) are encrypted like every
+    other payload.
+    """
+
+    __tablename__ = "statement_aggregates"
+
+    tenant_id: Mapped[str] = mapped_column(
+        String(64), ForeignKey("tenants.id", ondelete="CASCADE"), primary_key=True
+    )
+    account_hash: Mapped[str] = mapped_column(String(64), primary_key=True)
+    bank_code: Mapped[str] = mapped_column(String(32), nullable=False)
+    period_from: Mapped[Optional[dt.date]] = mapped_column(Date)
+    period_to: Mapped[Optional[dt.date]] = mapped_column(Date)
+    json_encrypted: Mapped[Optional[dict[str, Any]]] = mapped_column(EncryptedJSON, nullable=True)
+    updated_at: Mapped[dt.datetime] = mapped_column(DateTime(timezone=True), default=func.now(), onupdate=func.now())
+
+
 class Result(Base):
     __tablename__ = "results"
 
@@ -143,3 +214,31 @@ class Audit(Base):
     created_at: Mapped[dt.datetime] = mapped_column(DateTime(timezone=True), default=func.now())
 
     job: Mapped["Job"] = relationship(back_populates="audits")
+
+
+class WebhookDelivery(Base):
+    """Outbox row for a webhook, written in the same transaction as the job result."""
+
+    __tablename__ = "webhook_outbox"
+    __table_args__ = (Index("ix_webhook_outbox_due", "status", "next_attempt_at"),)
+
+    id: Mapped[str] = mapped_column(String(36), primary_key=True, default=lambda: _uuid("whk"))
+    job_id: Mapped[Optional[str]] = mapped_column(
+        String(36), ForeignKey("jobs.id", ondelete="CASCADE"), nullable=True
+    )
+    tenant_id: Mapped[str] = mapped_column(ForeignKey("tenants.id"), nullable=False)
+    event: Mapped[str] = mapped_column(String(64), nullable=False)
+    url: Mapped[str] = mapped_column(String(1024), nullable=False)
+    payload: Mapped[Optional[dict[str, Any]]] = mapped_column(EncryptedJSON, nullable=True)
+    status: Mapped[str] = mapped_column(
+        SAEnum(WebhookDeliveryStatus), default=WebhookDeliveryStatus.pending, nullable=False
+    )
+    attempts: Mapped[int] = mapped_column(Integer, default=0, nullable=False)
+    next_attempt_at: Mapped[dt.datetime] = mapped_column(DateTime(timezone=True), default=func.now())
+    last_error: Mapped[Optional[str]] = mapped_column(Text)
+    delivered_at: Mapped[Optional[dt.datetime]] = mapped_column(DateTime(timezone=True))
+    created_at: Mapped[dt.datetime] = mapped_column(DateTime(timezone=True), default=func.now())
+    updated_at: Mapped[dt.datetime] = mapped_column(DateTime(timezone=True), default=func.now(), onupdate=func.now())
+
+    job: Mapped[Optional["Job"]] = relationship(back_populates="webhook_deliveries")
+    tenant: Mapped["Tenant"] = relationship()
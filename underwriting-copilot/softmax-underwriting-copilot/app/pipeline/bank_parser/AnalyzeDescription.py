@@ -1,6 +1,7 @@
 # ─────────────────────────────────────────────────────────────
 # bank_parser/AnalyzeDescription.py  (IGNORE_TOKENS)
 # ─────────────────────────────────────────────────────────────
+import numpy as np
 import pandas as pd
 import logging
 import re
@@ -42,65 +43,82 @@ def contains_word(description, word):
     return result
 
 
+def _posting_sums(column, postings):
+    """
+    ``column.sum()`` over the rows of each posting list. Float and integer
+    columns are gathered from one NumPy array (NaN counted as 0, summed in row
+    order, exactly as ``Series.sum`` does); anything else goes through pandas.
+    """
+    values = column.to_numpy()
+    if values.dtype.kind == "f":
+        values = np.where(np.isnan(values), 0, values)
+    elif values.dtype.kind not in "iu":
+        return {word: column.iloc[rows].sum() for word, rows in postings.items()}
+    return {word: values[rows].sum() for word, rows in postings.items()}
+
+
 def analyze_customer_data(customer_id, data):
+    """
+    Recurring description words of one customer with the credits / debits of
+    the transactions that mention them and their most common neighbours.
+
+    Each description is tokenised once; a word -> row postings index then gives
+    every word's sums directly instead of re‑scanning all rows per word.
+    """
     logger.debug(f"Analyzing data for customer_id: {customer_id}")
     try:
         customer_data = data[data["customer_id"] == customer_id]
         # logger.debug(f"Filtered data size: {customer_data.shape}")
 
         context = defaultdict(lambda: {"preceding": Counter(), "following": Counter()})
+        word_counts = Counter()
+        postings = defaultdict(list)
+        tokenized = {}
+
+        for row, description in enumerate(customer_data["description"]):
+            if not pd.notna(description):
+                continue
+            tokens = tokenized.get(description)
+            if tokens is None:
+                tokens = tokenized[description] = tokenize(description)
+            word_counts.update(tokens)
+            for word in dict.fromkeys(tokens):
+                postings[word].append(row)
 
-        for description in customer_data["description"].dropna():
-            tokens = tokenize(description)
-            # logger.debug(f"Processing description: {description}")
             if len(tokens) == 1:
                 word = tokens[0]
                 context[word]["preceding"]
                 context[word]["following"]
-                # logger.debug(f"Single token '{word}' found")
             else:
                 for i, word in enumerate(tokens):
                     if i > 0:
-                        preceding_tokens = tokens[max(0, i - 3) : i]
-                        context[word]["preceding"].update(preceding_tokens)
-                        # logger.debug(f"Updated preceding tokens for '{word}': {preceding_tokens}")
+                        context[word]["preceding"].update(tokens[max(0, i - 3) : i])
                     else:
                         context[word]["preceding"]
                     if i < len(tokens) - 1:
-                        following_tokens = tokens[i + 1 : min(len(tokens), i + 4)]
-                        context[word]["following"].update(following_tokens)
-                        # logger.debug(f"Updated following tokens for '{word}': {following_tokens}")
+                        context[word]["following"].update(tokens[i + 1 : min(len(tokens), i + 4)])
                     else:
                         context[word]["following"]
 
-        all_words = [
-            word
-            for description in customer_data["description"].dropna()
-            for word in tokenize(description)
-        ]
-        word_counts = Counter(all_words)
         most_common_words = word_counts.most_common()
         # logger.debug(f"Most common words: {most_common_words}")
         df_common_words = pd.DataFrame(
             most_common_words, columns=["Давтагдсан Үгнүүд", "Давталт"]
         )
 
+        credit_sums = _posting_sums(customer_data["credit_transaction"], postings)
+        debit_sums = _posting_sums(customer_data["debit_transaction"], postings)
+
         word_transaction_sums = {}
         for word, freq in most_common_words:
-            relevant_transactions = customer_data[
-                customer_data["description"].apply(
-                    lambda x: pd.notna(x) and contains_word(x, word)
-                )
-            ]
-            credit_sum = relevant_transactions["credit_transaction"].sum()
-            debit_sum = relevant_transactions["debit_transaction"].sum()
+            credit_sum = credit_sums[word]
+            debit_sum = debit_sums[word]
             total_sum = credit_sum + debit_sum
             if total_sum / freq >= 500:
                 word_transaction_sums[word] = {
                     "Орлого": credit_sum,
                     "Зарлага": debit_sum,
                 }
-                # logger.debug(f"Word '{word}' meets the threshold with transactions: {word_transaction_sums[word]}")
         # logger.debug(f"Word transaction sums: {word_transaction_sums}")
 
         df_common_words["Орлого"] = df_common_words["Давтагдсан Үгнүүд"].map(
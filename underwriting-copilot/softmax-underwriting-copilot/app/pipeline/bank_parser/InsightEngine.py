@@ -415,8 +415,8 @@ import pandas as pd
 from datetime import datetime, timedelta
 from collections import Counter, defaultdict
 import logging
-import re
 from typing import Dict, List, Any, Tuple
+from .categorizer import categorize_description, categorize_series
 from .utils import strToFloat
 
 logger = logging.getLogger(__name__)
@@ -448,12 +448,10 @@ class AdvancedInsightEngine:
             self.df["credit_transaction"], errors="coerce"
         ).fillna(0)
 
-        categorized_data = self.df["description"].apply(
-            self._categorize_transaction_expanded
-        )
-        self.df["category"] = [item[0] for item in categorized_data]
-        self.df["sub_category"] = [item[1] for item in categorized_data]
-        self.df["merchant"] = [item[2] for item in categorized_data]
+        categorized = categorize_series(self.df["description"])
+        self.df["category"] = categorized["category"]
+        self.df["sub_category"] = categorized["sub_category"]
+        self.df["merchant"] = categorized["merchant"]
 
         self.df["month_year"] = self.df["transaction_date"].dt.to_period("M")
         self.df["day_of_week"] = self.df["transaction_date"].dt.day_name()
@@ -468,408 +466,8 @@ class AdvancedInsightEngine:
         )
 
     def _categorize_transaction_expanded(self, description):
-        if not isinstance(description, str):
-            return "Other", "Unknown", "Unknown"
-
-        desc_lower = description.lower()
-        original_desc = description
-
-        category = "Other"
-        sub_category = "Unknown"
-        merchant = "Unknown"
-
-        # --- Priority 1: Fees ---
-        if "ухаалаг мэдээ үйлчилгээний хураамж" in desc_lower:
-            return "Financial Services", "Bank Fees", "Smart Notification Fee"
-        if "апп-р хийсэн гүйлгээний хураамж" in desc_lower:
-            return "Financial Services", "Bank Fees", "App Transaction Fee"
-        if "данс хөтөлсөний хураамж" in desc_lower:
-            return "Financial Services", "Bank Fees", "Account Maintenance Fee"
-        if "картын захиалгын хураамж" in desc_lower:
-            return "Financial Services", "Bank Fees", "Card Order Fee"
-        if "картын шилжүүлгийн хураамж" in desc_lower:
-            return "Financial Services", "Bank Fees", "Card Transfer Fee"
-        if "атм-н бэлэн мөнгөний хураамж" in desc_lower:
-            return "Financial Services", "Bank Fees", "ATM Fee"
-
-        # --- Priority 2: Income ---
-        if "цалин" in desc_lower or "tsalin" in desc_lower:
-            return "Income", "Salary", "Employer"
-        if "нөат-ын буцаан" in desc_lower:
-            return "Income", "VAT Refund", "Government Tax Authority"
-        if (
-            "orlogo" == desc_lower.strip()
-            or "орлого" == desc_lower.strip()
-            or "зээл олгов" in desc_lower
-        ):
-            return (
-                "Income",
-                "Other Income/Loan Disbursement",
-                "Various",
-            )  # Generic if no other clues
-
-        # --- Priority 3: Loan/Credit Related ---
-        if "соно финтек" in desc_lower or "sono fintech" in desc_lower:
-            merchant = "Sono Fintech"
-            if (
-                "зээл" in desc_lower
-                or "loan" in desc_lower
-                or "олгов" in desc_lower
-                or "qpay уз96122869" in desc_lower
-            ):
-                return "Financial Services", "Loan Disbursement", merchant
-            else:
-                return "Bills & Utilities", "Loan Repayment", merchant
-        if "netpay: зээл олгов" in desc_lower:
-            return "Financial Services", "Loan Disbursement", "NetPay"
-        if "pocketmn" in desc_lower:
-            return "Bills & Utilities", "Loan Repayment", "Pocket.mn"
-        if (
-            "нөмөр кредит зээл олголт" in desc_lower
-            or "nomur_credit" in desc_lower.replace(" ", "")
-        ):
-            return "Financial Services", "Loan Disbursement", "Nomor Credit"
-        if "зээл авто төлөлт" in desc_lower:
-            return "Bills & Utilities", "Loan Repayment", "Car Loan Auto Debit"
-        if "зээл төлөлт" in desc_lower:
-            return "Bills & Utilities", "Loan Repayment", "Loan Payment"
-        if "зээл хасуулав" in desc_lower:
-            return "Bills & Utilities", "Loan Repayment", "Loan Deduction"
-
-        # --- Priority 4: Specific Merchants & Keywords ---
-        # Transportation
-        if "justcab" in desc_lower:
-            merchant = "JustCab"
-            return "Transportation", "Taxi/Ride-hailing", merchant
-        if "ubcab" in desc_lower:
-            merchant = "UBCab"
-            return "Transportation", "Taxi/Ride-hailing", merchant
-        if "taxi" == desc_lower.strip() or "taci" == desc_lower.strip():
-            return "Transportation", "Taxi/Ride-hailing", "Taxi"
-        if "petrovis" in desc_lower:
-            return "Transportation", "Fuel", "Petrovis"
-
-        # Food & Drink
-        if "tom n tom's" in desc_lower:
-            return "Food & Drink", "Cafe/Coffee Shop", "Tom N Tom's"
-        if "solongos kh" in desc_lower:
-            return "Food & Drink", "Restaurant", "Solongos KH"
-        if "taijiin bul" in desc_lower:
-            return "Food & Drink", "Restaurant/Cafe", "Taijiin Bul"
-        if "moskva ikh" in desc_lower:
-            return "Food & Drink", "Restaurant", "Moskva IKH"
-        if "delimanjoo" in desc_lower:
-            return "Food & Drink", "Food Delivery", "DelimanJoo"
-        if "tlj-agro" in desc_lower:
-            return "Food & Drink", "Bakery/Cafe", "Tous Les Jours (Agro)"
-        if "shurkhuukhe" in desc_lower:
-            return "Food & Drink", "Restaurant/Cafe", "Shurkhuukhe"
-        if "tugs coffee" in desc_lower:
-            return "Food & Drink", "Cafe/Coffee Shop", "TUGS Coffee"
-        if "bene roaste" in desc_lower:
-            return "Food & Drink", "Cafe/Restaurant", "BENE ROASTE"
-        if "namaste" in desc_lower:
-            return "Food & Drink", "Restaurant", "Namaste"
-        if "mungun emii" in desc_lower:
-            return "Food & Drink", "Restaurant", "Mungun Emgen"
-        if "orange emii" in desc_lower:
-            return "Food & Drink", "Restaurant/Cafe", "Orange Emgen"
-        if "mint bar" in desc_lower or "mint club" in desc_lower:
-            return "Food & Drink", "Bar/Club", "Mint"
-        if "amar stars" in desc_lower:
-            return "Food & Drink", "Restaurant/Cafe", "Amar Stars"
-        if "solongos hoolnii gazar" in desc_lower:
-            return "Food & Drink", "Restaurant", "Korean Restaurant"
-        if "buuz" in desc_lower:
-            return "Food & Drink", "Local Cuisine", "Buuz"
-        if "coffee corn" in desc_lower:
-            return "Food & Drink", "Cafe/Snacks", "Coffee Corner"
-        if "hool" == desc_lower.strip():
-            return "Food & Drink", "General", "Food"
-        if "wisky" in desc_lower:
-            return "Food & Drink", "Alcohol", "Whiskey Purchase/Bar"
-        if "tsainii mongo" in desc_lower:
-            return "Food & Drink", "Cafe/Groceries", "Tea Money"
-
-        # Shopping/Retail
-        if "era jims na" in desc_lower:
-            return "Shopping/Retail", "Supermarket", "ERA JIMS"
-        if (
-            "nomin supermarket" in desc_lower
-            or "nomin zah" in desc_lower
-            or "nomin uid h" in desc_lower
-            or "trf=nomin" in desc_lower
-            or "qpay nomin" in desc_lower
-        ):
-            return "Shopping/Retail", "Supermarket", "Nomin"
-        if "erhes khun" in desc_lower:
-            return "Shopping/Retail", "Supermarket", "Erhes Khuns"
-        if "mmart narni" in desc_lower:
-            return "Shopping/Retail", "Supermarket", "MMart Narni"
-        if "altjin jims" in desc_lower:
-            return "Shopping/Retail", "Supermarket", "Altjin JIMS"
-        if "jims khudlaa" in desc_lower:
-            return "Shopping/Retail", "Supermarket", "JIMS"
-        if "cu" in desc_lower and (
-            "trf=" in desc_lower
-            or "qpay" in desc_lower
-            or desc_lower.startswith("cu-")
-            or desc_lower.startswith("cu>")
-        ):
-            return "Shopping/Retail", "Convenience Store", "CU"
-        if "gs25" in desc_lower and ("trf=" in desc_lower or "qpay" in desc_lower):
-            return "Shopping/Retail", "Convenience Store", "GS25"
-        if "mango" in desc_lower:
-            return "Shopping/Retail", "Fashion/Clothing", "Mango"
-        if "queen shoes" in desc_lower:
-            return "Shopping/Retail", "Fashion/Clothing", "Queen Shoes"
-        if "dainty pear" in desc_lower:
-            return "Shopping/Retail", "Fashion/Clothing", "Dainty Pear"
-        if "brandbox" in desc_lower:
-            return "Shopping/Retail", "Fashion/General", "Brandbox"
-        if "az fashion" in desc_lower:
-            return "Shopping/Retail", "Fashion/Clothing", "AZ Fashion"
-        if "nomilon-emn" in desc_lower:
-            return "Shopping/Retail", "Fashion/Clothing", "Nomilon Fashion"
-        if "monos-naran" in desc_lower:
-            return "Shopping/Retail", "Pharmacy/Health Store", "Monos Naran"
-        if "вэлл бий" in desc_lower or "wellbee" in desc_lower:
-            return "Shopping/Retail", "Pharmacy/Health Store", "Wellbee"
-        if "nomtpharm" in desc_lower:
-            return "Shopping/Retail", "Pharmacy/Health Store", "Nomin Pharmacy"
-        if "narnii guur" in desc_lower:
-            return "Shopping/Retail", "Cosmetics/Beauty", "Sunbridge Cosmetics"
-        if "store 1133" in desc_lower:
-            return "Shopping/Retail", "General Retail", "Store 1133"
-        if "tumen plaza" in desc_lower:
-            return "Shopping/Retail", "Mall/Department Store", "Tumen Plaza"
-        if "gem mall" in desc_lower:
-            return "Shopping/Retail", "Mall/Department Store", "GEM Mall"
-        if "peacemall g" in desc_lower:
-            return "Shopping/Retail", "Mall/Department Store", "Peace Mall"
-        if "mimi corner" in desc_lower:
-            return "Shopping/Retail", "Fashion/Accessories", "Mimi Corner"
-        if "shim delguu" in desc_lower:
-            return "Shopping/Retail", "General Retail", "Shim Delguur"
-        if "mini market" in desc_lower:
-            return "Shopping/Retail", "General Retail", "Mini Market"
-        if "online shop" in desc_lower:
-            return "Shopping/Retail", "Online Shopping", "Online Shop"
-        if "foodpro" in desc_lower:
-            return "Shopping/Retail", "Groceries/FoodPro", "FoodPro"
-        if "daily groce" in desc_lower:
-            return "Shopping/Retail", "Groceries", "Daily Groceries"
-        if "bumbugur" in desc_lower:
-            return "Shopping/Retail", "Kids/Toys", "Bumbugur (Kids Store)"
-        if "makhnii hud" in desc_lower:
-            return "Shopping/Retail", "Groceries", "Meat Purchase"
-        if "huvtsas" == desc_lower.strip():
-            return "Shopping/Retail", "Fashion/Clothing", "Clothes"
-
-        # Subscriptions & Services
-        if "netflix" in desc_lower:
-            return "Entertainment & Leisure", "Subscription", "Netflix"
-        if "spotify" in desc_lower:
-            return "Entertainment & Leisure", "Subscription", "Spotify"
-        if "4wx4hb facebk" in desc_lower or "fb.me/ads" in desc_lower:
-            return "Business Expenses", "Advertising", "Facebook Ads"
-        if "4hh3yw netflix.com" in desc_lower:
-            return "Entertainment & Leisure", "Subscription", "Netflix"
-        if "ezpay" in desc_lower:
-            return "Bills & Utilities", "Service/Bill Payment", "EZPay"
-        if "monpay" in desc_lower and "qpay" in desc_lower:
-            return "Bills & Utilities", "Digital Wallet Payment", "MonPay"
-        if "lishpartner" in desc_lower:
-            return "Services (General)", "Partner Service", "LishPartner"
-
-        # Cash Withdrawal
-        if "atm" in desc_lower and (
-            ">khu" in desc_lower
-            or ">ulaa" in desc_lower
-            or "atm730" in desc_lower
-            or "atm1079" in desc_lower
-            or "atm1100" in desc_lower
-            or "atm572" in desc_lower
-        ):
-            return "Financial Services", "ATM Withdrawal", "ATM"
-
-        # --- Priority 5: QPAY with potential merchant ---
-        if "qpay" in desc_lower:
-            match1 = re.search(
-                r"qpay\s+([^,]+?)(?:,\s*charge:|,?\s*desc:|,?\s*\d{4,})",
-                original_desc,
-                re.IGNORECASE,
-            )
-            match2 = re.search(
-                r"qpay\s+\d+,\s*([^,]+?)(?:,\s*charge:|,?\s*desc:)",
-                original_desc,
-                re.IGNORECASE,
-            )
-            match3 = re.search(r"qpay\s+\d+,\s*([^,]+)$", original_desc, re.IGNORECASE)
-            qpay_generic_code_match = re.search(
-                r"qpay\s+([a-zA-Z0-9]{8,})", original_desc
-            )  # For generic codes after qpay
-
-            extracted_merchant = None
-            if (
-                match1
-                and match1.group(1).strip().lower()
-                not in ["charge", "desc", "ubcab", "justcab"]
-                and len(match1.group(1).strip()) > 2
-            ):
-                extracted_merchant = match1.group(1).strip()
-            elif (
-                match2
-                and match2.group(1).strip().lower()
-                not in ["charge", "desc", "ubcab", "justcab"]
-                and len(match2.group(1).strip()) > 2
-            ):
-                extracted_merchant = match2.group(1).strip()
-            elif match3 and len(match3.group(1).strip()) > 2:
-                extracted_merchant = match3.group(1).strip()
-
-            if extracted_merchant:
-                merc_lower = extracted_merchant.lower()
-                if "nomi" in merc_lower:
-                    return "Shopping/Retail", "Supermarket", "Nomin (via QPay)"
-                if "cu" in merc_lower:
-                    return "Shopping/Retail", "Convenience Store", "CU (via QPay)"
-                if "gs25" in merc_lower:
-                    return "Shopping/Retail", "Convenience Store", "GS25 (via QPay)"
-                if "coffee" in merc_lower or "кофе" in merc_lower:
-                    return (
-                        "Food & Drink",
-                        "Cafe/Coffee Shop",
-                        f"{extracted_merchant} (via QPay)",
-                    )
-                if (
-                    "restaurant" in merc_lower
-                    or "хоол" in merc_lower
-                    or "кафе" in merc_lower
-                ):
-                    return (
-                        "Food & Drink",
-                        "Restaurant",
-                        f"{extracted_merchant} (via QPay)",
-                    )
-                if "такси" in merc_lower or "taxi" in merc_lower:
-                    return (
-                        "Transportation",
-                        "Taxi/Ride-hailing",
-                        f"{extracted_merchant} (via QPay)",
-                    )
-                if (
-                    "дэлгүүр" in merc_lower
-                    or "delguur" in merc_lower
-                    or "market" in merc_lower
-                ):
-                    return (
-                        "Shopping/Retail",
-                        "General Retail",
-                        f"{extracted_merchant} (via QPay)",
-                    )
-                return "Services (General)", "QPay Payment", extracted_merchant
-            elif "s0027" in desc_lower:
-                return "Services (General)", "Service Payment", "S0027 Service (QPay)"
-            elif (
-                qpay_generic_code_match
-            ):  # If it's a qpay followed by a code, it's likely a generic payment.
-                return (
-                    "Services (General)",
-                    "QPay Payment",
-                    f"QPay ({qpay_generic_code_match.group(1)})",
-                )
-            else:
-                return "Services (General)", "QPay Payment", "QPay Generic"
-
-        # --- Priority 6: TRF with potential merchant ---
-        if "trf=" in desc_lower:
-            trf_match = re.search(
-                r"trf=.*?-([^>]+)(?:>.*)?$", original_desc, re.IGNORECASE
-            )
-            if trf_match:
-                extracted_merchant = trf_match.group(1).strip()
-                merc_lower = extracted_merchant.lower()
-                # More specific TRF merchant checks
-                if "nomi" in merc_lower or "номин" in merc_lower:
-                    return "Shopping/Retail", "Supermarket", "Nomin (via TRF)"
-                if "cu" in merc_lower:
-                    return "Shopping/Retail", "Convenience Store", "CU (via TRF)"
-                if "gs25" in merc_lower:
-                    return "Shopping/Retail", "Convenience Store", "GS25 (via TRF)"
-                if "era jims" in merc_lower:
-                    return "Shopping/Retail", "Supermarket", "ERA JIMS (via TRF)"
-                if "altjin jims" in merc_lower:
-                    return "Shopping/Retail", "Supermarket", "Altjin JIMS (via TRF)"
-                if "mango" in merc_lower:
-                    return "Shopping/Retail", "Fashion/Clothing", "Mango (via TRF)"
-                if "ezpay" in merc_lower:
-                    return (
-                        "Bills & Utilities",
-                        "Service/Bill Payment",
-                        "EZPay (via TRF)",
-                    )
-                if "store 1133" in merc_lower:
-                    return "Shopping/Retail", "General Retail", "Store 1133 (via TRF)"
-                if "m-pos merch" in merc_lower:
-                    return (
-                        "Shopping/Retail",
-                        "General Retail (POS)",
-                        "M-POS Merchant (via TRF)",
-                    )
-                if "foodpro" in merc_lower:
-                    return "Shopping/Retail", "Groceries/FoodPro", "FoodPro (via TRF)"
-                # Check for P2P names within TRF if it doesn't match other merchants
-                p2p_indicators_trf = [
-                    "oyundelger",
-                    "munkhbat",
-                    "anujin",
-                    "oyunaa",
-                    "tulgabayar",
-                    "ganzorig",
-                    "solongo",
-                ]
-                if any(name in merc_lower for name in p2p_indicators_trf):
-                    return "Transfers", "Peer-to-peer", extracted_merchant
-                return "Shopping/Retail", "Card Payment", extracted_merchant
-            else:
-                return (
-                    "Financial Services",
-                    "Transfer/Card Payment",
-                    "Unknown Card Payment",
-                )
-
-        # --- Transfers (more generic, lower priority) ---
-        p2p_strict_indicators = [
-            "uyangaa",
-            "eej",
-            "ane n",
-            "good saihan",
-            "dulguunuud",
-            "ariun ikh o",
-            "kha",
-            "n.uyangaa",
-            "n.uyangaaa",
-            "bilguun",
-            "bilguund",
-            "ariun",
-            "oyuka",
-            "zaya",
-            "oyunaa",
-            "eej avna",
-            "aaw eej avna",
-        ]
-        if desc_lower.strip() in p2p_strict_indicators:
-            return "Transfers", "Peer-to-peer", original_desc.strip().capitalize()
-        if original_desc.strip() in [
-            "1",
-            "99",
-            "43",
-        ]:  # Known P2P or generic transfer codes
-            return "Transfers", "Peer-to-peer", "Individual/Generic Transfer"
-
-        # If no other category matched, it's "Other"
-        return category, sub_category, merchant
+        # rule table and compiled matcher live in categorizer.py
+        return categorize_description(description)
 
     def generate_natural_language_insights(self) -> list[str]:
         logger.info("=== ADVANCED NATURAL LANGUAGE INSIGHTS GENERATION ===")
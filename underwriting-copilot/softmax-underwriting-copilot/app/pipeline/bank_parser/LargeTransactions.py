@@ -1,15 +1,102 @@
 # ─────────────────────────────────────────────────────────────
 # bank_parser/LargeTransactions.py  (threshold constant)
 # ─────────────────────────────────────────────────────────────
+"""
+Large credits / debits of a statement.
+
+``large_debits`` / ``large_credits`` are the data‑only API: the rows above a
+threshold, largest first, optionally only the top ``top`` of them. The
+threshold is per tenant (``tenant_threshold``), falling back to
+``LARGE_TX_THRESHOLD``. ``large_transactions`` applies them to the parser's
+rows for the memo's LLM input (``fuse``). Drawing is a separate step (``scatter_figure``, needs
+the "charts" extra); ``filter_debit_transactions`` /
+``filter_credit_transactions`` keep returning ``(frame, figure)`` for the
+report code that wants both.
+"""
+
 import pandas as pd
-import plotly.express as px
 import logging
-from .constants import LARGE_TX_THRESHOLD
+from typing import Any, Dict, List, Mapping, Optional
+
+from .constants import LARGE_TX_THRESHOLD, LARGE_TX_TOP
 
 logger = logging.getLogger(__name__)
 
+DEBIT_LABEL = "Зарлага"
+CREDIT_LABEL = "Орлого"
+
+
+def tenant_threshold(cfg: Optional[Mapping[str, Any]]) -> float:
+    """``rate_limit_cfg["large_tx_threshold"]`` of a tenant, else ``LARGE_TX_THRESHOLD``."""
+    value = (cfg or {}).get("large_tx_threshold")
+    try:
+        return float(value) if value is not None else float(LARGE_TX_THRESHOLD)
+    except (TypeError, ValueError):
+        logger.warning("ignoring invalid large_tx_threshold %r", value)
+        return float(LARGE_TX_THRESHOLD)
+
+
+def _large(data, column: str, label: str, threshold: float, top: Optional[int]):
+    # positional, so a frame with repeated index labels still yields each row once
+    amounts = pd.to_numeric(data[column], errors="coerce").reset_index(drop=True)
+    above = amounts[amounts > threshold]
+    # nlargest keeps ties in statement order; without ``top`` it just sorts
+    picked = above.nlargest(len(above) if top is None else top)
+    return data.iloc[picked.index].assign(transaction_type=label)
+
+
+def large_debits(data, *, threshold: float = LARGE_TX_THRESHOLD, top: Optional[int] = None):
+    """Debits above ``threshold``, largest first, at most ``top`` rows. ``data`` is not modified."""
+    return _large(data, "debit_transaction", DEBIT_LABEL, threshold, top)
+
+
+def large_credits(data, *, threshold: float = LARGE_TX_THRESHOLD, top: Optional[int] = None):
+    """Credits above ``threshold``, largest first, at most ``top`` rows. ``data`` is not modified."""
+    return _large(data, "credit_transaction", CREDIT_LABEL, threshold, top)
+
+
+def _records(df, column: str) -> List[Dict[str, Any]]:
+    return [
+        {
+            "date": date.strftime("%Y-%m-%d") if not pd.isna(date) else None,
+            "amount_mnt": float(amount),
+            "description": description if isinstance(description, str) else None,
+        }
+        for date, amount, description in zip(df["transaction_date"], df[column], df["description"])
+    ]
+
+
+def large_transactions(
+    rows: List[List[Any]], *, threshold: float = LARGE_TX_THRESHOLD, top: Optional[int] = LARGE_TX_TOP
+) -> Dict[str, Any]:
+    """``large_debits`` / ``large_credits`` of parser rows as JSON records (date, amount, description)."""
+    data = pd.DataFrame(
+        [list(row[:8]) + [None] * (8 - len(row)) for row in rows if isinstance(row, (list, tuple))],
+        columns=[
+            "transaction_date",
+            "branch",
+            "opening_balance",
+            "debit_transaction",
+            "credit_transaction",
+            "ending_balance",
+            "description",
+            "transaction_account",
+        ],
+    )
+    data["transaction_date"] = pd.to_datetime(data["transaction_date"], errors="coerce")
+    return {
+        "threshold_mnt": float(threshold),
+        "debits": _records(large_debits(data, threshold=threshold, top=top), "debit_transaction"),
+        "credits": _records(large_credits(data, threshold=threshold, top=top), "credit_transaction"),
+    }
+
+
+def scatter_figure(df, column: str, title: str):
+    """Plotly scatter of ``large_debits`` / ``large_credits`` output over time."""
+    # plotly is the optional "charts" extra; importing it here keeps it off
+    # the import path of everything that does not draw
+    import plotly.express as px
 
-def _scatter(df, column: str, title: str):
     fig = px.scatter(
         df,
         x="transaction_date",
@@ -25,13 +112,10 @@ def _scatter(df, column: str, title: str):
     return fig
 
 
-def filter_debit_transactions(data):
+def filter_debit_transactions(data, threshold: float = LARGE_TX_THRESHOLD):
     try:
-        df = data[data["debit_transaction"] > LARGE_TX_THRESHOLD].sort_values(
-            by="debit_transaction", ascending=False
-        )
-        df["transaction_type"] = "Зарлага"
-        return df, _scatter(df, "debit_transaction", "Зарлагын Хэмжээ")
+        df = large_debits(data, threshold=threshold)
+        return df, scatter_figure(df, "debit_transaction", "Зарлагын Хэмжээ")
     except Exception:
         logger.exception("filter_debit_transactions failed")
         import matplotlib.pyplot as plt
@@ -39,13 +123,10 @@ def filter_debit_transactions(data):
         return pd.DataFrame(), plt.Figure()
 
 
-def filter_credit_transactions(data):
+def filter_credit_transactions(data, threshold: float = LARGE_TX_THRESHOLD):
     try:
-        df = data[data["credit_transaction"] > LARGE_TX_THRESHOLD].sort_values(
-            by="credit_transaction", ascending=False
-        )
-        df["transaction_type"] = "Орлого"
-        return df, _scatter(df, "credit_transaction", "Орлогын Хэмжээ")
+        df = large_credits(data, threshold=threshold)
+        return df, scatter_figure(df, "credit_transaction", "Орлогын Хэмжээ")
     except Exception:
         logger.exception("filter_credit_transactions failed")
         import matplotlib.pyplot as plt
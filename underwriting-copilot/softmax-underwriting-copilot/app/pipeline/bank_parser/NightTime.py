@@ -2,6 +2,7 @@
 
 import pandas as pd
 import logging
+from .flags import night_mask
 
 logger = logging.getLogger("bank_parser.NightTime")
 
@@ -12,10 +13,7 @@ def filter_night_transactions(data):
         data["transaction_date"] = pd.to_datetime(data["transaction_date"])
         # ogger.debug("Converted 'transaction_date' to datetime")
 
-        filtered_data = data[
-            (data["transaction_date"].dt.hour >= 22)
-            | (data["transaction_date"].dt.hour < 6)
-        ]
+        filtered_data = data[night_mask(data["transaction_date"])]
         # logger.debug(f"Filtered night transactions count: {filtered_data.shape[0]}")
 
         filtered_data = filtered_data.sort_values(
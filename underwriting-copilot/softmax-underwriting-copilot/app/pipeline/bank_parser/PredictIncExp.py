@@ -1,49 +1,39 @@
 # bank_parser/PredictIncExp.py
 import pandas as pd
 import numpy as np
-from sklearn.linear_model import LinearRegression
 import logging
 import math
 
+from .monthly import monthly_aggregates
+from .trend import fit_trends
+
 
 logger = logging.getLogger("bank_parser.PredictIncExp")
 
+FUTURE_MONTHS = 3
 
-def compute_income_expense_regression(df):
-    """
-    If any rows have 'bank_type' == 'GOLOMT', we use 'month_1' for grouping
-    to avoid collisions. Otherwise we use 'month'.
-    """
 
-    # 1) Convert transaction_date to datetime
-    df["transaction_date"] = pd.to_datetime(df["transaction_date"], errors="coerce")
-
-    # 2) Decide the column name for grouping
-    if "bank_type" in df.columns and df["bank_type"].eq("GOLOMT").any():
-        month_col = "month_1"
-    else:
-        month_col = "month"
-
-    # 3) Drop any old column if it exists
-    if month_col in df.columns:
-        df.drop(columns=[month_col], inplace=True)
-
-    # 4) Add the grouping column
-    df[month_col] = df["transaction_date"].dt.to_period("M").dt.to_timestamp()
-
-    # 5) Group by that column using as_index=False so we don’t need reset_index()
-    monthly_data = (
-        df.groupby(month_col, as_index=False)
-        .agg(
-            total_monthly_income=("credit_transaction", "sum"),
-            total_monthly_expense=("debit_transaction", "sum"),
-        )
-        .fillna(0)
-    )
+def _bounds(values):
+    return values.tolist() if values is not None else []
 
-    # 6) If we used 'month_1', rename it to 'month' in the result
-    if month_col == "month_1":
-        monthly_data.rename(columns={"month_1": "month"}, inplace=True)
+
+def compute_income_expense_regression(df, monthly=None):
+    """
+    Linear income / expense trend over the statement's months plus a
+    three‑month projection with 95% bounds (empty below three months).
+    ``monthly`` is the statement's ``monthly_aggregates`` when the caller
+    already has it.
+    """
+    if monthly is None:
+        monthly = monthly_aggregates(df)
+
+    monthly_data = pd.DataFrame(
+        {
+            "month": monthly.index.to_timestamp(),
+            "total_monthly_income": monthly["credit_sum"].to_numpy(),
+            "total_monthly_expense": monthly["debit_sum"].to_numpy(),
+        }
+    ).fillna(0)
 
     # If no rows, return empty
     if monthly_data.empty:
@@ -56,29 +46,20 @@ def compute_income_expense_regression(df):
             "future_months": [],
             "future_predicted_income": [],
             "future_predicted_expense": [],
+            "future_income_lower": [],
+            "future_income_upper": [],
+            "future_expense_lower": [],
+            "future_expense_upper": [],
         }
 
-    # Sort by month
-    monthly_data = monthly_data.sort_values("month").reset_index(drop=True)
-
-    # Prepare data for regression
-    month_nums = np.arange(len(monthly_data))
+    # monthly_aggregates is already in month order
     income = monthly_data["total_monthly_income"].values
     expenses = monthly_data["total_monthly_expense"].values
 
-    # Fit the regressions
-    model_income = LinearRegression().fit(month_nums.reshape(-1, 1), income)
-    model_expense = LinearRegression().fit(month_nums.reshape(-1, 1), expenses)
-
-    # Predictions for existing months
-    predicted_incomes = model_income.predict(month_nums.reshape(-1, 1))
-    predicted_expenses = model_expense.predict(month_nums.reshape(-1, 1))
-
-    # Predict for 3 future months
-    future_range = 3
-    future_month_nums = np.arange(len(monthly_data), len(monthly_data) + future_range)
-    future_incomes = model_income.predict(future_month_nums.reshape(-1, 1))
-    future_expenses = model_expense.predict(future_month_nums.reshape(-1, 1))
+    # both lines in one fit: row 0 income, row 1 expense
+    fit = fit_trends(np.vstack([income, expenses]), horizon=FUTURE_MONTHS)
+    lower = fit.lower if fit.lower is not None else [None, None]
+    upper = fit.upper if fit.upper is not None else [None, None]
 
     # Convert 'month' to strings
     month_labels = monthly_data["month"].dt.strftime("%Y-%m").tolist()
@@ -87,7 +68,7 @@ def compute_income_expense_regression(df):
     last_month = monthly_data["month"].iloc[-1]
     current_period = last_month.to_period("M")
     future_month_labels = []
-    for i in range(future_range):
+    for i in range(FUTURE_MONTHS):
         next_period = current_period + (i + 1)
         future_month_labels.append(str(next_period))
 
@@ -95,14 +76,51 @@ def compute_income_expense_regression(df):
         "months": month_labels,
         "actual_income": income.tolist(),
         "actual_expense": expenses.tolist(),
-        "predicted_income": predicted_incomes.tolist(),
-        "predicted_expense": predicted_expenses.tolist(),
+        "predicted_income": fit.fitted[0].tolist(),
+        "predicted_expense": fit.fitted[1].tolist(),
         "future_months": future_month_labels,
-        "future_predicted_income": future_incomes.tolist(),
-        "future_predicted_expense": future_expenses.tolist(),
+        "future_predicted_income": fit.forecast[0].tolist(),
+        "future_predicted_expense": fit.forecast[1].tolist(),
+        "future_income_lower": _bounds(lower[0]),
+        "future_income_upper": _bounds(upper[0]),
+        "future_expense_lower": _bounds(lower[1]),
+        "future_expense_upper": _bounds(upper[1]),
     }
 
 
+def category_spend_trends(df, column="category"):
+    """
+    Monthly spend trend per value of ``column`` (e.g. the InsightEngine
+    category), all categories fitted in one batch:
+    ``{category: {"slope", "future_predicted", "future_lower", "future_upper"}}``.
+    Months in which a category had no spend count as 0.
+    """
+    if df.empty or column not in df:
+        return {}
+
+    months = pd.to_datetime(df["transaction_date"], errors="coerce").dt.to_period("M")
+    spend = (
+        pd.DataFrame({"month": months, "category": df[column], "debit": df["debit_transaction"]})
+        .dropna(subset=["month", "category"])
+        .pivot_table(index="category", columns="month", values="debit", aggfunc="sum", fill_value=0)
+    )
+    if spend.empty:
+        return {}
+    # months without any transaction still count as a zero month for every category
+    spend = spend.reindex(columns=pd.period_range(spend.columns.min(), spend.columns.max(), freq="M"), fill_value=0)
+
+    fit = fit_trends(spend.to_numpy(), horizon=FUTURE_MONTHS)
+    trends = {}
+    for i, category in enumerate(spend.index):
+        trends[category] = {
+            "slope": float(fit.slope[i]),
+            "future_predicted": fit.forecast[i].tolist(),
+            "future_lower": _bounds(fit.lower[i] if fit.lower is not None else None),
+            "future_upper": _bounds(fit.upper[i] if fit.upper is not None else None),
+        }
+    return trends
+
+
 # def daily_pattern(df):
 #     logger.debug("Analyzing daily pattern")
 #     try:
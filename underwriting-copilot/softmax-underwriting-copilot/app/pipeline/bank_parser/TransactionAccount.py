@@ -1,13 +1,16 @@
 # bank_parser/TransactionAccount.py
 
 import pandas as pd
+import numpy as np
 from collections import Counter
 import logging
 
 logger = logging.getLogger("bank_parser.TransactionAccount")
 
+TOP_WORDS = 3
 
-def get_top_words(descriptions, n=3):
+
+def get_top_words(descriptions, n=TOP_WORDS):
     # logger.debug(f"Getting top {n} words from descriptions")
     words = " ".join(descriptions).split()
     most_common_words = Counter(words).most_common(n)
@@ -15,7 +18,37 @@ def get_top_words(descriptions, n=3):
     return [word for word, _ in most_common_words]
 
 
+def _top_words_by_cell(rows, n=TOP_WORDS):
+    """
+    ``get_top_words`` for every (account, month) cell at once: descriptions are
+    tokenised a single time and counted in one groupby. Ties keep the word seen
+    first, as ``Counter.most_common`` does.
+    """
+    words = rows.assign(word=rows["description"].str.split()).explode("word")
+    words = words[words["word"].notna()]
+    if words.empty:
+        return pd.Series(dtype=object)
+    words = words.assign(order=np.arange(len(words)))
+    counts = (
+        words.groupby(["account", "month", "word"], sort=False)["order"]
+        .agg(["size", "min"])
+        .reset_index()
+        .sort_values(["size", "min"], ascending=[False, True], kind="stable")
+    )
+    top = counts.groupby(["account", "month"], sort=False).head(n)
+    return top.groupby(["account", "month"], sort=False)["word"].agg(list)
+
+
 def Transaction_Account(df):
+    """
+    Counterparty accounts that both paid in and were paid out in the same
+    month: ``{account: (monthly DataFrame, share of total credits)}``.
+
+    One grouped pass over (account, month) instead of re‑filtering the frame
+    per counterparty; each monthly frame is indexed by month‑end date with
+    credit_sum, credit_count, top_words_credit, debit_sum, debit_count,
+    top_words_debit.
+    """
     logger.debug("Starting Transaction_Account analysis")
     try:
         filtered_data = df.dropna(subset=["transaction_account"])
@@ -23,104 +56,70 @@ def Transaction_Account(df):
             f"Filtered data size after dropping NA in 'transaction_account': {filtered_data.shape}"
         )
 
-        unique_accounts = filtered_data["transaction_account"].unique()
-        # logger.debug(f"Unique transaction accounts: {unique_accounts}")
-
+        credit = filtered_data["credit_transaction"]
+        debit = filtered_data["debit_transaction"]
+        rows = pd.DataFrame(
+            {
+                "account": filtered_data["transaction_account"],
+                "month": pd.to_datetime(
+                    filtered_data["transaction_date"], errors="coerce"
+                ).dt.to_period("M"),
+                "credit_sum": credit,
+                "credit_count": (credit > 0).astype("int64"),
+                "debit_sum": debit,
+                "debit_count": (debit > 0).astype("int64"),
+                "description": filtered_data["description"],
+            }
+        )
+        rows = rows[rows["month"].notna()]
+
+        monthly = rows.groupby(["account", "month"], sort=False)[
+            ["credit_sum", "credit_count", "debit_sum", "debit_count"]
+        ].sum()
+
+        total_income = df["credit_transaction"].sum()
+        credit_totals = monthly["credit_sum"].groupby(level="account", sort=False).sum()
+
+        # only months with money both ways are reported, so only those need top words
+        monthly = monthly[(monthly["credit_sum"] > 0) & (monthly["debit_sum"] > 0)]
+        if monthly.empty:
+            logger.debug("Completed Transaction_Account analysis with 0 accounts")
+            return {}
+
+        cells = rows.set_index(["account", "month"]).index.isin(monthly.index)
+        candidates = rows[cells]
+        monthly = monthly.assign(
+            top_words_credit=_top_words_by_cell(candidates[candidates["credit_sum"] > 0]),
+            top_words_debit=_top_words_by_cell(candidates[candidates["debit_sum"] > 0]),
+        )
+        for column in ("top_words_credit", "top_words_debit"):
+            # blank descriptions only: get_top_words gave []
+            monthly[column] = monthly[column].map(lambda words: words if isinstance(words, list) else [])
+
+        column_order = [
+            "credit_sum",
+            "credit_count",
+            "top_words_credit",
+            "debit_sum",
+            "debit_count",
+            "top_words_debit",
+        ]
+        monthly = monthly[column_order]
+
+        by_account = dict(tuple(monthly.groupby(level="account", sort=False)))
         account_dfs = {}
-        for account in unique_accounts:
-            # logger.debug(f"Processing account: {account}")
-            temp_df = filtered_data[filtered_data["transaction_account"] == account][
-                [
-                    "transaction_date",
-                    "credit_transaction",
-                    "debit_transaction",
-                    "description",
-                ]
-            ]
-            # logger.debug(f"Filtered DataFrame for account {account}: {temp_df.shape}")
-
-            temp_df["transaction_date"] = (
-                pd.to_datetime(temp_df["transaction_date"])
-                .dt.to_period("M")
-                .dt.to_timestamp()
-            )
-            # logger.debug("Converted 'transaction_date' to month periods")
-
-            def count_non_zero(series):
-                return sum(1 for value in series if value > 0)
-
-            def get_top_words_by_transaction(df, transaction_type):
-                return get_top_words(df.loc[df[transaction_type] > 0, "description"])
-
-            monthly_data = temp_df.groupby(
-                pd.Grouper(key="transaction_date", freq="M")
-            ).agg(
-                {
-                    "credit_transaction": ["sum", count_non_zero],
-                    "debit_transaction": ["sum", count_non_zero],
-                }
-            )
-            monthly_data.columns = [
-                "_".join(col).strip() for col in monthly_data.columns.values
-            ]
-            # logger.debug(f"Aggregated monthly data: {monthly_data.shape}")
-
-            credit_desc = (
-                temp_df[temp_df["credit_transaction"] > 0]
-                .groupby(pd.Grouper(key="transaction_date", freq="M"))
-                .agg({"description": lambda x: get_top_words(x)})
-                .rename(columns={"description": "top_words_credit"})
-            )
-            debit_desc = (
-                temp_df[temp_df["debit_transaction"] > 0]
-                .groupby(pd.Grouper(key="transaction_date", freq="M"))
-                .agg({"description": lambda x: get_top_words(x)})
-                .rename(columns={"description": "top_words_debit"})
-            )
-            # logger.debug("Extracted top words for credit and debit transactions")
-
-            monthly_data = monthly_data.join(credit_desc, how="left").join(
-                debit_desc, how="left"
+        for account in filtered_data["transaction_account"].unique():
+            if account not in by_account:
+                continue
+            monthly_data = by_account[account].droplevel("account").sort_index()
+            monthly_data.index = pd.DatetimeIndex(
+                monthly_data.index.to_timestamp(how="end").normalize(),
+                name="transaction_date",
             )
-            # logger.debug("Merged top words into monthly data")
-
-            monthly_data.columns = [
-                "credit_sum",
-                "credit_count",
-                "debit_sum",
-                "debit_count",
-                "top_words_credit",
-                "top_words_debit",
-            ]
-            column_order = [
-                "credit_sum",
-                "credit_count",
-                "top_words_credit",
-                "debit_sum",
-                "debit_count",
-                "top_words_debit",
-            ]
-            monthly_data = monthly_data[column_order]
-            # logger.debug("Renamed and ordered monthly data columns")
-
-            total_income = df["credit_transaction"].sum()
-            total_credit_sum = monthly_data["credit_sum"].sum()
             total_credit_sum_percentage = (
-                total_credit_sum / total_income if total_income != 0 else 0
+                credit_totals[account] / total_income if total_income != 0 else 0
             )
-            # logger.debug(f"Total income: {total_income}, Total credit sum: {total_credit_sum}, Percentage: {total_credit_sum_percentage}")
-
-            filtered_monthly_data = monthly_data[
-                (monthly_data["credit_sum"] > 0) & (monthly_data["debit_sum"] > 0)
-            ]
-            # logger.debug(f"Filtered monthly data with positive credits and debits: {filtered_monthly_data.shape}")
-
-            if not filtered_monthly_data.empty:
-                account_dfs[account] = (
-                    filtered_monthly_data,
-                    total_credit_sum_percentage,
-                )
-                # logger.debug(f"Added account {account} to account_dfs with data shape: {filtered_monthly_data.shape}")
+            account_dfs[account] = (monthly_data, total_credit_sum_percentage)
 
         logger.debug(
             f"Completed Transaction_Account analysis with {len(account_dfs)} accounts"
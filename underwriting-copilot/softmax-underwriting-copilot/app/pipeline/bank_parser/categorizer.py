@@ -0,0 +1,390 @@
+# ─────────────────────────────────────────────────────────────
+# bank_parser/categorizer.py
+# Transaction description -> (category, sub_category, merchant)
+# ─────────────────────────────────────────────────────────────
+"""
+Rule table behind ``AdvancedInsightEngine``'s categorisation.
+
+The rules are the old if‑chain written down as data, in the same priority
+order: the first rule that matches wins. At import every substring the table
+mentions is compiled into one regex, so a description is scanned once to find
+which keywords it contains; only rules anchored on one of those keywords (plus
+the few unanchored ones) are then evaluated. Results are memoised per
+description because statements repeat the same merchant strings thousands of
+times; ``categorize_series`` goes one step further and categorises only the
+unique descriptions of a column before mapping back.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, FrozenSet, List, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+
+Category = Tuple[str, str, str]
+Resolver = Callable[[str, str], Category]  # (original, lower‑cased) -> category
+
+UNCATEGORIZED: Category = ("Other", "Unknown", "Unknown")
+CATEGORY_CACHE_SIZE = 65536
+
+
+@dataclass(frozen=True)
+class Rule:
+    """
+    Fires when every ``all_of`` group has a keyword in the lower‑cased text, or
+    when the stripped text is one of ``equals``; ``check`` is an extra test for
+    what keywords cannot express (prefixes, space‑insensitive matches).
+    """
+
+    result: Union[Category, Resolver]
+    all_of: Sequence[Sequence[str]] = ()
+    equals: Sequence[str] = ()
+    check: Optional[Callable[[str], bool]] = None
+
+
+def _any(*keywords: str) -> Sequence[Sequence[str]]:
+    return (keywords,)
+
+
+_NON_MERCHANTS = ("charge", "desc", "ubcab", "justcab")
+
+_QPAY_MERCHANT = re.compile(
+    r"qpay\s+([^,]+?)(?:,\s*charge:|,?\s*desc:|,?\s*\d{4,})", re.IGNORECASE
+)
+_QPAY_ID_MERCHANT = re.compile(
+    r"qpay\s+\d+,\s*([^,]+?)(?:,\s*charge:|,?\s*desc:)", re.IGNORECASE
+)
+_QPAY_TRAILING_MERCHANT = re.compile(r"qpay\s+\d+,\s*([^,]+)$", re.IGNORECASE)
+_QPAY_CODE = re.compile(r"qpay\s+([a-zA-Z0-9]{8,})")  # generic codes after qpay
+_TRF_MERCHANT = re.compile(r"trf=.*?-([^>]+)(?:>.*)?$", re.IGNORECASE)
+
+# (keywords in the extracted merchant, category, sub_category, merchant label);
+# a label of None keeps the extracted merchant, suffixed with the channel
+_QPAY_MERCHANTS: Sequence[Tuple[Sequence[str], str, str, Optional[str]]] = (
+    (("nomi",), "Shopping/Retail", "Supermarket", "Nomin (via QPay)"),
+    (("cu",), "Shopping/Retail", "Convenience Store", "CU (via QPay)"),
+    (("gs25",), "Shopping/Retail", "Convenience Store", "GS25 (via QPay)"),
+    (("coffee", "кофе"), "Food & Drink", "Cafe/Coffee Shop", None),
+    (("restaurant", "хоол", "кафе"), "Food & Drink", "Restaurant", None),
+    (("такси", "taxi"), "Transportation", "Taxi/Ride-hailing", None),
+    (("дэлгүүр", "delguur", "market"), "Shopping/Retail", "General Retail", None),
+)
+
+_TRF_MERCHANTS: Sequence[Tuple[Sequence[str], str, str, str]] = (
+    (("nomi", "номин"), "Shopping/Retail", "Supermarket", "Nomin (via TRF)"),
+    (("cu",), "Shopping/Retail", "Convenience Store", "CU (via TRF)"),
+    (("gs25",), "Shopping/Retail", "Convenience Store", "GS25 (via TRF)"),
+    (("era jims",), "Shopping/Retail", "Supermarket", "ERA JIMS (via TRF)"),
+    (("altjin jims",), "Shopping/Retail", "Supermarket", "Altjin JIMS (via TRF)"),
+    (("mango",), "Shopping/Retail", "Fashion/Clothing", "Mango (via TRF)"),
+    (("ezpay",), "Bills & Utilities", "Service/Bill Payment", "EZPay (via TRF)"),
+    (("store 1133",), "Shopping/Retail", "General Retail", "Store 1133 (via TRF)"),
+    (("m-pos merch",), "Shopping/Retail", "General Retail (POS)", "M-POS Merchant (via TRF)"),
+    (("foodpro",), "Shopping/Retail", "Groceries/FoodPro", "FoodPro (via TRF)"),
+)
+
+_TRF_P2P_NAMES = ("oyundelger", "munkhbat", "anujin", "oyunaa", "tulgabayar", "ganzorig", "solongo")
+
+_P2P_STRICT = (
+    "uyangaa", "eej", "ane n", "good saihan", "dulguunuud", "ariun ikh o", "kha",
+    "n.uyangaa", "n.uyangaaa", "bilguun", "bilguund", "ariun", "oyuka", "zaya",
+    "oyunaa", "eej avna", "aaw eej avna",
+)
+_P2P_CODES = ("1", "99", "43")  # known P2P or generic transfer codes
+
+
+def _qpay(original: str, lower: str) -> Category:
+    extracted: Optional[str] = None
+    for pattern in (_QPAY_MERCHANT, _QPAY_ID_MERCHANT):
+        match = pattern.search(original)
+        if match:
+            candidate = match.group(1).strip()
+            if candidate.lower() not in _NON_MERCHANTS and len(candidate) > 2:
+                extracted = candidate
+                break
+    if extracted is None:
+        match = _QPAY_TRAILING_MERCHANT.search(original)
+        if match and len(match.group(1).strip()) > 2:
+            extracted = match.group(1).strip()
+
+    if extracted:
+        merchant_lower = extracted.lower()
+        for keywords, category, sub_category, label in _QPAY_MERCHANTS:
+            if any(k in merchant_lower for k in keywords):
+                return category, sub_category, label or f"{extracted} (via QPay)"
+        return "Services (General)", "QPay Payment", extracted
+    if "s0027" in lower:
+        return "Services (General)", "Service Payment", "S0027 Service (QPay)"
+    code = _QPAY_CODE.search(original)
+    if code:  # a qpay followed by a code is likely a generic payment
+        return "Services (General)", "QPay Payment", f"QPay ({code.group(1)})"
+    return "Services (General)", "QPay Payment", "QPay Generic"
+
+
+def _trf(original: str, lower: str) -> Category:
+    match = _TRF_MERCHANT.search(original)
+    if not match:
+        return "Financial Services", "Transfer/Card Payment", "Unknown Card Payment"
+    extracted = match.group(1).strip()
+    merchant_lower = extracted.lower()
+    for keywords, category, sub_category, label in _TRF_MERCHANTS:
+        if any(k in merchant_lower for k in keywords):
+            return category, sub_category, label
+    # P2P names within TRF if it doesn't match other merchants
+    if any(name in merchant_lower for name in _TRF_P2P_NAMES):
+        return "Transfers", "Peer-to-peer", extracted
+    return "Shopping/Retail", "Card Payment", extracted
+
+
+def _p2p_named(original: str, lower: str) -> Category:
+    return "Transfers", "Peer-to-peer", original.strip().capitalize()
+
+
+# ────────────────────────────────────────────────────────────
+# the rule table, highest priority first
+# ────────────────────────────────────────────────────────────
+RULES: Sequence[Rule] = (
+    # --- Priority 1: Fees ---
+    Rule(("Financial Services", "Bank Fees", "Smart Notification Fee"), _any("ухаалаг мэдээ үйлчилгээний хураамж")),
+    Rule(("Financial Services", "Bank Fees", "App Transaction Fee"), _any("апп-р хийсэн гүйлгээний хураамж")),
+    Rule(("Financial Services", "Bank Fees", "Account Maintenance Fee"), _any("данс хөтөлсөний хураамж")),
+    Rule(("Financial Services", "Bank Fees", "Card Order Fee"), _any("картын захиалгын хураамж")),
+    Rule(("Financial Services", "Bank Fees", "Card Transfer Fee"), _any("картын шилжүүлгийн хураамж")),
+    Rule(("Financial Services", "Bank Fees", "ATM Fee"), _any("атм-н бэлэн мөнгөний хураамж")),
+    # --- Priority 2: Income ---
+    Rule(("Income", "Salary", "Employer"), _any("цалин", "tsalin")),
+    Rule(("Income", "VAT Refund", "Government Tax Authority"), _any("нөат-ын буцаан")),
+    # generic if no other clues
+    Rule(
+        ("Income", "Other Income/Loan Disbursement", "Various"),
+        _any("зээл олгов"),
+        equals=("orlogo", "орлого"),
+    ),
+    # --- Priority 3: Loan/Credit Related ---
+    Rule(
+        ("Financial Services", "Loan Disbursement", "Sono Fintech"),
+        (("соно финтек", "sono fintech"), ("зээл", "loan", "олгов", "qpay уз96122869")),
+    ),
+    Rule(("Bills & Utilities", "Loan Repayment", "Sono Fintech"), _any("соно финтек", "sono fintech")),
+    Rule(("Financial Services", "Loan Disbursement", "NetPay"), _any("netpay: зээл олгов")),
+    Rule(("Bills & Utilities", "Loan Repayment", "Pocket.mn"), _any("pocketmn")),
+    Rule(("Financial Services", "Loan Disbursement", "Nomor Credit"), _any("нөмөр кредит зээл олголт")),
+    # spaces may fall anywhere inside the name, so anchor on the "_" it must contain
+    Rule(
+        ("Financial Services", "Loan Disbursement", "Nomor Credit"),
+        _any("_"),
+        check=lambda lower: "nomur_credit" in lower.replace(" ", ""),
+    ),
+    Rule(("Bills & Utilities", "Loan Repayment", "Car Loan Auto Debit"), _any("зээл авто төлөлт")),
+    Rule(("Bills & Utilities", "Loan Repayment", "Loan Payment"), _any("зээл төлөлт")),
+    Rule(("Bills & Utilities", "Loan Repayment", "Loan Deduction"), _any("зээл хасуулав")),
+    # --- Priority 4: Specific Merchants & Keywords ---
+    # Transportation
+    Rule(("Transportation", "Taxi/Ride-hailing", "JustCab"), _any("justcab")),
+    Rule(("Transportation", "Taxi/Ride-hailing", "UBCab"), _any("ubcab")),
+    Rule(("Transportation", "Taxi/Ride-hailing", "Taxi"), equals=("taxi", "taci")),
+    Rule(("Transportation", "Fuel", "Petrovis"), _any("petrovis")),
+    # Food & Drink
+    Rule(("Food & Drink", "Cafe/Coffee Shop", "Tom N Tom's"), _any("tom n tom's")),
+    Rule(("Food & Drink", "Restaurant", "Solongos KH"), _any("solongos kh")),
+    Rule(("Food & Drink", "Restaurant/Cafe", "Taijiin Bul"), _any("taijiin bul")),
+    Rule(("Food & Drink", "Restaurant", "Moskva IKH"), _any("moskva ikh")),
+    Rule(("Food & Drink", "Food Delivery", "DelimanJoo"), _any("delimanjoo")),
+    Rule(("Food & Drink", "Bakery/Cafe", "Tous Les Jours (Agro)"), _any("tlj-agro")),
+    Rule(("Food & Drink", "Restaurant/Cafe", "Shurkhuukhe"), _any("shurkhuukhe")),
+    Rule(("Food & Drink", "Cafe/Coffee Shop", "TUGS Coffee"), _any("tugs coffee")),
+    Rule(("Food & Drink", "Cafe/Restaurant", "BENE ROASTE"), _any("bene roaste")),
+    Rule(("Food & Drink", "Restaurant", "Namaste"), _any("namaste")),
+    Rule(("Food & Drink", "Restaurant", "Mungun Emgen"), _any("mungun emii")),
+    Rule(("Food & Drink", "Restaurant/Cafe", "Orange Emgen"), _any("orange emii")),
+    Rule(("Food & Drink", "Bar/Club", "Mint"), _any("mint bar", "mint club")),
+    Rule(("Food & Drink", "Restaurant/Cafe", "Amar Stars"), _any("amar stars")),
+    Rule(("Food & Drink", "Restaurant", "Korean Restaurant"), _any("solongos hoolnii gazar")),
+    Rule(("Food & Drink", "Local Cuisine", "Buuz"), _any("buuz")),
+    Rule(("Food & Drink", "Cafe/Snacks", "Coffee Corner"), _any("coffee corn")),
+    Rule(("Food & Drink", "General", "Food"), equals=("hool",)),
+    Rule(("Food & Drink", "Alcohol", "Whiskey Purchase/Bar"), _any("wisky")),
+    Rule(("Food & Drink", "Cafe/Groceries", "Tea Money"), _any("tsainii mongo")),
+    # Shopping/Retail
+    Rule(("Shopping/Retail", "Supermarket", "ERA JIMS"), _any("era jims na")),
+    Rule(
+        ("Shopping/Retail", "Supermarket", "Nomin"),
+        _any("nomin supermarket", "nomin zah", "nomin uid h", "trf=nomin", "qpay nomin"),
+    ),
+    Rule(("Shopping/Retail", "Supermarket", "Erhes Khuns"), _any("erhes khun")),
+    Rule(("Shopping/Retail", "Supermarket", "MMart Narni"), _any("mmart narni")),
+    Rule(("Shopping/Retail", "Supermarket", "Altjin JIMS"), _any("altjin jims")),
+    Rule(("Shopping/Retail", "Supermarket", "JIMS"), _any("jims khudlaa")),
+    Rule(
+        ("Shopping/Retail", "Convenience Store", "CU"),
+        _any("cu"),
+        check=lambda lower: "trf=" in lower or "qpay" in lower or lower.startswith(("cu-", "cu>")),
+    ),
+    Rule(("Shopping/Retail", "Convenience Store", "GS25"), (("gs25",), ("trf=", "qpay"))),
+    Rule(("Shopping/Retail", "Fashion/Clothing", "Mango"), _any("mango")),
+    Rule(("Shopping/Retail", "Fashion/Clothing", "Queen Shoes"), _any("queen shoes")),
+    Rule(("Shopping/Retail", "Fashion/Clothing", "Dainty Pear"), _any("dainty pear")),
+    Rule(("Shopping/Retail", "Fashion/General", "Brandbox"), _any("brandbox")),
+    Rule(("Shopping/Retail", "Fashion/Clothing", "AZ Fashion"), _any("az fashion")),
+    Rule(("Shopping/Retail", "Fashion/Clothing", "Nomilon Fashion"), _any("nomilon-emn")),
+    Rule(("Shopping/Retail", "Pharmacy/Health Store", "Monos Naran"), _any("monos-naran")),
+    Rule(("Shopping/Retail", "Pharmacy/Health Store", "Wellbee"), _any("вэлл бий", "wellbee")),
+    Rule(("Shopping/Retail", "Pharmacy/Health Store", "Nomin Pharmacy"), _any("nomtpharm")),
+    Rule(("Shopping/Retail", "Cosmetics/Beauty", "Sunbridge Cosmetics"), _any("narnii guur")),
+    Rule(("Shopping/Retail", "General Retail", "Store 1133"), _any("store 1133")),
+    Rule(("Shopping/Retail", "Mall/Department Store", "Tumen Plaza"), _any("tumen plaza")),
+    Rule(("Shopping/Retail", "Mall/Department Store", "GEM Mall"), _any("gem mall")),
+    Rule(("Shopping/Retail", "Mall/Department Store", "Peace Mall"), _any("peacemall g")),
+    Rule(("Shopping/Retail", "Fashion/Accessories", "Mimi Corner"), _any("mimi corner")),
+    Rule(("Shopping/Retail", "General Retail", "Shim Delguur"), _any("shim delguu")),
+    Rule(("Shopping/Retail", "General Retail", "Mini Market"), _any("mini market")),
+    Rule(("Shopping/Retail", "Online Shopping", "Online Shop"), _any("online shop")),
+    Rule(("Shopping/Retail", "Groceries/FoodPro", "FoodPro"), _any("foodpro")),
+    Rule(("Shopping/Retail", "Groceries", "Daily Groceries"), _any("daily groce")),
+    Rule(("Shopping/Retail", "Kids/Toys", "Bumbugur (Kids Store)"), _any("bumbugur")),
+    Rule(("Shopping/Retail", "Groceries", "Meat Purchase"), _any("makhnii hud")),
+    Rule(("Shopping/Retail", "Fashion/Clothing", "Clothes"), equals=("huvtsas",)),
+    # Subscriptions & Services
+    Rule(("Entertainment & Leisure", "Subscription", "Netflix"), _any("netflix")),
+    Rule(("Entertainment & Leisure", "Subscription", "Spotify"), _any("spotify")),
+    Rule(("Business Expenses", "Advertising", "Facebook Ads"), _any("4wx4hb facebk", "fb.me/ads")),
+    Rule(("Bills & Utilities", "Service/Bill Payment", "EZPay"), _any("ezpay")),
+    Rule(("Bills & Utilities", "Digital Wallet Payment", "MonPay"), (("monpay",), ("qpay",))),
+    Rule(("Services (General)", "Partner Service", "LishPartner"), _any("lishpartner")),
+    # Cash Withdrawal
+    Rule(
+        ("Financial Services", "ATM Withdrawal", "ATM"),
+        (("atm",), (">khu", ">ulaa", "atm730", "atm1079", "atm1100", "atm572")),
+    ),
+    # --- Priority 5: QPAY with potential merchant ---
+    Rule(_qpay, _any("qpay")),
+    # --- Priority 6: TRF with potential merchant ---
+    Rule(_trf, _any("trf=")),
+    # --- Transfers (more generic, lower priority) ---
+    Rule(_p2p_named, equals=_P2P_STRICT),
+    Rule(("Transfers", "Peer-to-peer", "Individual/Generic Transfer"), equals=_P2P_CODES),
+)
+
+
+# ────────────────────────────────────────────────────────────
+# compiled form
+# ────────────────────────────────────────────────────────────
+def _trie_pattern(words: Sequence[str]) -> str:
+    """
+    Regex source matching any of ``words``, nested by shared prefix so the
+    engine branches once per character instead of trying every word in turn.
+    Optional tails are greedy, so the longest word wins at a given position.
+    """
+    trie: dict = {}
+    for word in words:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def build(node: dict) -> str:
+        branches = [re.escape(ch) + build(child) for ch, child in sorted(node.items()) if ch]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return f"(?:{body})?" if "" in node else body
+
+    return build(trie)
+
+
+def _compile(rules: Sequence[Rule]):
+    keywords = sorted({k for rule in rules for group in rule.all_of for k in group})
+    # A zero‑width lookahead finds the longest keyword starting at every
+    # position, overlaps included; the shorter ones starting there are its
+    # prefixes and are added back in _keywords_in().
+    pattern = _trie_pattern(keywords)
+    scanner = re.compile(f"(?=({pattern}))")
+    # most descriptions contain no keyword at all; a plain search says so at a
+    # fraction of the cost of the overlapping scan, and otherwise tells it where to start
+    first = re.compile(pattern)
+    prefixes = {k: frozenset(p for p in keywords if k.startswith(p)) for k in keywords}
+
+    by_keyword: Dict[str, List[int]] = {}
+    by_equals: Dict[str, List[int]] = {}
+    unanchored: List[int] = []
+    for index, rule in enumerate(rules):
+        if rule.all_of:
+            # every group must match, so one group is enough to anchor on
+            for keyword in rule.all_of[0]:
+                by_keyword.setdefault(keyword, []).append(index)
+        for text in rule.equals:
+            by_equals.setdefault(text, []).append(index)
+        if not rule.all_of and not rule.equals:
+            unanchored.append(index)
+    return first, scanner, prefixes, by_keyword, by_equals, tuple(unanchored)
+
+
+_FIRST, _SCANNER, _PREFIXES, _BY_KEYWORD, _BY_EQUALS, _UNANCHORED = _compile(RULES)
+
+
+def _keywords_in(lower: str) -> FrozenSet[str]:
+    first = _FIRST.search(lower)
+    if first is None:
+        return frozenset()
+    found = set()
+    for match in _SCANNER.finditer(lower, first.start()):
+        found |= _PREFIXES[match.group(1)]
+    return frozenset(found)
+
+
+@lru_cache(maxsize=4096)
+def _rules_for(found: FrozenSet[str]) -> Tuple[int, ...]:
+    """Indexes of the rules worth evaluating for a keyword set, in priority order."""
+    candidates = set(_UNANCHORED)
+    for keyword in found:
+        candidates.update(_BY_KEYWORD.get(keyword, ()))
+    return tuple(sorted(candidates))
+
+
+def _fires(rule: Rule, lower: str, stripped: str, found: FrozenSet[str]) -> bool:
+    if stripped in rule.equals:
+        return True
+    if not rule.all_of and rule.equals:
+        return False
+    if not all(any(k in found for k in group) for group in rule.all_of):
+        return False
+    return rule.check is None or rule.check(lower)
+
+
+@lru_cache(maxsize=CATEGORY_CACHE_SIZE)
+def categorize_description(description: str) -> Category:
+    """(category, sub_category, merchant) for one transaction description."""
+    if not isinstance(description, str):
+        return UNCATEGORIZED
+    lower = description.lower()
+    stripped = lower.strip()
+    found = _keywords_in(lower)
+
+    candidates = _rules_for(found)
+    if stripped in _BY_EQUALS:
+        candidates = sorted({*candidates, *_BY_EQUALS[stripped]})
+
+    for index in candidates:
+        rule = RULES[index]
+        if _fires(rule, lower, stripped, found):
+            return rule.result(description, lower) if callable(rule.result) else rule.result
+    return UNCATEGORIZED
+
+
+def categorize_series(descriptions: pd.Series) -> pd.DataFrame:
+    """
+    Categorise a description column: each distinct description once, then a
+    vectorised map back onto the rows. Columns: category, sub_category, merchant.
+    """
+    codes, uniques = pd.factorize(descriptions, use_na_sentinel=True)
+    table = [categorize_description(d) if isinstance(d, str) else UNCATEGORIZED for d in uniques]
+    table.append(UNCATEGORIZED)  # code -1: missing descriptions
+    labels = pd.DataFrame(table, columns=["category", "sub_category", "merchant"])
+    return labels.take(codes).set_index(descriptions.index)
+
+
+# ---------------------------------------------------------------------------
+__all__ = ["Rule", "RULES", "UNCATEGORIZED", "categorize_description", "categorize_series"]
@@ -9,6 +9,8 @@ from typing import Sequence
 
 # Threshold above which a single transaction is considered “large”
 LARGE_TX_THRESHOLD: int = 500
+# How many of the largest debits / credits go into the memo's LLM input
+LARGE_TX_TOP: int = 5
 
 # Keywords used to flag suspicious / loan‑related transactions
 SUSPICIOUS_KEYWORDS: Sequence[str] = [
@@ -27,6 +29,16 @@ SUSPICIOUS_KEYWORDS: Sequence[str] = [
     "буцалт",
 ]
 
+# Narrower families flagged alongside SUSPICIOUS_KEYWORDS (bank_parser/flags.py).
+# Loan stems match anywhere in a word (зээлийн, зээлээ, ...); refund words are
+# whole words, like the suspicious list they are drawn from.
+LOAN_KEYWORDS: Sequence[str] = ["зээл"]
+REFUND_KEYWORDS: Sequence[str] = ["буцаалт", "butsaalt", "butsalt", "буцалт"]
+
+# Transactions between these hours (local time) count as night‑time
+NIGHT_START_HOUR: int = 22
+NIGHT_END_HOUR: int = 6
+
 # Words to ignore when tokenising descriptions for NLP stats
 IGNORE_TOKENS: set[str] = {
     "хаанаас",
@@ -64,6 +76,13 @@ VERTICAL_GUIDES: dict[str, Sequence[float]] = {
     ),
 }
 
+# Format detection reads only this top band of page 1 (points) ...
+HEADER_BAND_PT: float = 80
+# ... grouping words whose tops differ by at most this much into one line
+HEADER_LINE_TOLERANCE: float = 3
+# Page-1 content hashes remembered by detect_bank (per process)
+DETECT_CACHE_SIZE: int = 512
+
 # Helper colour tuples (RGB 0‑1) so design can be tweaked easily
 GUIDE_COLOURS = {
     "KHAN_LINE": (1, 0, 0),
@@ -75,8 +94,16 @@ GUIDE_COLOURS = {
 # ---------------------------------------------------------------------------
 __all__ = [
     "LARGE_TX_THRESHOLD",
+    "LARGE_TX_TOP",
     "SUSPICIOUS_KEYWORDS",
+    "LOAN_KEYWORDS",
+    "REFUND_KEYWORDS",
+    "NIGHT_START_HOUR",
+    "NIGHT_END_HOUR",
     "IGNORE_TOKENS",
     "VERTICAL_GUIDES",
     "GUIDE_COLOURS",
+    "HEADER_BAND_PT",
+    "HEADER_LINE_TOLERANCE",
+    "DETECT_CACHE_SIZE",
 ]
@@ -0,0 +1,76 @@
+# ─────────────────────────────────────────────────────────────
+# bank_parser/flags.py
+# Keyword / time-of-day flags computed once per statement frame
+# ─────────────────────────────────────────────────────────────
+"""
+Boolean flag columns for a normalised statement frame.
+
+``with_flags`` adds ``flag_suspicious``, ``flag_loan``, ``flag_refund`` and
+``flag_night`` in one pass: each distinct description is lower‑cased and
+scanned once (statements repeat the same few hundred descriptions thousands of
+times), the results are broadcast back to the rows, and the columns stay on
+the frame so every later report reads them instead of scanning again.
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from .constants import NIGHT_END_HOUR, NIGHT_START_HOUR
+from .keywords import LOAN, REFUND, SUSPICIOUS, description_bits
+
+FLAG_COLUMNS = ["flag_suspicious", "flag_loan", "flag_refund", "flag_night"]
+
+
+def keyword_bits(descriptions: pd.Series) -> np.ndarray:
+    """Per-row bit set of SUSPICIOUS / LOAN / REFUND; missing or non-text descriptions get 0."""
+    codes, uniques = pd.factorize(descriptions)
+    bits = np.fromiter(
+        (description_bits(value) if isinstance(value, str) else 0 for value in uniques),
+        dtype=np.int64,
+        count=len(uniques),
+    )
+    # code -1 (missing) picks the trailing 0
+    return np.append(bits, 0)[codes]
+
+
+def night_mask(dates: pd.Series) -> pd.Series:
+    """True for timestamps between 22:00 and 06:00; NaT is never night."""
+    hours = pd.to_datetime(dates, errors="coerce").dt.hour
+    return (hours >= NIGHT_START_HOUR) | (hours < NIGHT_END_HOUR)
+
+
+def suspicious_mask(descriptions: pd.Series) -> pd.Series:
+    """True where a description contains one of ``SUSPICIOUS_KEYWORDS`` as a word."""
+    return pd.Series(keyword_bits(descriptions) & SUSPICIOUS > 0, index=descriptions.index)
+
+
+def with_flags(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    ``df`` with the ``FLAG_COLUMNS`` added (a new frame; ``df`` is untouched).
+    A frame that already carries them is returned as is.
+    """
+    if all(column in df for column in FLAG_COLUMNS):
+        return df
+    bits = keyword_bits(df["description"]) if "description" in df else np.zeros(len(df), dtype=np.int64)
+    if "transaction_date" in df:
+        night = night_mask(df["transaction_date"]).to_numpy()
+    else:
+        night = np.zeros(len(df), dtype=bool)
+    return df.assign(
+        flag_suspicious=bits & SUSPICIOUS > 0,
+        flag_loan=bits & LOAN > 0,
+        flag_refund=bits & REFUND > 0,
+        flag_night=night,
+    )
+
+
+# ---------------------------------------------------------------------------
+__all__ = [
+    "FLAG_COLUMNS",
+    "keyword_bits",
+    "night_mask",
+    "suspicious_mask",
+    "with_flags",
+]
@@ -0,0 +1,120 @@
+# ─────────────────────────────────────────────────────────────
+# bank_parser/header.py
+# Header-only extraction: customer name, account number and
+# statement interval from the top band of page 1, no table parse
+# ─────────────────────────────────────────────────────────────
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from datetime import date, datetime
+from pathlib import Path
+from typing import List, Optional, Sequence, Tuple
+
+from .constants import HEADER_LINE_TOLERANCE
+
+_DATE = re.compile(r"\d{4}[./-]\d{2}[./-]\d{2}")
+_DATE_FORMATS = ("%Y.%m.%d", "%Y/%m/%d", "%Y-%m-%d")
+
+
+@dataclass(frozen=True)
+class HeaderFields:
+    """Where one bank prints its header fields.
+
+    A field's value is the rest of the first line containing one of its labels,
+    cut at any ``*_stop`` label and, when a ``*_pattern`` is given, reduced to
+    that regex's first group. Interval dates are the first two dates found
+    after the ``period`` labels.
+    """
+
+    bank_code: str
+    band: float
+    name: Sequence[str]
+    account: Sequence[str]
+    period: Sequence[str] = ()
+    name_stop: Sequence[str] = ()
+    name_pattern: Optional[str] = None
+    account_pattern: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class StatementHeader:
+    bank_code: Optional[str]
+    customer_name: str
+    account_number: str
+    period_from: Optional[date]
+    period_to: Optional[date]
+
+
+def header_lines(pdf_path: str | Path, band: float) -> List[str]:
+    """Text lines of the top ``band`` points of page 1, in reading order."""
+    import fitz  # PyMuPDF; deferred so registering formats stays import-free
+
+    with fitz.open(str(pdf_path)) as doc:
+        if doc.page_count == 0:
+            return []
+        page = doc[0]
+        clip = fitz.Rect(0, 0, page.rect.width, min(band, page.rect.height))
+        words = page.get_text("words", clip=clip)
+
+    lines: List[Tuple[float, list]] = []
+    for word in sorted(words, key=lambda w: (w[1], w[0])):
+        if lines and word[1] - lines[-1][0] <= HEADER_LINE_TOLERANCE:
+            lines[-1][1].append(word)
+        else:
+            lines.append((word[1], [word]))
+    return [" ".join(w[4] for w in sorted(line, key=lambda w: w[0])) for _top, line in lines]
+
+
+def _after(lines: Sequence[str], labels: Sequence[str]) -> Optional[str]:
+    for line in lines:
+        for label in labels:
+            if label in line:
+                return line.split(label, 1)[1].strip()
+    return None
+
+
+def _field(lines: Sequence[str], labels: Sequence[str], stops: Sequence[str], pattern: Optional[str]) -> str:
+    value = _after(lines, labels)
+    if value is None:
+        return ""
+    for stop in stops:
+        value = value.split(stop, 1)[0].strip()
+    if pattern:
+        match = re.search(pattern, value)
+        if match:
+            return match.group(1).strip()
+    return value
+
+
+def _to_date(token: str) -> Optional[date]:
+    for fmt in _DATE_FORMATS:
+        try:
+            return datetime.strptime(token, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def _period(lines: Sequence[str], labels: Sequence[str]) -> Tuple[Optional[date], Optional[date]]:
+    found: List[date] = []
+    for label in labels:
+        tail = _after(lines, (label,))
+        if tail:
+            found.extend(d for d in map(_to_date, _DATE.findall(tail)) if d is not None)
+    if not found:
+        return None, None
+    return found[0], found[1] if len(found) > 1 else None
+
+
+def read_fields(pdf_path: str | Path, fields: HeaderFields) -> Tuple[str, str, Optional[date], Optional[date]]:
+    """(customer_name, account_number, period_from, period_to) for a known layout."""
+    lines = header_lines(pdf_path, fields.band)
+    name = _field(lines, fields.name, fields.name_stop, fields.name_pattern)
+    account = _field(lines, fields.account, (), fields.account_pattern)
+    period_from, period_to = _period(lines, fields.period)
+    return name, account, period_from, period_to
+
+
+# ---------------------------------------------------------------------------
+__all__ = ["HeaderFields", "StatementHeader", "header_lines", "read_fields"]
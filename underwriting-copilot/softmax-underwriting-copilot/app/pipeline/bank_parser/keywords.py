@@ -0,0 +1,49 @@
+# ─────────────────────────────────────────────────────────────
+# bank_parser/keywords.py
+# Keyword families of one description, without pandas
+# ─────────────────────────────────────────────────────────────
+"""
+``description_bits`` maps one transaction description to a bit set of
+``SUSPICIOUS`` / ``LOAN`` / ``REFUND``. ``flags`` broadcasts it over a frame;
+the worker's running statement aggregates call it row by row, which is why it
+lives apart from ``flags`` and needs nothing beyond ``re``.
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+
+from .constants import LOAN_KEYWORDS, REFUND_KEYWORDS, SUSPICIOUS_KEYWORDS
+
+# one scanner for every whole-word family; it runs on lower-cased text, so no IGNORECASE
+_WORDS = list(dict.fromkeys([*SUSPICIOUS_KEYWORDS, *REFUND_KEYWORDS]))
+_WORD_PATTERN = re.compile(r"\b(" + "|".join(map(re.escape, _WORDS)) + r")\b")
+_SUSPICIOUS = frozenset(SUSPICIOUS_KEYWORDS)
+_REFUND = frozenset(REFUND_KEYWORDS)
+
+SUSPICIOUS, LOAN, REFUND = 1, 2, 4
+
+
+@lru_cache(maxsize=65536)
+def description_bits(text: str) -> int:
+    """Bit set of the keyword families found in ``text``; loan stems match anywhere in a word."""
+    text = text.lower()
+    found = set(_WORD_PATTERN.findall(text))
+    bits = 0
+    if found & _SUSPICIOUS:
+        bits |= SUSPICIOUS
+    if found & _REFUND:
+        bits |= REFUND
+    if any(stem in text for stem in LOAN_KEYWORDS):
+        bits |= LOAN
+    return bits
+
+
+# ---------------------------------------------------------------------------
+__all__ = [
+    "LOAN",
+    "REFUND",
+    "SUSPICIOUS",
+    "description_bits",
+]
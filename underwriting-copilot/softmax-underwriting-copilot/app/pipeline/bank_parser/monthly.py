@@ -0,0 +1,92 @@
+# ─────────────────────────────────────────────────────────────
+# bank_parser/monthly.py
+# One month-bucketed pass over a statement, shared by every consumer
+# ─────────────────────────────────────────────────────────────
+"""
+Per‑month aggregates of a normalised statement frame.
+
+``monthly_aggregates`` buckets the rows by calendar month once and computes, in
+a single groupby, everything the month‑level reports read: sums, counts of
+non‑zero transactions, means, suspicious‑keyword totals and night‑time totals
+(the last two from the ``flags`` columns, computed here if the frame lacks
+them). The normalizer computes it once per statement and hands it to
+``prepare_monthly_balances`` / ``compute_income_expense_regression``; called
+on their own they build it themselves.
+"""
+
+from __future__ import annotations
+
+import pandas as pd
+
+from .flags import with_flags
+
+MONTHLY_COLUMNS = [
+    "rows",
+    "credit_sum",
+    "credit_count",
+    "credit_mean",
+    "debit_sum",
+    "debit_count",
+    "debit_mean",
+    "balance_mean",
+    "suspicious_credit",
+    "suspicious_debit",
+    "night_credit",
+    "night_debit",
+]
+
+
+def monthly_aggregates(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    One row per calendar month (``PeriodIndex`` named ``month``, ascending)
+    with the ``MONTHLY_COLUMNS`` above, for a frame with the usual
+    transaction_date / credit / debit / ending_balance / description columns.
+    Rows without a parseable date are left out, as every month‑level consumer
+    did before.
+    """
+    if df.empty or "transaction_date" not in df:
+        return pd.DataFrame(columns=MONTHLY_COLUMNS, index=pd.PeriodIndex([], freq="M", name="month"))
+
+    df = with_flags(df)
+    dates = pd.to_datetime(df["transaction_date"], errors="coerce")
+    credit = pd.to_numeric(df["credit_transaction"], errors="coerce")
+    debit = pd.to_numeric(df["debit_transaction"], errors="coerce")
+    suspicious = df["flag_suspicious"]
+    night = df["flag_night"]
+
+    parts = pd.DataFrame(
+        {
+            "month": dates.dt.to_period("M"),
+            "credit": credit,
+            "debit": debit,
+            "credit_nz": (credit > 0).astype("int64"),
+            "debit_nz": (debit > 0).astype("int64"),
+            "balance": pd.to_numeric(df["ending_balance"], errors="coerce"),
+            "suspicious_credit": credit.where(suspicious, 0.0),
+            "suspicious_debit": debit.where(suspicious, 0.0),
+            "night_credit": credit.where(night, 0.0),
+            "night_debit": debit.where(night, 0.0),
+        }
+    )
+    monthly = parts.groupby("month", sort=True).agg(
+        rows=("credit", "size"),
+        credit_sum=("credit", "sum"),
+        credit_count=("credit_nz", "sum"),
+        credit_mean=("credit", "mean"),
+        debit_sum=("debit", "sum"),
+        debit_count=("debit_nz", "sum"),
+        debit_mean=("debit", "mean"),
+        balance_mean=("balance", "mean"),
+        suspicious_credit=("suspicious_credit", "sum"),
+        suspicious_debit=("suspicious_debit", "sum"),
+        night_credit=("night_credit", "sum"),
+        night_debit=("night_debit", "sum"),
+    )
+    return monthly[MONTHLY_COLUMNS]
+
+
+# ---------------------------------------------------------------------------
+__all__ = [
+    "MONTHLY_COLUMNS",
+    "monthly_aggregates",
+]
@@ -0,0 +1,164 @@
+# ─────────────────────────────────────────────────────────────
+# bank_parser/plugins.py
+# Every supported statement format, registered by metadata only
+# ─────────────────────────────────────────────────────────────
+"""
+One ``BankPlugin`` per statement layout: how to recognise it from the page‑1
+header words, where its header fields are printed, and the names of its parser
+and page‑at‑a‑time generator.
+
+Importing this module registers every format with ``registry`` without
+importing the parsers themselves: ``registry.lazy`` stands in for them and
+loads their module (and pdfplumber with it) on the first statement that needs
+it. Adding a bank means writing its parser in ``DataHandler`` (or a module of
+its own) and adding an entry to ``PLUGINS``.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Sequence
+
+from .header import HeaderFields
+from .registry import CheckerFn, lazy, register_bank
+
+
+@dataclass(frozen=True)
+class BankPlugin:
+    parser: str  # parser function in ``module``; also the name used in logs
+    checker: CheckerFn
+    signatures: Sequence[str]
+    header: HeaderFields
+    stream: str  # page-at-a-time generator in ``module``
+    module: str = ".DataHandler"
+
+
+# ╭──────────────────────────────────────────────────────────╮
+# │ Header field layouts                                     │
+# ╰──────────────────────────────────────────────────────────╯
+KHAN_HEADER = HeaderFields(
+    bank_code="KHAN",
+    band=130,
+    name=("Хэрэглэгч:",),
+    name_stop=("Интервал:",),
+    account=("Дансны дугаар:",),
+    period=("Интервал:",),
+)
+
+KHAN_KIOSK_HEADER = HeaderFields(
+    bank_code="KHAN-KIOSK",
+    band=110,
+    name=("Харилцагчийн нэр:",),
+    account=("Дансны дугаар:",),
+    period=("Эхлэх огноо:",),
+)
+
+GOLOMT_HEADER = HeaderFields(
+    bank_code="GOLOMT",
+    band=150,
+    name=("Харилцагчийн нэр:",),
+    # name before the "(R000…)" customer id
+    name_stop=("(",),
+    name_pattern=r"^([А-ЯЁ\s]+)",
+    # pdfplumber reads the overprinted label as "AДcаcнoсu:nt:"
+    account=("Данс:", "AДcаcнoсu:nt:", "Account:"),
+    account_pattern=r"(\d+)",
+    period=("Хамрах хугацаа:",),
+)
+
+STATE_HEADER = HeaderFields(
+    bank_code="STATE",
+    band=160,
+    name=("Харилцагч:",),
+    account=("Дансны дугаар:",),
+    period=("Хамрах хугацаа:",),
+)
+
+# TDB might have different field names, adjust as needed
+TDB_HEADER = HeaderFields(
+    bank_code="TDB",
+    band=160,
+    name=("Харилцагч:", "Нэр:"),
+    account=("Дансны дугаар:", "Данс:"),
+    period=("Хамрах хугацаа:", "Интервал:"),
+)
+
+KHAS_HEADER = HeaderFields(
+    bank_code="KHAS",
+    band=160,
+    name=("Үндсэн эзэмшигч:",),
+    # same line carries "Нийт орлого: 810,381,688.00"
+    name_stop=("Нийт орлого:",),
+    account=("Дансны дугаар:", "Дансны дугаар :"),
+    period=("Эхлэх өдөр :", "Дуусах огноо :"),
+)
+
+
+# ╭──────────────────────────────────────────────────────────╮
+# │ Formats, in registration (tie-break) order               │
+# ╰──────────────────────────────────────────────────────────╯
+PLUGINS: Sequence[BankPlugin] = (
+    BankPlugin(
+        "getKhanData",
+        lambda w: bool(w) and w[0] == "Printed",
+        ("Printed",),
+        KHAN_HEADER,
+        "_stream_khan",
+    ),
+    BankPlugin(
+        "getKhanKioskData",
+        lambda w: bool(w) and w[0] == "Харилцагчийн",
+        ("Харилцагчийн",),
+        KHAN_KIOSK_HEADER,
+        "_stream_khan_kiosk",
+    ),
+    BankPlugin(
+        "getGolomtData",
+        lambda w: bool(w) and w[0] == "ГОЛОМТ",
+        ("ГОЛОМТ",),
+        GOLOMT_HEADER,
+        "_stream_golomt",
+    ),
+    BankPlugin(
+        "getStateData",
+        lambda w: len(w) > 2 and w[0] == "Хэвлэсэн" and len(w[2]) > 4 and w[2][4] == ".",
+        ("Хэвлэсэн",),
+        STATE_HEADER,
+        "_stream_state",
+    ),
+    BankPlugin(
+        "getTDBData",
+        lambda w: len(w) > 2 and w[0] == "Хэвлэсэн" and len(w[2]) > 4 and w[2][4] == "/",
+        ("Хэвлэсэн",),
+        TDB_HEADER,
+        "_stream_tdb",
+    ),
+    BankPlugin(
+        "getKhasData",
+        lambda w: bool(w) and w[0] == "ДАНСНЫ",
+        ("ДАНСНЫ",),
+        KHAS_HEADER,
+        "_stream_khas",
+    ),
+)
+
+for _plugin in PLUGINS:
+    register_bank(
+        _plugin.checker,
+        signatures=_plugin.signatures,
+        header=_plugin.header,
+        stream=lazy(_plugin.module, _plugin.stream),
+    )(lazy(_plugin.module, _plugin.parser))
+
+
+# ---------------------------------------------------------------------------
+__all__ = [
+    "BankPlugin",
+    "PLUGINS",
+    "KHAN_HEADER",
+    "KHAN_KIOSK_HEADER",
+    "GOLOMT_HEADER",
+    "STATE_HEADER",
+    "TDB_HEADER",
+    "KHAS_HEADER",
+]
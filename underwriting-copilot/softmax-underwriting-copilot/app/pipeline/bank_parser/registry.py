@@ -4,49 +4,264 @@
 # ─────────────────────────────────────────────────────────────
 from __future__ import annotations
 
-import pdfplumber
-from typing import Callable, List, Tuple
+import hashlib
+import importlib
+import itertools
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .constants import DETECT_CACHE_SIZE, HEADER_BAND_PT
+from .header import HeaderFields, StatementHeader, header_lines, read_fields
+from ...utils.timing import stage
+
+logger = logging.getLogger(__name__)
 
 # Type alias for the parser return signature - Updated to include name and account
 Parsed = Tuple[list, str, str, str]
 CheckerFn = Callable[[list[str]], bool]
 ParserFn = Callable[[str], Parsed]
+# yields one list of canonical rows per page
+StreamFn = Callable[[str], Iterator[list]]
 
 BANK_DETECTORS: List[Tuple[CheckerFn, ParserFn]] = []
 
+# signature token -> registrations (index into BANK_DETECTORS) that claim it
+_SIGNATURE_INDEX: Dict[str, List[int]] = {}
+# registrations without signatures; only scanned when the index has no match
+_UNINDEXED: List[int] = []
+# parser -> where its layout prints name / account / interval
+HEADER_FIELDS: Dict[ParserFn, HeaderFields] = {}
+# parser -> its page-at-a-time generator, for stream_bank
+ROW_STREAMS: Dict[ParserFn, StreamFn] = {}
+
+# sha256(page-1 content stream) -> parser, most recently used last
+_detected: "OrderedDict[str, ParserFn]" = OrderedDict()
+_detected_lock = threading.Lock()
 
-def register_bank(checker: CheckerFn) -> Callable[[ParserFn], ParserFn]:
-    """Decorator:  @register_bank(lambda words: ...) above a parser fn"""
+
+def register_bank(
+    checker: CheckerFn,
+    *,
+    signatures: Sequence[str] = (),
+    header: Optional[HeaderFields] = None,
+    stream: Optional[StreamFn] = None,
+) -> Callable[[ParserFn], ParserFn]:
+    """Decorator:  @register_bank(lambda words: ..., signatures=("ГОЛОМТ",)) above a parser fn
+
+    ``signatures`` are header tokens that identify the format; detection looks
+    them up in one dict probe per header word instead of running every checker.
+    The checker still confirms the match (and separates formats sharing a token).
+    ``header`` makes the format available to ``extract_header``; together with
+    ``stream`` it lets ``stream_bank`` parse the statement a page at a time.
+    """
 
     def decorator(fn: ParserFn) -> ParserFn:
         BANK_DETECTORS.append((checker, fn))
+        index = len(BANK_DETECTORS) - 1
+        for token in signatures:
+            _SIGNATURE_INDEX.setdefault(token, []).append(index)
+        if not signatures:
+            _UNINDEXED.append(index)
+        if header is not None:
+            HEADER_FIELDS[fn] = header
+        if stream is not None:
+            ROW_STREAMS[fn] = stream
         return fn
 
     return decorator
 
 
-def detect_bank(filename: str) -> Parsed | Tuple[None, None, str, str]:
-    """Iterate through registered checkers and return the first match."""
+class _Lazy:
+    """Stands in for a function in a module that is imported on the first call."""
+
+    def __init__(self, module: str, name: str) -> None:
+        self.module = module
+        self.__name__ = name
+        self._fn: Optional[Callable[..., Any]] = None
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        if self._fn is None:
+            self._fn = getattr(importlib.import_module(self.module, __package__), self.__name__)
+        return self._fn(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        return f"lazy({self.module!r}, {self.__name__!r})"
+
+
+def lazy(module: str, name: str) -> Callable[..., Any]:
+    """``module.name`` (relative to this package if it starts with "."), imported when first called.
+
+    Lets ``plugins`` register parsers without importing them or their PDF
+    libraries; the worker only pays for those when a statement arrives.
+    """
+    return _Lazy(module, name)
+
+
+def page_one_digest(filename: str) -> str:
+    """sha256 of the page-1 content stream ("" for an empty document)."""
+    import fitz  # PyMuPDF, only once a statement is actually looked at
+
+    with fitz.open(filename) as doc:
+        if doc.page_count == 0:
+            return ""
+        return hashlib.sha256(doc[0].read_contents()).hexdigest()
+
+
+def header_words(filename: str) -> List[str]:
+    """Words in the top band of page 1, in reading order."""
+    return " ".join(header_lines(filename, HEADER_BAND_PT)).split()
+
+
+def _confidence(index: int, words: list[str], position: int) -> float:
+    """0 when the checker rejects; otherwise higher the earlier the signature appears."""
+    checker, _parser = BANK_DETECTORS[index]
     try:
-        with pdfplumber.open(filename) as pdf:
-            if not pdf.pages:
-                return None, None, "", ""
-            first_page_text = pdf.pages[0].extract_text() or ""
+        if not checker(words):
+            return 0.0
     except Exception:
-        # Let caller decide what to do with exceptions
-        raise
+        return 0.0
+    return 1.0 + 1.0 / (1 + position)
+
+
+def rank_parsers(words: list[str]) -> List[ParserFn]:
+    """Candidate parsers for ``words``, best first."""
+    scores: Dict[int, float] = {}
+    for position, word in enumerate(words):
+        for index in _SIGNATURE_INDEX.get(word, ()):
+            if index not in scores:
+                scores[index] = _confidence(index, words, position)
+    if not any(scores.values()):
+        scores.update({index: _confidence(index, words, len(words)) for index in _UNINDEXED})
+    ranked = sorted((index for index, score in scores.items() if score > 0), key=lambda i: (-scores[i], i))
+    return [BANK_DETECTORS[index][1] for index in ranked]
+
+
+def _remember(digest: str, parser: ParserFn) -> None:
+    with _detected_lock:
+        _detected[digest] = parser
+        _detected.move_to_end(digest)
+        while len(_detected) > DETECT_CACHE_SIZE:
+            _detected.popitem(last=False)
 
-    words = first_page_text.split()
-    for checker, parser in BANK_DETECTORS:
+
+def _cached(digest: str) -> Optional[ParserFn]:
+    with _detected_lock:
+        parser = _detected.get(digest)
+        if parser is not None:
+            _detected.move_to_end(digest)
+        return parser
+
+
+def clear_detection_cache() -> None:
+    with _detected_lock:
+        _detected.clear()
+
+
+def _candidates(filename: str, digest: str) -> Iterator[ParserFn]:
+    """The parser cached for this page 1 first; header extraction and ranking only if that fails."""
+    cached = _cached(digest) if digest else None
+    if cached is not None:
+        yield cached
+    with stage("detect"):
+        ranked = rank_parsers(header_words(filename))
+    for parser in ranked:
+        if parser is not cached:
+            yield parser
+
+
+def detect_bank(filename: str) -> Parsed | Tuple[None, None, str, str]:
+    """Pick the parser for ``filename`` from its page-1 header and run it."""
+    # "detect" and "parse" feed the per-job timing ledger (app.utils.timing).
+    with stage("detect"):
+        digest = page_one_digest(filename)
+
+    for parser in _candidates(filename, digest):
         try:
-            if checker(words):
-                return parser(filename)
+            with stage("parse"):
+                parsed = parser(filename)
         except Exception:
-            # Log inside individual parsers
+            logger.warning("bank parser %s failed on %s", parser.__name__, filename, exc_info=True)
             continue
+        if digest:
+            _remember(digest, parser)
+        return parsed
     # No match - return empty strings for name and account
     return None, None, "", ""
 
 
+def _timed(batches: Iterator[list]) -> Iterator[list]:
+    """Charge the time spent producing each batch to the "parse" stage, not the consumer's."""
+    while True:
+        with stage("parse"):
+            batch = next(batches, None)
+        if batch is None:
+            return
+        yield batch
+
+
+def _open_stream(filename: str, parser: ParserFn) -> Tuple[StatementHeader, Iterator[list]]:
+    fields, stream = HEADER_FIELDS.get(parser), ROW_STREAMS.get(parser)
+    if fields is None or stream is None:
+        # registered without a stream: run it whole and hand the rows over as one batch
+        rows, bank_code, name, account = parser(filename)
+        return StatementHeader(bank_code, name or "", account or "", None, None), iter([rows or []])
+    with stage("parser.header"):
+        header = StatementHeader(fields.bank_code, *read_fields(filename, fields))
+    return header, stream(filename)
+
+
+def stream_bank(filename: str) -> Optional[Tuple[StatementHeader, Iterable[list]]]:
+    """Like ``detect_bank``, but return the header and a lazy iterator of per-page row batches.
+
+    Only the current page is held in memory, so peak usage no longer grows with
+    the page count. A parser that fails on page 1 falls through to the next
+    candidate as in ``detect_bank``; a failure on a later page propagates to the
+    consumer. None when no parser accepts the statement.
+    """
+    with stage("detect"):
+        digest = page_one_digest(filename)
+
+    for parser in _candidates(filename, digest):
+        try:
+            with stage("parse"):
+                header, batches = _open_stream(filename, parser)
+                first = next(batches, [])
+        except Exception:
+            logger.warning("bank parser %s failed on %s", parser.__name__, filename, exc_info=True)
+            continue
+        if digest:
+            _remember(digest, parser)
+        return header, _timed(itertools.chain([first], batches))
+    return None
+
+
+def extract_header(filename: str) -> StatementHeader:
+    """Detect the bank and read its header fields without parsing any tables.
+
+    Cheap enough for ingest-time pre-checks (e.g. the account holder must match
+    the applicant) before the full parse runs.
+    """
+    for parser in rank_parsers(header_words(filename)):
+        fields = HEADER_FIELDS.get(parser)
+        if fields is not None:
+            return StatementHeader(fields.bank_code, *read_fields(filename, fields))
+    return StatementHeader(None, "", "", None, None)
+
+
 # ---------------------------------------------------------------------------
-__all__ = ["register_bank", "detect_bank", "BANK_DETECTORS"]
+__all__ = [
+    "register_bank",
+    "lazy",
+    "detect_bank",
+    "stream_bank",
+    "extract_header",
+    "clear_detection_cache",
+    "header_words",
+    "page_one_digest",
+    "rank_parsers",
+    "BANK_DETECTORS",
+    "HEADER_FIELDS",
+    "ROW_STREAMS",
+]
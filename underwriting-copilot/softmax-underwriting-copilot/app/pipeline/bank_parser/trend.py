@@ -0,0 +1,97 @@
+# ─────────────────────────────────────────────────────────────
+# bank_parser/trend.py
+# Straight-line trends over monthly series, closed-form in NumPy
+# ─────────────────────────────────────────────────────────────
+"""
+Ordinary least squares of ``y = intercept + slope * month`` for any number of
+monthly series at once.
+
+Statements cover a handful of months and every series of a statement shares
+the same x (0, 1, ..., n-1), so the fit reduces to two dot products per series.
+``fit_trends`` does them for a whole (series × months) matrix in one go and
+adds a prediction interval for each projected month. Nothing here needs
+scikit‑learn, which used to be imported just to fit two lines.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Optional
+
+import numpy as np
+
+# two-sided 95% Student t quantiles by degrees of freedom; past the table the
+# normal 1.96 is used (at most 4% narrower)
+_T95 = (
+    12.706, 4.303, 3.182, 2.776, 2.571, 2.447, 2.365, 2.306, 2.262, 2.228,
+    2.201, 2.179, 2.160, 2.145, 2.131, 2.120, 2.110, 2.101, 2.093, 2.086,
+    2.080, 2.074, 2.069, 2.064, 2.060, 2.056, 2.052, 2.048, 2.045, 2.042,
+)
+_Z95 = 1.96
+
+
+def t_critical_95(dof: int) -> float:
+    """Two-sided 95% Student t quantile for ``dof`` degrees of freedom (``dof`` >= 1)."""
+    return _T95[dof - 1] if dof <= len(_T95) else _Z95
+
+
+@dataclass(frozen=True)
+class TrendFit:
+    """
+    Fits for k series over n months, projected ``horizon`` months ahead.
+
+    ``lower`` / ``upper`` bound each projected value with 95% confidence. They
+    are None when n < 3, because two points always fit a line exactly and
+    leave nothing to estimate the spread from.
+    """
+
+    slope: np.ndarray  # (k,)
+    intercept: np.ndarray  # (k,)
+    fitted: np.ndarray  # (k, n)
+    forecast: np.ndarray  # (k, horizon)
+    lower: Optional[np.ndarray]  # (k, horizon)
+    upper: Optional[np.ndarray]  # (k, horizon)
+
+
+def fit_trends(series, horizon: int = 3) -> TrendFit:
+    """
+    Fit a line to every row of ``series`` (k × n, or a single 1-D series, which
+    is treated as k = 1) against month numbers 0..n-1 and project ``horizon``
+    further months. NaN is treated as 0, the way months without activity are
+    reported. A single month gives a flat line through it.
+    """
+    y = np.nan_to_num(np.atleast_2d(np.asarray(series, dtype=float)))
+    n = y.shape[1]
+    if n == 0:
+        raise ValueError("fit_trends needs at least one month")
+
+    x = np.arange(n, dtype=float)
+    x_mean = x.mean()
+    dx = x - x_mean
+    sxx = float(dx @ dx)
+
+    y_mean = y.mean(axis=1)
+    slope = (y - y_mean[:, None]) @ dx / sxx if sxx else np.zeros(len(y))
+    intercept = y_mean - slope * x_mean
+
+    future = np.arange(n, n + horizon, dtype=float)
+    fitted = intercept[:, None] + slope[:, None] * x
+    forecast = intercept[:, None] + slope[:, None] * future
+
+    lower = upper = None
+    dof = n - 2
+    if dof >= 1:
+        residual_var = ((y - fitted) ** 2).sum(axis=1) / dof
+        leverage = 1.0 + 1.0 / n + (future - x_mean) ** 2 / sxx
+        half_width = t_critical_95(dof) * np.sqrt(residual_var[:, None] * leverage)
+        lower, upper = forecast - half_width, forecast + half_width
+
+    return TrendFit(slope, intercept, fitted, forecast, lower, upper)
+
+
+# ---------------------------------------------------------------------------
+__all__ = [
+    "TrendFit",
+    "fit_trends",
+    "t_critical_95",
+]
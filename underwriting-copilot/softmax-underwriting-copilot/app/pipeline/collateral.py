@@ -7,7 +7,8 @@ import httpx
 import structlog
 
 from ..config import get_settings
-from .market_search import derive_market_value
+from ..utils.timing import stage
+from . import market_search
 
 logger = structlog.get_logger("pipeline.collateral")
 
@@ -46,7 +47,8 @@ class CollateralClient:
         if collateral_type == "vehicle" and self.api_key:
             try:
                 logger.info("processing_vehicle_collateral", vehicle_data=collateral_payload)
-                api_response = self._call_remote(collateral_payload)
+                with stage("collateral_ml"):
+                    api_response = self._call_remote(collateral_payload)
                 response = self._create_llm_ready_response(collateral_payload, api_response)
                 logger.info("ml_valuation_success", estimated_value=response.get("estimatedValue"))
                 return response
@@ -63,7 +65,7 @@ class CollateralClient:
         # For real estate or non-vehicle collateral: always use web search
         if collateral_type in ["real_estate", "property", "apartment", "house"]:
             logger.info("processing_real_estate_collateral", collateral_data=collateral_payload)
-            market = derive_market_value(payload)
+            market = _search_market_value(payload)
             return self._compose_response(payload, market)
 
         # For vehicles in sandbox mode or when ML API unavailable: use web search
@@ -73,7 +75,7 @@ class CollateralClient:
 
         # For unknown collateral types: try web search or declared value
         logger.info("unknown_collateral_type", type=collateral_type)
-        market = derive_market_value(payload)
+        market = _search_market_value(payload)
         return self._compose_response(payload, market)
 
     def _try_vehicle_web_search(self, payload: Dict[str, Any], collateral_payload: Dict[str, Any]) -> Dict[str, Any]:
@@ -98,7 +100,7 @@ class CollateralClient:
         }
 
         try:
-            market = derive_market_value(temp_payload)
+            market = _search_market_value(temp_payload)
             response = self._compose_response(temp_payload, market)
 
             # Convert response back to vehicle format
@@ -250,6 +252,13 @@ class CollateralClient:
         }
 
 
+def _search_market_value(payload: Dict[str, Any]) -> Dict[str, Any]:
+    # Module-qualified on purpose: this module's own ``derive_market_value`` below
+    # redirects to ``valuate_collateral`` and would recurse.
+    with stage("market_search"):
+        return market_search.derive_market_value(payload)
+
+
 def valuate_collateral(payload: Dict[str, Any]) -> Dict[str, Any]:
     """Main entry point for collateral valuation."""
     client = CollateralClient()
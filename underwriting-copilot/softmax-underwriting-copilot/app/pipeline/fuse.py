@@ -1,17 +1,23 @@
 from __future__ import annotations
 
-import json
 from collections import defaultdict
 from datetime import datetime
 from typing import Any, Dict, Optional
 
+from ..utils.serialization import copy_json
+
 
 def fuse_features(
     payload: Dict[str, Any],
     parser_output: Dict[str, Any],
     collateral_output: Dict[str, Any],
+    large_tx_threshold: Optional[float] = None,
 ) -> Dict[str, Any]:
-    """Assemble the exact LLM input structure from upstream payloads and enrichments."""
+    """Assemble the exact LLM input structure from upstream payloads and enrichments.
+
+    With ``large_tx_threshold`` (the tenant's, see ``LargeTransactions.tenant_threshold``)
+    the bank statement section also lists the largest debits and credits above it.
+    """
     third_party = payload.get("third_party_data", {})
 
     credit_data = _safe_copy(
@@ -30,6 +36,13 @@ def fuse_features(
 
     documents = payload.get("documents") or {}
     bank_summary = _compute_bank_summary(parser_output or {}, documents)
+    rows = (parser_output or {}).get("rows")
+    if large_tx_threshold is not None and rows:
+        # pandas comes in with LargeTransactions; keep it off the worker's import path
+        from .bank_parser.LargeTransactions import large_transactions
+
+        bank_summary = dict(bank_summary or {})
+        bank_summary["large_transactions"] = large_transactions(rows, threshold=large_tx_threshold)
 
     collateral_section = _build_collateral_section(
         payload.get("collateral") or payload.get("collateral_offered"),
@@ -56,7 +69,7 @@ def fuse_features(
 def _safe_copy(value: Any) -> Any:
     if value is None:
         return None
-    return json.loads(json.dumps(value, ensure_ascii=False))
+    return copy_json(value)
 
 
 def _build_loan_request(source: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
@@ -134,11 +147,19 @@ def _compute_bank_summary(
     parser_output: Dict[str, Any],
     documents: Dict[str, Any],
 ) -> Optional[Dict[str, Any]]:
-    rows = parser_output.get("rows") or []
+    stats = parser_output.get("stats") or {}
     monthly_totals: Dict[str, float] = defaultdict(float)
     first_date: Optional[datetime] = None
     last_date: Optional[datetime] = None
 
+    if isinstance(stats.get("monthly_credit_totals"), dict):
+        # aggregated while the statement streamed in; the period comes from stats too
+        monthly_totals.update(stats["monthly_credit_totals"])
+        rows: list = []
+    else:
+        # stage outputs saved before the parser started aggregating
+        rows = parser_output.get("rows") or []
+
     for row in rows:
         if not isinstance(row, list) or not row:
             continue
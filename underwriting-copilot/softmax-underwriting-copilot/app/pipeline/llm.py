@@ -11,6 +11,7 @@ from opentelemetry import trace
 from opentelemetry.trace import Status, StatusCode
 
 from ..config import get_settings
+from ..utils.serialization import dumps
 
 logger = logging.getLogger(__name__)
 
@@ -78,9 +79,8 @@ def _gemini_request(system_prompt: str, contents: List[Dict[str, Any]]) -> Dict[
         )
 
     model_name = "gemini-2.5-pro-preview-05-06"
-    url = (
-        f"https://generativelanguage.googleapis.com/v1beta/models/{model_name}:generateContent?key={api_key}"
-    )
+    base_url = settings.llm_api_base_url.rstrip("/")
+    url = f"{base_url}/v1beta/models/{model_name}:generateContent?key={api_key}"
     headers = {"Content-Type": "application/json"}
     data = {"contents": contents, "systemInstruction": {"parts": [{"text": system_prompt}]}}
 
@@ -148,9 +148,10 @@ def _extract_memo_text(gemini_response: Dict[str, Any]) -> str:
 
 def generate_memo(features: Dict[str, Dict]) -> Tuple[str, Dict[str, Any]]:
     _ = get_settings()  # ensure settings loaded / future config use
-    user_prompt = json.dumps(features, ensure_ascii=False)
+    prompt_bytes = dumps(features)
+    user_prompt = prompt_bytes.decode()
     with tracer.start_as_current_span("llm.generate_memo") as span:
-        span.set_attribute("llm.input.size_bytes", len(user_prompt.encode("utf-8")))
+        span.set_attribute("llm.input.size_bytes", len(prompt_bytes))
         gemini_response = call_gemini_llm(SYSTEM_PROMPT, user_prompt)
         memo = _extract_memo_text(gemini_response)
         meta = {"raw_response": gemini_response}
@@ -134,9 +134,11 @@ class MarketListing:
 class SerpApiClient:
     base_url = "https://serpapi.com/search.json"
 
-    def __init__(self, api_key: str, timeout: float = 12.0) -> None:
+    def __init__(self, api_key: str, timeout: float = 12.0, base_url: str | None = None) -> None:
         self.api_key = api_key
         self.timeout = timeout
+        if base_url:
+            self.base_url = base_url
 
     def search(self, query: str, **params: object) -> Dict[str, object]:
         payload: Dict[str, object] = {
@@ -160,9 +162,11 @@ class SerpApiClient:
 class TavilyClient:
     base_url = "https://api.tavily.com/search"
 
-    def __init__(self, api_key: str, timeout: float = 12.0) -> None:
+    def __init__(self, api_key: str, timeout: float = 12.0, base_url: str | None = None) -> None:
         self.api_key = api_key
         self.timeout = timeout
+        if base_url:
+            self.base_url = base_url
 
     def search(self, query: str, **params: object) -> Dict[str, object]:
         payload: Dict[str, object] = {
@@ -470,7 +474,7 @@ def gather_market_listings(
     listings: List[MarketListing] = []
 
     if settings.serpapi_api_key:
-        client = SerpApiClient(settings.serpapi_api_key)
+        client = SerpApiClient(settings.serpapi_api_key, base_url=settings.serpapi_base_url)
         for query in queries:
             try:
                 payload = client.search(query, num=min(20, result_cap))
@@ -484,7 +488,7 @@ def gather_market_listings(
                     listings.append(normalized)
 
     if settings.tavily_api_key:
-        client = TavilyClient(settings.tavily_api_key)
+        client = TavilyClient(settings.tavily_api_key, base_url=settings.tavily_base_url)
         for query in queries:
             try:
                 payload = client.search(query, max_results=min(10, result_cap))
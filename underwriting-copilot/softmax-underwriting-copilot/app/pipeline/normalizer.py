@@ -7,8 +7,9 @@ from typing import Any, Dict, Iterable, List, Optional
 import numpy as np
 import pandas as pd
 
-from .bank_parser.MonthlyBalances import filter_by_keywords, prepare_monthly_balances
-from .bank_parser.NightTime import filter_night_transactions
+from .bank_parser.MonthlyBalances import prepare_monthly_balances
+from .bank_parser.flags import with_flags
+from .bank_parser.monthly import monthly_aggregates
 from .bank_parser.TransactionAccount import Transaction_Account
 
 __all__ = ["normalize"]
@@ -243,39 +244,40 @@ def _build_bank_statement_insights(
     if df.empty:
         return {"summary": summary_defaults, "meta": meta}
 
+    # keyword / night flags and the month buckets are computed once here and
+    # read by every figure below
+    df = with_flags(df)
+    monthly = monthly_aggregates(df)
+
     total_credit = float(df["credit_transaction"].sum())
-    suspicious_df = filter_by_keywords(df)
-    suspicious_credit = float(suspicious_df["credit_transaction"].sum()) if not suspicious_df.empty else 0.0
+    suspicious = df["flag_suspicious"]
+    suspicious_credit = float(df.loc[suspicious, "credit_transaction"].sum())
     if suspicious_credit <= 0.0:
-        mask = df["description"].str.contains('зээл', case=False, na=False)
-        suspicious_credit = float(df.loc[mask, "credit_transaction"].sum())
+        suspicious_credit = float(df.loc[df["flag_loan"], "credit_transaction"].sum())
 
-    suspicious_detected = bool(len(suspicious_df)) or suspicious_credit > 0
+    suspicious_detected = bool(suspicious.any()) or suspicious_credit > 0
 
     repeat_accounts = Transaction_Account(df)
     repeat_adjustment = _estimate_repeat_transfers(repeat_accounts, total_credit)
 
     adjusted_total = max(total_credit - suspicious_credit - repeat_adjustment, 0.0)
 
-    months_covered = _count_unique_months(df)
+    months_covered = len(monthly)
     meta["monthsCovered"] = months_covered
 
     avg_income = int(round(_safe_divide(adjusted_total, months_covered))) if months_covered else int(round(adjusted_total))
 
     coverage_text = _describe_period(df, stats)
-    monthly_stats = prepare_monthly_balances(df)
+    monthly_stats = prepare_monthly_balances(df, monthly)
     if not monthly_stats.empty and "Нийт Орлого" in monthly_stats:
         incomes = monthly_stats["Нийт Орлого"].astype(float).tolist()
     else:
-        incomes = _aggregate_monthly_credit(df)
+        incomes = monthly["credit_sum"].astype(float).tolist()
 
     volatility = _categorize_income_volatility(incomes)
     has_income_gaps = _has_income_gaps(incomes)
 
-    night_df = filter_night_transactions(df)
-    night_debit = (
-        float(night_df["debit_transaction"].sum()) if not night_df.empty else 0.0
-    )
+    night_debit = float(monthly["night_debit"].sum())
 
     summary = {
         "нийт_хамарсан_хугацаа": coverage_text,
@@ -366,13 +368,6 @@ def _rows_to_dataframe(rows: List[Any]) -> pd.DataFrame:
     return df
 
 
-def _count_unique_months(df: pd.DataFrame) -> int:
-    if df.empty or "transaction_date" not in df:
-        return 0
-    periods = df["transaction_date"].dropna().dt.to_period("M").unique()
-    return len(periods)
-
-
 def _describe_period(df: pd.DataFrame, stats: Dict[str, Any]) -> Optional[str]:
     dates = df["transaction_date"].dropna() if "transaction_date" in df else pd.Series()
     if not dates.empty:
@@ -390,20 +385,6 @@ def _describe_period(df: pd.DataFrame, stats: Dict[str, Any]) -> Optional[str]:
     return None
 
 
-def _aggregate_monthly_credit(df: pd.DataFrame) -> List[float]:
-    if df.empty or "transaction_date" not in df:
-        return []
-    valid = df.dropna(subset=["transaction_date"])
-    if valid.empty:
-        return []
-    grouped = (
-        valid.groupby(valid["transaction_date"].dt.to_period("M"))["credit_transaction"]
-        .sum()
-        .astype(float)
-    )
-    return grouped.tolist()
-
-
 def _categorize_income_volatility(incomes: List[float]) -> str:
     values = [v for v in incomes if v is not None]
     if len(values) < 2:
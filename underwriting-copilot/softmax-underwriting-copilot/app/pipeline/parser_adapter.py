@@ -1,66 +1,111 @@
 from __future__ import annotations
 
-import datetime as dt
+from collections import deque
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from .bank_parser import DataHandler  # noqa: F401 - ensures parsers register
-from .bank_parser.registry import detect_bank
+from .bank_parser import plugins  # noqa: F401 - registers the formats; parsers load on first use
+from .bank_parser.registry import extract_header, stream_bank
+from .statement_aggregates import OverlapFilter, StatementAggregates
 
 
 class ParserAdapterError(RuntimeError):
     pass
 
 
-_DATE_FORMATS = [
-    "%Y-%m-%d",
-    "%d.%m.%Y",
-    "%Y/%m/%d",
-]
-
-
-def _parse_date(candidate: str) -> Optional[dt.date]:
-    for fmt in _DATE_FORMATS:
-        try:
-            return dt.datetime.strptime(candidate, fmt).date()
-        except ValueError:
-            continue
-    return None
-
-
-def parse(pdf_path: str) -> Dict[str, Any]:
+def parse(pdf_path: str, *, keep_rows: bool = True, max_rows: Optional[int] = None) -> Dict[str, Any]:
+    """Parse a statement page by page into rows plus summary ``stats``.
+
+    With ``keep_rows=False`` the rows are only aggregated, never collected, so
+    memory stays flat however long the statement is. ``max_rows`` keeps just the
+    most recent rows instead; ``stats`` still cover the whole statement and
+    ``stats["rows_omitted"]`` says how many older rows were left out.
+    """
+    parse_out, _aggregates = parse_incremental(pdf_path, None, keep_rows=keep_rows, max_rows=max_rows)
+    return parse_out
+
+
+def parse_incremental(
+    pdf_path: str,
+    previous: Optional[StatementAggregates],
+    *,
+    keep_rows: bool = True,
+    max_rows: Optional[int] = None,
+) -> Tuple[Dict[str, Any], StatementAggregates]:
+    """``parse``, merging the statement into ``previous``, the stored aggregates of the same account.
+
+    Rows that ``previous`` already counted (see ``OverlapFilter``) are left out of
+    the aggregates, so a statement that extends an earlier one by a month only
+    adds that month. ``rows`` is still the whole statement (or its last
+    ``max_rows`` rows), since the memo is written from it. ``stats`` describe
+    the merged history. With ``previous`` given, ``stats["incremental"]`` also
+    records the earlier period and how many rows were new and how many were
+    skipped. Returns the parse output and the merged aggregates to store back;
+    ``previous`` itself is left unchanged.
+    """
     path = Path(pdf_path)
     if not path.exists():
         raise ParserAdapterError(f"PDF path not found: {pdf_path}")
 
-    rows: List[List[Any]]
-    bank_code: Optional[str]
-    customer_name: Optional[str]
-    account_number: Optional[str]
+    # a bounded deque drops the oldest rows as new pages arrive
+    rows: deque[List[Any]] = deque(maxlen=max_rows if keep_rows else 0)
+    seen = 0
+    statement = StatementAggregates()
+    overlap = OverlapFilter(previous) if previous is not None and previous.spans else None
+    header = None
 
     try:
-        rows, bank_code, customer_name, account_number = detect_bank(str(path))
+        streamed = stream_bank(str(path))
+        if streamed is not None:
+            header, batches = streamed
+            for batch in batches:
+                statement.add(batch, overlap)
+                seen += len(batch)
+                rows.extend(batch)
     except Exception as exc:  # pragma: no cover - defensive
         raise ParserAdapterError("bank_parser failed") from exc
 
-    rows = rows or []
-    bank_code = bank_code or "UNKNOWN"
-    customer_name = customer_name or ""
-    account_number = account_number or ""
+    merged = StatementAggregates().merge(previous).merge(statement) if previous is not None else statement
+    stats = merged.as_stats()
+    if keep_rows and len(rows) < seen:
+        stats["rows_omitted"] = seen - len(rows)
+    if previous is not None:
+        stats["incremental"] = {
+            "previous_period_from": previous.period_from.isoformat() if previous.period_from else None,
+            "previous_period_to": previous.period_to.isoformat() if previous.period_to else None,
+            "new_rows": statement.row_count,
+            "skipped_rows": overlap.skipped if overlap else 0,
+        }
+
+    parse_out = {
+        "bank_code": (header.bank_code if header else None) or "UNKNOWN",
+        "customer_name": (header.customer_name if header else None) or "",
+        "account_number": (header.account_number if header else None) or "",
+        "rows": list(rows),
+        "stats": stats,
+    }
+    return parse_out, merged
 
-    dates = [_parse_date(str(row[0])) for row in rows if row and isinstance(row[0], str)]
-    dates = [d for d in dates if d is not None]
 
-    stats = {
-        "row_count": len(rows),
-        "period_from": dates[0].isoformat() if dates else None,
-        "period_to": dates[-1].isoformat() if dates else None,
-    }
+def read_header(pdf_path: str) -> Dict[str, Any]:
+    """Bank, customer name, account number and statement interval from page 1 only.
+
+    Costs a few milliseconds (no table extraction), so ingest can reject a
+    statement that belongs to someone else before queueing the full parse.
+    """
+    path = Path(pdf_path)
+    if not path.exists():
+        raise ParserAdapterError(f"PDF path not found: {pdf_path}")
+
+    try:
+        header = extract_header(str(path))
+    except Exception as exc:  # pragma: no cover - defensive
+        raise ParserAdapterError("bank_parser header extraction failed") from exc
 
     return {
-        "bank_code": bank_code,
-        "customer_name": customer_name,
-        "account_number": account_number,
-        "rows": rows,
-        "stats": stats,
+        "bank_code": header.bank_code or "UNKNOWN",
+        "customer_name": header.customer_name,
+        "account_number": header.account_number,
+        "period_from": header.period_from.isoformat() if header.period_from else None,
+        "period_to": header.period_to.isoformat() if header.period_to else None,
     }
@@ -0,0 +1,349 @@
+"""Deterministic risk pre-score computed before the LLM memo.
+
+``score_application`` runs the job payload, parser output and collateral
+valuation through ``normalizer.normalize``. It then derives the ratios the memo
+prompt asks the LLM for:
+- DTI: existing monthly debt service / monthly income
+- DSR: the same plus the requested loan's installment
+- LTV of the pledged vehicle
+- credit history
+- income volatility and gaps in the statement
+- the share of suspicious credits
+
+Each ratio is mapped onto 0..1 and combined into a weighted ``risk_score``.
+That gives a ``decision`` (APPROVE / REVIEW / DECLINE) and a suggested monthly
+rate in the range the memo prompt gives the LLM. It takes milliseconds and no
+network.
+
+``RiskPolicy`` decides what the worker does with the result:
+- ``off``: nothing is scored.
+- ``annotate``: the structured result fields are filled and every job still
+  gets an LLM memo.
+- ``auto``: clear approvals and declines are settled here with a rule-based
+  memo, and only REVIEW cases go to the LLM.
+
+The default comes from ``RISK_PRESCORE_MODE`` and is ``off``; a tenant opts in,
+and can override any threshold, through ``rate_limit_cfg["risk_policy"]``.
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import asdict, dataclass, field, fields, replace
+from typing import Any, Dict, List, Mapping, Optional
+
+logger = logging.getLogger(__name__)
+
+APPROVE, REVIEW, DECLINE = "APPROVE", "REVIEW", "DECLINE"
+MODES = ("off", "annotate", "auto")
+
+# share of each factor in risk_score; they add up to 1
+WEIGHTS = {
+    "dsr": 0.30,
+    "dti": 0.10,
+    "ltv": 0.15,
+    "credit_history": 0.25,
+    "income_volatility": 0.10,
+    "suspicious": 0.10,
+}
+# factor value used when its inputs are missing: neither good nor bad
+_UNKNOWN = 0.5
+
+
+@dataclass(frozen=True)
+class RiskPolicy:
+    mode: str = "off"
+    approve_below: float = 0.25
+    decline_above: float = 0.70
+    # hard declines, whatever the score
+    max_dsr_pct: float = 80.0
+    max_ltv_pct: float = 120.0
+    max_dpd: int = 90
+    # suggested monthly rate, scaled by risk_score (the range SYSTEM_PROMPT gives the LLM)
+    rate_min_monthly_pct: float = 3.0
+    rate_max_monthly_pct: float = 4.0
+    # installment estimate when the request carries neither installment nor APR
+    assumed_monthly_rate_pct: float = 3.5
+
+
+def policy_for(cfg: Optional[Mapping[str, Any]], default_mode: str = "off") -> RiskPolicy:
+    """``RiskPolicy`` with ``default_mode``, overridden by a tenant's ``rate_limit_cfg["risk_policy"]``."""
+    policy = RiskPolicy(mode=default_mode if default_mode in MODES else "off")
+    overrides = (cfg or {}).get("risk_policy")
+    if not isinstance(overrides, Mapping):
+        return policy
+    updates: Dict[str, Any] = {}
+    for item in fields(RiskPolicy):
+        if item.name not in overrides:
+            continue
+        value = overrides[item.name]
+        try:
+            if item.name == "mode":
+                if value not in MODES:
+                    raise ValueError(value)
+                updates["mode"] = value
+            elif item.name == "max_dpd":
+                updates["max_dpd"] = int(value)
+            else:
+                updates[item.name] = float(value)
+        except (TypeError, ValueError):
+            logger.warning("ignoring invalid risk_policy.%s %r", item.name, value)
+    return replace(policy, **updates)
+
+
+@dataclass(frozen=True)
+class RiskAssessment:
+    risk_score: float
+    decision: str
+    interest_rate_suggestion: Optional[float]
+    # True when the policy settles the job without the LLM
+    auto: bool
+    reasons: List[str] = field(default_factory=list)
+    factors: Dict[str, float] = field(default_factory=dict)
+    metrics: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def _ramp(value: float, good: float, bad: float) -> float:
+    """0 at or below ``good``, 1 at or above ``bad``, linear in between."""
+    if value <= good:
+        return 0.0
+    if value >= bad:
+        return 1.0
+    return (value - good) / (bad - good)
+
+
+def _number(value: Any) -> float:
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value.replace(",", "").strip())
+        except ValueError:
+            return 0.0
+    return 0.0
+
+
+def _installment(amount: float, term: float, monthly_rate_pct: float) -> float:
+    if amount <= 0 or term <= 0:
+        return 0.0
+    rate = monthly_rate_pct / 100
+    if rate <= 0:
+        return amount / term
+    return amount * rate / (1 - (1 + rate) ** -term)
+
+
+def _normalize_inputs(payload: Dict[str, Any], collateral_out: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """The payload in the shapes ``normalize`` reads, from the same sources ``fuse`` uses."""
+    third_party = payload.get("third_party_data") or {}
+    credit = third_party.get("mongolbank_credit") or payload.get("credit_bureau_data") or {}
+
+    social_block = third_party.get("social_security") or payload.get("social_insurance_data")
+    social: Dict[str, Any] = {}
+    if isinstance(social_block, dict):
+        inner = social_block if "listData" in social_block else social_block.get("response") or social_block.get("data")
+        if isinstance(inner, dict):
+            social = {"response": inner}
+
+    loan = payload.get("loan") or payload.get("loan_request") or payload.get("requestedLoan") or {}
+    requested = {
+        "amountMNT": loan.get("amountMNT", loan.get("amount")),
+        "termMonths": loan.get("termMonths", loan.get("term_months")),
+        "aprPct": loan.get("aprPct", loan.get("apr_pct")),
+        "estimatedMonthlyInstallmentMNT": loan.get("estimatedMonthlyInstallmentMNT"),
+    }
+
+    offered = payload.get("collateralOffered") or payload.get("collateral_offered") or payload.get("collateral")
+    if isinstance(offered, dict):
+        offered = [offered]
+    collaterals = [dict(item) for item in offered or [] if isinstance(item, dict)]
+    valuation = collateral_out or {}
+    valued = _number(valuation.get("estimatedValue") or valuation.get("value"))
+    if collaterals and valued > 0:
+        first = collaterals[0]
+        if not _number(first.get("estimatedValueMNT", first.get("estValueMNT"))):
+            first["estimatedValueMNT"] = valued
+
+    return {
+        "loan_request": {"requestedLoan": requested, "collateralOffered": collaterals},
+        "credit_bureau": credit if isinstance(credit, dict) else {},
+        "social_insurance": social,
+    }
+
+
+def score_application(
+    payload: Dict[str, Any],
+    parse_out: Optional[Dict[str, Any]],
+    collateral_out: Optional[Dict[str, Any]],
+    policy: RiskPolicy,
+) -> RiskAssessment:
+    """Score one application; see the module docstring for the factors."""
+    # pandas comes in with the normalizer; keep it off the worker's import path
+    from .normalizer import normalize
+
+    inputs = _normalize_inputs(payload, collateral_out)
+    snapshot = normalize(bank_statement=parse_out or None, **inputs)
+
+    income = snapshot["income"]
+    bank_summary = snapshot["bankStatement"]["summary"]
+    bank_meta = snapshot["bankStatement"]["meta"]
+    has_statement = bool(bank_meta["rowCount"])
+    monthly_income = float(income["assumedNetMonthlyMNT"] or (bank_summary["дундаж_сарын_орлого"] if has_statement else 0))
+
+    bureau = inputs["credit_bureau"]
+    bureau_summary = bureau.get("summary") or {}
+    existing = max(
+        float(snapshot["existingDebtObligationsMNT"]["totalMonthly"]),
+        _number(bureau_summary.get("totalMonthlyPaymentMNT")),
+    )
+    proposed = snapshot["proposedLoan"]
+    installment = float(proposed["estimatedMonthlyInstallmentMNT"])
+    if installment <= 0:
+        monthly_rate = proposed["aprPct"] / 12 if proposed["aprPct"] else policy.assumed_monthly_rate_pct
+        installment = _installment(proposed["amountMNT"], proposed["termMonths"], monthly_rate)
+
+    dti = existing / monthly_income * 100 if monthly_income > 0 else None
+    dsr = (existing + installment) / monthly_income * 100 if monthly_income > 0 else None
+    ltv = snapshot["collateralCheck"]["ltvIfVehicleOnlyPct"]
+
+    profile = snapshot["creditProfile"]
+    max_dpd = _number(bureau_summary.get("maxDPDLast24M"))
+    if bureau:
+        credit_history = max(
+            _ramp(max_dpd, 0, 60),
+            _ramp(profile["dpd1to29Last12m"], 0, 3),
+            _ramp(profile["inquiries6m"], 2, 6),
+            _ramp(profile["cardUtilizationPct"], 50, 90),
+        )
+    else:
+        credit_history = _UNKNOWN
+
+    total_credit = bank_meta["totalCreditMNT"]
+    suspicious_share = bank_meta["suspiciousCreditMNT"] / total_credit * 100 if total_credit else 0.0
+    if has_statement:
+        volatility = (0.6 if bank_summary["орлогын_хэлбэлзэл"] == "хэлбэлзэлтэй" else 0.0) + (
+            0.4 if bank_summary["орлого_тасалдсан_сарууд"] else 0.0
+        )
+        suspicious = max(
+            _ramp(suspicious_share, 0, 20),
+            0.25 if bank_summary["сэжигтэй_гүйлгээ_илрүүлсэн"] else 0.0,
+        )
+    else:
+        volatility = suspicious = _UNKNOWN
+
+    factors = {
+        "dsr": _ramp(dsr, 35, 70) if dsr is not None else 1.0,
+        "dti": _ramp(dti, 20, 50) if dti is not None else 1.0,
+        "ltv": _ramp(ltv, 60, 100) if ltv is not None else _UNKNOWN,
+        "credit_history": credit_history,
+        "income_volatility": volatility,
+        "suspicious": suspicious,
+    }
+    risk_score = round(sum(WEIGHTS[name] * value for name, value in factors.items()), 3)
+
+    reasons = []
+    if dsr is not None and dsr > policy.max_dsr_pct:
+        reasons.append("dsr_above_max")
+    if max_dpd >= policy.max_dpd:
+        reasons.append("dpd_above_max")
+    if ltv is not None and ltv > policy.max_ltv_pct:
+        reasons.append("ltv_above_max")
+    if monthly_income <= 0:
+        reasons.append("income_unknown")
+    if not bureau:
+        reasons.append("bureau_missing")
+
+    # missing income or bureau data pushes the score up but only ever leads to REVIEW
+    if any(reason.endswith("_above_max") for reason in reasons):
+        decision = DECLINE
+    elif monthly_income <= 0 or not bureau:
+        decision = REVIEW
+    elif risk_score >= policy.decline_above:
+        decision = DECLINE
+    elif risk_score < policy.approve_below:
+        decision = APPROVE
+    else:
+        decision = REVIEW
+
+    rate = None
+    if decision != DECLINE:
+        spread = policy.rate_max_monthly_pct - policy.rate_min_monthly_pct
+        rate = round(policy.rate_min_monthly_pct + spread * risk_score, 2)
+
+    return RiskAssessment(
+        risk_score=risk_score,
+        decision=decision,
+        interest_rate_suggestion=rate,
+        auto=policy.mode == "auto" and decision != REVIEW,
+        reasons=reasons,
+        factors={name: round(value, 3) for name, value in factors.items()},
+        metrics={
+            "monthlyIncomeMNT": int(round(monthly_income)),
+            "existingDebtServiceMNT": int(round(existing)),
+            "proposedInstallmentMNT": int(round(installment)),
+            "dtiPct": round(dti, 1) if dti is not None else None,
+            "dsrPct": round(dsr, 1) if dsr is not None else None,
+            "ltvPct": ltv,
+            "maxDPDLast24M": int(max_dpd),
+            "suspiciousCreditSharePct": round(suspicious_share, 1),
+        },
+    )
+
+
+_DECISION_LABELS = {APPROVE: "Зөвшөөрөх", REVIEW: "Хянах", DECLINE: "Татгалзах"}
+_REASON_LABELS = {
+    "dsr_above_max": "Өрийн үйлчилгээ/орлогын харьцаа (DSR) дээд хязгаараас их",
+    "dpd_above_max": "Зээлийн түүхэнд хугацаа хэтэрсэн төлбөр дээд хязгаараас их",
+    "ltv_above_max": "Зээл/барьцааны харьцаа (LTV) дээд хязгаараас их",
+    "income_unknown": "Орлогын мэдээлэл олдсонгүй",
+    "bureau_missing": "Зээлийн мэдээллийн сангийн мэдээлэл байхгүй",
+}
+_METRIC_LABELS = (
+    ("monthlyIncomeMNT", "Сарын орлого (MNT)"),
+    ("existingDebtServiceMNT", "Одоогийн сарын өрийн төлбөр (MNT)"),
+    ("proposedInstallmentMNT", "Хүсэж буй зээлийн сарын төлбөр (MNT)"),
+    ("dtiPct", "DTI (%)"),
+    ("dsrPct", "DSR (%)"),
+    ("ltvPct", "LTV (%)"),
+    ("maxDPDLast24M", "Сүүлийн 24 сарын хамгийн их хугацаа хэтрэлт (өдөр)"),
+    ("suspiciousCreditSharePct", "Сэжигтэй орлогын хувь (%)"),
+)
+
+
+def render_memo(assessment: Dict[str, Any]) -> str:
+    """Markdown memo for a job the policy settled without the LLM (``assessment`` as in ``to_dict``)."""
+    decision = assessment["decision"]
+    lines = [
+        "## Кредит мемо (дүрэмд суурилсан урьдчилсан үнэлгээ)",
+        "",
+        f"**Шийдвэр:** {decision} ({_DECISION_LABELS.get(decision, decision)})",
+        f"**Эрсдэлийн оноо:** {assessment['risk_score']:.3f}",
+    ]
+    if assessment.get("interest_rate_suggestion") is not None:
+        lines.append(f"**Санал болгох сарын хүү:** {assessment['interest_rate_suggestion']:.2f}%")
+    lines += ["", "| Үзүүлэлт | Утга |", "| --- | --- |"]
+    metrics = assessment.get("metrics") or {}
+    for key, label in _METRIC_LABELS:
+        value = metrics.get(key)
+        lines.append(f"| {label} | {'—' if value is None else value} |")
+    reasons = assessment.get("reasons") or []
+    if reasons:
+        lines += ["", "**Үндэслэл:**"]
+        lines += [f"- {_REASON_LABELS.get(reason, reason)}" for reason in reasons]
+    lines += ["", "_Энэ мемог LLM ашиглалгүйгээр, тогтоосон бодлогын босго дээр үндэслэн автоматаар гаргав._"]
+    return "\n".join(lines)
+
+
+# ---------------------------------------------------------------------------
+__all__ = [
+    "APPROVE",
+    "DECLINE",
+    "REVIEW",
+    "RiskAssessment",
+    "RiskPolicy",
+    "policy_for",
+    "render_memo",
+    "score_application",
+]
@@ -0,0 +1,346 @@
+"""Running aggregates of one bank account's statements.
+
+``StatementAggregates`` is fed the parser's row batches as they stream in and
+keeps, per calendar month, credit / debit sums and counts, balance sums and
+keyword / night-time totals; per counterparty account, credit and debit sums;
+and the span of days the rows cover. ``as_stats()`` is the ``stats`` block of
+``parser_adapter.parse``.
+
+The aggregates are plain JSON (``to_dict`` / ``from_dict``), so the worker keeps
+them per account. When the applicant later sends a statement that extends an
+earlier one, only the rows the stored aggregates have not seen are merged in.
+``OverlapFilter`` drops rows dated strictly inside a covered span. It matches
+rows on a span's first and last day against fingerprints of the rows already
+counted there, so a day that is split across two statements is counted once.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import hashlib
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from .bank_parser.constants import NIGHT_END_HOUR, NIGHT_START_HOUR
+from .bank_parser.keywords import LOAN, REFUND, SUSPICIOUS, description_bits
+
+# positions in a parser row: date, branch, opening balance, debit, credit,
+# ending balance, description, counterparty account
+ROW_DATE, ROW_DEBIT, ROW_CREDIT, ROW_BALANCE, ROW_DESCRIPTION, ROW_ACCOUNT = 0, 3, 4, 5, 6, 7
+
+MONTH_KEYS = (
+    "rows",
+    "credit_sum",
+    "credit_count",
+    "debit_sum",
+    "debit_count",
+    "balance_sum",
+    "balance_count",
+    "suspicious_credit",
+    "suspicious_debit",
+    "night_credit",
+    "night_debit",
+    "loan_count",
+    "refund_count",
+)
+COUNTERPARTY_KEYS = ("credit_sum", "credit_count", "debit_sum", "debit_count")
+
+_DATE_FORMATS = [
+    "%Y-%m-%d",
+    "%d.%m.%Y",
+    "%Y/%m/%d",
+]
+
+
+def _parse_date(candidate: str) -> Optional[dt.date]:
+    for fmt in _DATE_FORMATS:
+        try:
+            return dt.datetime.strptime(candidate, fmt).date()
+        except ValueError:
+            continue
+    return None
+
+
+def _row_datetime(value: Any) -> Optional[dt.datetime]:
+    if isinstance(value, dt.datetime):
+        return value
+    if isinstance(value, str):
+        parsed = _parse_date(value)
+        return dt.datetime.combine(parsed, dt.time()) if parsed else None
+    return None
+
+
+def _amount(row: List[Any], index: int) -> float:
+    value = row[index] if len(row) > index else None
+    return float(value) if isinstance(value, (int, float)) and value > 0 else 0.0
+
+
+def row_fingerprint(row: List[Any], moment: dt.datetime) -> str:
+    """Stable digest of a row's date, amounts, balance, description and counterparty.
+
+    Whitespace in text cells is collapsed, because the same transaction can wrap
+    differently when it falls on another page of another statement.
+    """
+    parts = [moment.isoformat()]
+    for index in (ROW_DEBIT, ROW_CREDIT, ROW_BALANCE):
+        value = row[index] if len(row) > index else None
+        parts.append(repr(float(value)) if isinstance(value, (int, float)) else "")
+    for index in (ROW_DESCRIPTION, ROW_ACCOUNT):
+        value = row[index] if len(row) > index else None
+        parts.append(" ".join(value.split()) if isinstance(value, str) else "")
+    return hashlib.blake2b("\x1f".join(parts).encode(), digest_size=8).hexdigest()
+
+
+@dataclass
+class CoveredSpan:
+    """Days ``first``..``last`` whose rows are counted, with fingerprints of the rows on the two end days."""
+
+    first: dt.date
+    last: dt.date
+    head: Counter = field(default_factory=Counter)
+    tail: Counter = field(default_factory=Counter)
+
+    def extend(self, day: dt.date, row: List[Any], moment: dt.datetime) -> None:
+        if self.first < day < self.last:
+            return
+        fingerprint = row_fingerprint(row, moment)
+        if day < self.first:
+            self.first, self.head = day, Counter({fingerprint: 1})
+        elif day == self.first:
+            self.head[fingerprint] += 1
+        if day > self.last:
+            self.last, self.tail = day, Counter({fingerprint: 1})
+        elif day == self.last:
+            self.tail[fingerprint] += 1
+
+    def union(self, other: "CoveredSpan") -> "CoveredSpan":
+        """Span of two overlapping spans.
+
+        When end days coincide, the fingerprints of that day are combined as a
+        multiset union: the rows of one side were filtered against the other's,
+        so each row counted on that day appears on at least one side.
+        """
+        if other.first < self.first:
+            head = Counter(other.head)
+        else:
+            head = Counter(self.head) | (other.head if other.first == self.first else Counter())
+        if other.last > self.last:
+            tail = Counter(other.tail)
+        else:
+            tail = Counter(self.tail) | (other.tail if other.last == self.last else Counter())
+        return CoveredSpan(min(self.first, other.first), max(self.last, other.last), head, tail)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "first": self.first.isoformat(),
+            "last": self.last.isoformat(),
+            "head": dict(self.head),
+            "tail": dict(self.tail),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CoveredSpan":
+        return cls(
+            dt.date.fromisoformat(data["first"]),
+            dt.date.fromisoformat(data["last"]),
+            Counter(data.get("head") or {}),
+            Counter(data.get("tail") or {}),
+        )
+
+
+class StatementAggregates:
+    """Per-month, per-counterparty and coverage aggregates, fed batch by batch.
+
+    ``add`` takes the rows of one statement; ``merge`` folds in the aggregates of
+    another statement of the same account.
+    """
+
+    VERSION = 1
+
+    def __init__(self) -> None:
+        self.row_count = 0
+        self.months: Dict[str, Dict[str, float]] = {}
+        self.counterparties: Dict[str, Dict[str, float]] = {}
+        self.spans: List[CoveredSpan] = []
+
+    def add(self, batch: List[List[Any]], overlap: Optional["OverlapFilter"] = None) -> None:
+        """Count the rows of ``batch``; with ``overlap``, only those it reports as new.
+
+        The covered span grows by every dated row either way, since the days of a
+        statement are covered whether its rows were counted now or before.
+        """
+        if len(self.spans) > 1:
+            raise ValueError("add() takes the rows of one statement; use merge() to combine statements")
+        for row in batch:
+            moment = _row_datetime(row[ROW_DATE]) if row else None
+            if moment is not None:
+                day = moment.date()
+                if self.spans:
+                    self.spans[0].extend(day, row, moment)
+                else:
+                    fingerprint = row_fingerprint(row, moment)
+                    self.spans.append(CoveredSpan(day, day, Counter({fingerprint: 1}), Counter({fingerprint: 1})))
+            if overlap is not None and not overlap.is_new(row, moment):
+                continue
+            self.row_count += 1
+            if moment is not None:
+                self._add_row(row, moment)
+
+    def _add_row(self, row: List[Any], moment: dt.datetime) -> None:
+        month = moment.strftime("%Y-%m")
+        bucket = self.months.get(month)
+        if bucket is None:
+            bucket = self.months[month] = dict.fromkeys(MONTH_KEYS, 0)
+        credit = _amount(row, ROW_CREDIT)
+        debit = _amount(row, ROW_DEBIT)
+        description = row[ROW_DESCRIPTION] if len(row) > ROW_DESCRIPTION else None
+        bits = description_bits(description) if isinstance(description, str) else 0
+
+        bucket["rows"] += 1
+        if credit:
+            bucket["credit_sum"] += credit
+            bucket["credit_count"] += 1
+        if debit:
+            bucket["debit_sum"] += debit
+            bucket["debit_count"] += 1
+        balance = row[ROW_BALANCE] if len(row) > ROW_BALANCE else None
+        if isinstance(balance, (int, float)) and balance == balance:
+            bucket["balance_sum"] += float(balance)
+            bucket["balance_count"] += 1
+        if bits & SUSPICIOUS:
+            bucket["suspicious_credit"] += credit
+            bucket["suspicious_debit"] += debit
+        if moment.hour >= NIGHT_START_HOUR or moment.hour < NIGHT_END_HOUR:
+            bucket["night_credit"] += credit
+            bucket["night_debit"] += debit
+        if bits & LOAN:
+            bucket["loan_count"] += 1
+        if bits & REFUND:
+            bucket["refund_count"] += 1
+
+        account = row[ROW_ACCOUNT] if len(row) > ROW_ACCOUNT else None
+        account = account.strip() if isinstance(account, str) else ""
+        if account and (credit or debit):
+            party = self.counterparties.get(account)
+            if party is None:
+                party = self.counterparties[account] = dict.fromkeys(COUNTERPARTY_KEYS, 0)
+            if credit:
+                party["credit_sum"] += credit
+                party["credit_count"] += 1
+            if debit:
+                party["debit_sum"] += debit
+                party["debit_count"] += 1
+
+    def merge(self, other: "StatementAggregates") -> "StatementAggregates":
+        """Fold ``other`` in (in place) and return self. Overlap must be filtered out beforehand."""
+        self.row_count += other.row_count
+        for target, source, keys in (
+            (self.months, other.months, MONTH_KEYS),
+            (self.counterparties, other.counterparties, COUNTERPARTY_KEYS),
+        ):
+            for name, values in source.items():
+                bucket = target.get(name)
+                if bucket is None:
+                    target[name] = dict(values)
+                    continue
+                for key in keys:
+                    bucket[key] += values.get(key, 0)
+
+        spans: List[CoveredSpan] = []
+        for span in sorted([*self.spans, *other.spans], key=lambda s: s.first):
+            if spans and span.first <= spans[-1].last:
+                spans[-1] = spans[-1].union(span)
+            else:
+                spans.append(CoveredSpan(span.first, span.last, Counter(span.head), Counter(span.tail)))
+        self.spans = spans
+        return self
+
+    @property
+    def period_from(self) -> Optional[dt.date]:
+        return self.spans[0].first if self.spans else None
+
+    @property
+    def period_to(self) -> Optional[dt.date]:
+        return max(span.last for span in self.spans) if self.spans else None
+
+    def as_stats(self) -> Dict[str, Any]:
+        """Row count, date span and monthly credit totals; what ``fuse`` averages into income."""
+        return {
+            "row_count": self.row_count,
+            "period_from": self.period_from.isoformat() if self.period_from else None,
+            "period_to": self.period_to.isoformat() if self.period_to else None,
+            "monthly_credit_totals": {
+                month: bucket["credit_sum"]
+                for month, bucket in sorted(self.months.items())
+                if bucket["credit_count"]
+            },
+        }
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": self.VERSION,
+            "row_count": self.row_count,
+            "months": self.months,
+            "counterparties": self.counterparties,
+            "spans": [span.to_dict() for span in self.spans],
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "StatementAggregates":
+        aggregates = cls()
+        if data.get("version") != cls.VERSION:
+            return aggregates
+        aggregates.row_count = int(data.get("row_count") or 0)
+        aggregates.months = {month: dict(values) for month, values in (data.get("months") or {}).items()}
+        aggregates.counterparties = {
+            account: dict(values) for account, values in (data.get("counterparties") or {}).items()
+        }
+        aggregates.spans = [CoveredSpan.from_dict(span) for span in data.get("spans") or []]
+        return aggregates
+
+
+class OverlapFilter:
+    """Keeps only the rows of a new statement that ``previous`` has not counted yet.
+
+    A row dated strictly inside a covered span is dropped. A row on a span's first
+    or last day is dropped only if it matches a fingerprint recorded for that day,
+    and each fingerprint is used up once, so genuinely repeated transactions on
+    the split day are not lost. Rows without a parseable date cannot be placed
+    and are dropped. ``skipped`` counts the dropped rows.
+    """
+
+    def __init__(self, previous: StatementAggregates) -> None:
+        self._spans = [
+            CoveredSpan(span.first, span.last, Counter(span.head), Counter(span.tail)) for span in previous.spans
+        ]
+        self.skipped = 0
+
+    def is_new(self, row: List[Any], moment: Optional[dt.datetime]) -> bool:
+        """Whether ``row`` (dated ``moment``) is not counted yet; each call uses up a matching fingerprint."""
+        if moment is None:
+            self.skipped += 1
+            return False
+        day = moment.date()
+        for span in self._spans:
+            if day < span.first or day > span.last:
+                continue
+            if day != span.first and day != span.last:
+                self.skipped += 1
+                return False
+            seen = span.head if day == span.first else span.tail
+            fingerprint = row_fingerprint(row, moment)
+            if seen[fingerprint] > 0:
+                seen[fingerprint] -= 1
+                self.skipped += 1
+                return False
+        return True
+
+
+# ---------------------------------------------------------------------------
+__all__ = [
+    "CoveredSpan",
+    "OverlapFilter",
+    "StatementAggregates",
+    "row_fingerprint",
+]
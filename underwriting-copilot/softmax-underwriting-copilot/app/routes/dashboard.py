@@ -12,19 +12,27 @@ from ..db import (
     list_jobs_for_tenant,
     list_recent_jobs,
     list_tenants,
+    list_webhook_deliveries,
+    requeue_webhook,
+    stage_timing_percentiles,
     tenant_job_stats,
 )
-from ..models import Job, JobStatus
+from ..models import Job, JobStatus, WebhookDelivery, WebhookDeliveryStatus
 from ..schemas import (
     AdminTenantOverviewResponse,
     DashboardJobDetail,
     DashboardJobSummary,
     DashboardJobsResponse,
     DashboardSummary,
+    StageTimingBreakdownResponse,
+    StageTimingPercentiles,
     TenantDashboardSummaryResponse,
     TenantOverview,
+    WebhookDeliveriesResponse,
+    WebhookDeliverySummary,
 )
 from ..security import TenantAuthContext, require_scopes
+from ..utils.timing import STAGES
 
 router = APIRouter(prefix="/v1/dashboard", tags=["dashboard"])
 
@@ -64,6 +72,23 @@ def _summaries_to_overview(summaries: List[DashboardJobSummary]) -> DashboardSum
     )
 
 
+def _delivery_to_summary(delivery: WebhookDelivery) -> WebhookDeliverySummary:
+    status_value = delivery.status
+    return WebhookDeliverySummary(
+        delivery_id=delivery.id,
+        job_id=delivery.job_id,
+        tenant_id=delivery.tenant_id,
+        event=delivery.event,
+        status=status_value.value if isinstance(status_value, WebhookDeliveryStatus) else str(status_value),
+        attempts=delivery.attempts,
+        last_error=delivery.last_error,
+        next_attempt_at=delivery.next_attempt_at,
+        delivered_at=delivery.delivered_at,
+        created_at=delivery.created_at,
+        updated_at=delivery.updated_at,
+    )
+
+
 def _job_to_detail(
     job: Job,
     *,
@@ -91,9 +116,37 @@ def _job_to_detail(
         llm_output_markdown=result.memo_markdown if include_llm_output and result else None,
         llm_output_metadata=result.json_tail if result else None,
         audits=audits,
+        webhook_deliveries=[_delivery_to_summary(delivery) for delivery in job.webhook_deliveries],
+        stage_timings={timing.stage: timing.seconds for timing in _ordered_timings(job)},
     )
 
 
+def _stage_order(stage: str) -> tuple[int, str]:
+    return (STAGES.index(stage) if stage in STAGES else len(STAGES), stage)
+
+
+def _ordered_timings(job: Job):
+    return sorted(job.stage_timings, key=lambda timing: _stage_order(timing.stage))
+
+
+def _timing_breakdown(session: Session, lookback_hours: int, tenant_id: Optional[str]) -> StageTimingBreakdownResponse:
+    since = dt.datetime.utcnow() - dt.timedelta(hours=lookback_hours)
+    breakdown = stage_timing_percentiles(session, since, tenant_id=tenant_id)
+    stages = [
+        StageTimingPercentiles(
+            tenant_id=tenant,
+            stage=stage,
+            count=int(stats["count"]),
+            mean_seconds=round(float(stats["mean"]), 4),
+            p50_seconds=round(float(stats["p50"]), 4),
+            p90_seconds=round(float(stats["p90"]), 4),
+            p99_seconds=round(float(stats["p99"]), 4),
+        )
+        for (tenant, stage), stats in sorted(breakdown.items(), key=lambda item: (item[0][0], _stage_order(item[0][1])))
+    ]
+    return StageTimingBreakdownResponse(lookback_hours=lookback_hours, stages=stages)
+
+
 def _parse_status(value: Optional[str]) -> Optional[JobStatus]:
     if value is None:
         return None
@@ -103,6 +156,15 @@ def _parse_status(value: Optional[str]) -> Optional[JobStatus]:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid status filter") from exc
 
 
+def _parse_delivery_status(value: Optional[str]) -> Optional[WebhookDeliveryStatus]:
+    if value is None:
+        return None
+    try:
+        return WebhookDeliveryStatus(value)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid status filter") from exc
+
+
 @router.get("/tenant/jobs", response_model=DashboardJobsResponse)
 async def list_tenant_jobs(
     *,
@@ -152,6 +214,16 @@ async def tenant_summary(
     return TenantDashboardSummaryResponse(summary=summary)
 
 
+@router.get("/tenant/timings", response_model=StageTimingBreakdownResponse)
+async def tenant_stage_timings(
+    *,
+    lookback_hours: int = Query(24, ge=1, le=168),
+    session: Session = Depends(get_session),
+    ctx: TenantAuthContext = Depends(require_scopes("dashboard:read")),
+) -> StageTimingBreakdownResponse:
+    return _timing_breakdown(session, lookback_hours, ctx.tenant_id)
+
+
 @router.get("/admin/tenants", response_model=AdminTenantOverviewResponse)
 async def admin_tenant_overview(
     *,
@@ -180,6 +252,18 @@ async def admin_tenant_overview(
     return AdminTenantOverviewResponse(tenants=overviews)
 
 
+@router.get("/admin/timings", response_model=StageTimingBreakdownResponse)
+async def admin_stage_timings(
+    *,
+    session: Session = Depends(get_session),
+    ctx: TenantAuthContext = Depends(require_scopes("dashboard:admin")),
+    tenant_id: Optional[str] = Query(None),
+    lookback_hours: int = Query(24, ge=1, le=720),
+) -> StageTimingBreakdownResponse:
+    _ = ctx
+    return _timing_breakdown(session, lookback_hours, tenant_id)
+
+
 @router.get("/admin/jobs", response_model=DashboardJobsResponse)
 async def admin_jobs(
     *,
@@ -207,3 +291,46 @@ async def admin_job_detail(
     # Admins can see EVERYTHING: raw_input, llm_input, and llm_output
     return _job_to_detail(job, include_raw_input=True, include_llm_input=True, include_llm_output=True)
 
+
+@router.get("/tenant/webhooks", response_model=WebhookDeliveriesResponse)
+async def tenant_webhook_deliveries(
+    *,
+    limit: int = Query(50, ge=1, le=200),
+    status_filter: Optional[str] = Query(None, alias="status"),
+    session: Session = Depends(get_session),
+    ctx: TenantAuthContext = Depends(require_scopes("dashboard:read")),
+) -> WebhookDeliveriesResponse:
+    deliveries = list_webhook_deliveries(
+        session, tenant_id=ctx.tenant_id, status=_parse_delivery_status(status_filter), limit=limit
+    )
+    return WebhookDeliveriesResponse(deliveries=[_delivery_to_summary(d) for d in deliveries])
+
+
+@router.get("/admin/webhooks", response_model=WebhookDeliveriesResponse)
+async def admin_webhook_deliveries(
+    *,
+    session: Session = Depends(get_session),
+    ctx: TenantAuthContext = Depends(require_scopes("dashboard:admin")),
+    tenant_id: Optional[str] = Query(None),
+    status_filter: Optional[str] = Query("dead", alias="status"),
+    limit: int = Query(50, ge=1, le=200),
+) -> WebhookDeliveriesResponse:
+    _ = ctx
+    deliveries = list_webhook_deliveries(
+        session, tenant_id=tenant_id, status=_parse_delivery_status(status_filter), limit=limit
+    )
+    return WebhookDeliveriesResponse(deliveries=[_delivery_to_summary(d) for d in deliveries])
+
+
+@router.post("/admin/webhooks/{delivery_id}/retry", response_model=WebhookDeliverySummary)
+async def admin_retry_webhook(
+    delivery_id: str,
+    session: Session = Depends(get_session),
+    ctx: TenantAuthContext = Depends(require_scopes("dashboard:admin")),
+) -> WebhookDeliverySummary:
+    _ = ctx
+    delivery = requeue_webhook(session, delivery_id)
+    if delivery is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Delivery not found")
+    session.flush()
+    return _delivery_to_summary(delivery)
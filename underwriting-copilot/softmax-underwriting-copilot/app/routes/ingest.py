@@ -1,12 +1,19 @@
 from __future__ import annotations
 
+import json
+from typing import Any, Dict, List, Optional, Tuple
+
 from fastapi import APIRouter, Depends, HTTPException, Request, status
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from .. import metrics
 from ..db import (
     append_audit,
     create_job,
+    create_jobs_bulk,
+    find_existing_jobs,
     get_job_by_idempotency,
     get_job_by_request_hash,
     get_session,
@@ -14,13 +21,55 @@ from ..db import (
     hash_body,
     hash_header,
 )
-from ..schemas import CanonicalPayload, UnderwriteAcceptedResponse
-from ..security import TenantAuthContext, enforce_rate_limit, verify_inbound_signature
-from ..workers.tasks import enqueue_underwrite_job
+from ..models import PriorityLane, Tenant
+from ..config import get_settings
+from ..schemas import (
+    BulkUnderwriteItem,
+    BulkUnderwriteResponse,
+    CanonicalPayload,
+    UnderwriteAcceptedResponse,
+)
+from ..security import TenantAuthContext, enforce_bulk_item_limit, enforce_rate_limit, verify_inbound_signature
+from ..utils.serialization import dumps_canonical, loads
+from ..workers.tasks import enqueue_underwrite_job, enqueue_underwrite_jobs
 
 router = APIRouter(prefix="/v1", tags=["underwriting"])
 
 IDEMPOTENCY_HEADER = "Idempotency-Key"
+PRIORITY_HEADER = "X-Priority"
+
+
+def _request_hash(item: Any) -> str:
+    """Dedup hash of one submitted payload: canonical JSON, so key order and whitespace do not matter."""
+    return hash_body(dumps_canonical(item))
+
+
+def _legacy_hashes(item: Any, line: Optional[bytes]) -> List[str]:
+    """Hashes a bulk item would have had as a single request before the canonical rule.
+
+    Those jobs carry the hash of the raw request body. An NDJSON line is that body;
+    an array item has no bytes of its own, so the stdlib ``json.dumps`` forms most
+    clients send (default and compact separators) stand in for it.
+    """
+    if line is not None:
+        return [hash_body(line)]
+    return [
+        hash_body(json.dumps(item, ensure_ascii=False).encode()),
+        hash_body(json.dumps(item, separators=(",", ":"), ensure_ascii=False).encode()),
+    ]
+
+
+def _resolve_lane(
+    request: Request, tenant: Tenant, default: PriorityLane = PriorityLane.interactive
+) -> PriorityLane:
+    """Per-request ``X-Priority`` header wins over the tenant default in ``rate_limit_cfg``."""
+    requested = request.headers.get(PRIORITY_HEADER) or (tenant.rate_limit_cfg or {}).get("lane")
+    if not requested:
+        return default
+    try:
+        return PriorityLane(str(requested).lower())
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid priority lane") from exc
 
 
 @router.post(
@@ -41,14 +90,17 @@ async def submit_underwriting_job(
 
     idempotency_key = request.headers.get(IDEMPOTENCY_HEADER)
     idempotency_hash = hash_header(idempotency_key)
-    request_hash = hash_body(raw_body)
+    # same rule as the bulk endpoint, so a payload resubmitted through either one dedups
+    request_hash = _request_hash(loads(raw_body))
+    # jobs stored before the canonical rule carry the hash of the raw body
+    legacy_hash = hash_body(raw_body)
 
     if idempotency_hash:
         existing = get_job_by_idempotency(session, auth_ctx.tenant_id, idempotency_hash)
         if existing:
             return UnderwriteAcceptedResponse(job_id=existing.id, status=existing.status.value)
 
-    duplicate = get_job_by_request_hash(session, auth_ctx.tenant_id, request_hash)
+    duplicate = get_job_by_request_hash(session, auth_ctx.tenant_id, request_hash, legacy_hash)
     if duplicate:
         return UnderwriteAcceptedResponse(job_id=duplicate.id, status=duplicate.status.value)
 
@@ -56,18 +108,186 @@ async def submit_underwriting_job(
     if tenant is None:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Tenant missing")
 
-    job_payload = payload.model_dump(by_alias=True, exclude_none=True)
-    job = create_job(
-        session=session,
-        tenant=tenant,
-        payload=job_payload,
-        idempotency_hash=idempotency_hash,
-        request_hash=request_hash,
-        callback_url=str(payload.callback_url),
-    )
-    append_audit(session, job, actor="api", action="job_queued", hash_value=request_hash)
+    lane = _resolve_lane(request, tenant)
+    job_payload = payload.model_dump(mode="json", by_alias=True, exclude_none=True)
+    try:
+        job = create_job(
+            session=session,
+            tenant=tenant,
+            payload=job_payload,
+            idempotency_hash=idempotency_hash,
+            request_hash=request_hash,
+            callback_url=str(payload.callback_url),
+        )
+        append_audit(session, job, actor="api", action="job_queued", hash_value=request_hash)
+        # Commit before publishing so a worker can never pick up a job it cannot see yet.
+        session.commit()
+    except IntegrityError:
+        # a concurrent request created a job with the same job_id first
+        session.rollback()
+        existing = find_existing_jobs(
+            session, auth_ctx.tenant_id, client_job_ids=[job_payload["job_id"]], request_hashes=[]
+        )
+        if not existing:
+            raise
+        return UnderwriteAcceptedResponse(job_id=existing[0].id, status=existing[0].status.value)
 
-    metrics.jobs_created_total.labels(tenant_id=tenant.id).inc()
-    enqueue_underwrite_job(job.id)
+    metrics.jobs_created_total.labels(tenant_id=tenant.id, lane=lane.value).inc()
+    enqueue_underwrite_job(job.id, tenant_id=tenant.id, lane=lane)
 
     return UnderwriteAcceptedResponse(job_id=job.id, status=job.status.value)
+
+
+def _parse_bulk_body(request: Request, body: bytes) -> List[Tuple[Any, Optional[bytes]]]:
+    """``(item, line)`` pairs; ``line`` is the item's NDJSON line, None for JSON array items."""
+    content_type = request.headers.get("content-type", "")
+    try:
+        if "ndjson" in content_type or not body.lstrip().startswith(b"["):
+            return [(loads(line), line) for line in body.splitlines() if line.strip()]
+        items = loads(body)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Malformed JSON body") from exc
+    if not isinstance(items, list):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Expected a JSON array")
+    return [(item, None) for item in items]
+
+
+@router.post(
+    "/underwrite/bulk",
+    response_model=BulkUnderwriteResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def submit_underwriting_jobs_bulk(
+    request: Request,
+    session: Session = Depends(get_session),
+    auth_ctx: TenantAuthContext = Depends(verify_inbound_signature),
+    _: TenantAuthContext = Depends(enforce_rate_limit),
+) -> BulkUnderwriteResponse:
+    """Accept an NDJSON stream or JSON array of canonical payloads under one signature."""
+    raw_items = _parse_bulk_body(request, request.state.raw_body)
+    max_items = get_settings().bulk_ingest_max_items
+    if len(raw_items) > max_items:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {max_items} payloads per bulk request",
+        )
+
+    tenant = get_tenant_by_id(session, auth_ctx.tenant_id)
+    if tenant is None:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail="Tenant missing")
+    # the request itself costs one token above; every item also counts against the bulk budget
+    enforce_bulk_item_limit(tenant, len(raw_items))
+    lane = _resolve_lane(request, tenant, default=PriorityLane.bulk)
+
+    results: List[BulkUnderwriteItem] = []
+    valid: List[tuple[int, Dict[str, Any], str, List[str]]] = []
+    for index, (raw, line) in enumerate(raw_items):
+        try:
+            payload = CanonicalPayload.model_validate(raw)
+        except ValidationError as exc:
+            client_job_id = raw.get("job_id") if isinstance(raw, dict) else None
+            results.append(
+                BulkUnderwriteItem(
+                    index=index,
+                    client_job_id=client_job_id,
+                    status="invalid",
+                    errors=exc.errors(include_url=False, include_context=False, include_input=False),
+                )
+            )
+            continue
+        job_payload = payload.model_dump(mode="json", by_alias=True, exclude_none=True)
+        valid.append((index, job_payload, _request_hash(raw), _legacy_hashes(raw, line)))
+
+    existing = find_existing_jobs(
+        session,
+        tenant.id,
+        client_job_ids=[item[1]["job_id"] for item in valid],
+        request_hashes=[value for item in valid for value in (item[2], *item[3])],
+    )
+    by_client_id = {job.client_job_id: job for job in existing}
+    by_request_hash = {job.request_hash: job for job in existing if job.request_hash}
+
+    to_create: List[tuple[int, Dict[str, Any], str]] = []
+    seen: Dict[str, int] = {}
+    for index, job_payload, request_hash, legacy_hashes in valid:
+        client_job_id = job_payload["job_id"]
+        duplicate = next(
+            (by_request_hash[value] for value in (request_hash, *legacy_hashes) if value in by_request_hash),
+            by_client_id.get(client_job_id),
+        )
+        if duplicate is not None:
+            results.append(
+                BulkUnderwriteItem(
+                    index=index,
+                    client_job_id=client_job_id,
+                    job_id=duplicate.id,
+                    status=duplicate.status.value,
+                    duplicate=True,
+                )
+            )
+        elif client_job_id in seen:
+            results.append(
+                BulkUnderwriteItem(
+                    index=index,
+                    client_job_id=client_job_id,
+                    status="invalid",
+                    errors=[{"msg": f"Duplicate job_id in request (first at index {seen[client_job_id]})"}],
+                )
+            )
+        else:
+            seen[client_job_id] = index
+            to_create.append((index, job_payload, request_hash))
+
+    created = create_jobs_bulk(
+        session,
+        tenant,
+        [(job_payload, request_hash, job_payload["callback_url"]) for _, job_payload, request_hash in to_create],
+    )
+    # jobs a concurrent request created after the lookup above are duplicates too
+    lost = [job_payload["job_id"] for (_, job_payload, _), job_id in zip(to_create, created) if job_id is None]
+    raced = {
+        job.client_job_id: job
+        for job in find_existing_jobs(session, tenant.id, client_job_ids=lost, request_hashes=[])
+    }
+    job_ids: List[str] = []
+    for (index, job_payload, _), job_id in zip(to_create, created):
+        client_job_id = job_payload["job_id"]
+        if job_id is not None:
+            job_ids.append(job_id)
+            results.append(
+                BulkUnderwriteItem(index=index, client_job_id=client_job_id, job_id=job_id, status="queued")
+            )
+        elif client_job_id in raced:
+            duplicate = raced[client_job_id]
+            results.append(
+                BulkUnderwriteItem(
+                    index=index,
+                    client_job_id=client_job_id,
+                    job_id=duplicate.id,
+                    status=duplicate.status.value,
+                    duplicate=True,
+                )
+            )
+        else:  # pragma: no cover - the conflicting job was deleted again in between
+            results.append(
+                BulkUnderwriteItem(
+                    index=index,
+                    client_job_id=client_job_id,
+                    status="invalid",
+                    errors=[{"msg": "job_id conflicted with a concurrent submission; retry"}],
+                )
+            )
+    # Commit before publishing so a worker can never pick up a job it cannot see yet.
+    session.commit()
+
+    if job_ids:
+        metrics.jobs_created_total.labels(tenant_id=tenant.id, lane=lane.value).inc(len(job_ids))
+        enqueue_underwrite_jobs(job_ids, tenant_id=tenant.id, lane=lane)
+
+    results.sort(key=lambda item: item.index)
+    return BulkUnderwriteResponse(
+        accepted=len(job_ids),
+        duplicates=sum(1 for item in results if item.duplicate),
+        rejected=sum(1 for item in results if item.status == "invalid"),
+        items=results,
+    )
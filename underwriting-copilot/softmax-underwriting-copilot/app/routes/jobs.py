@@ -1,6 +1,7 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse, Response
 from sqlalchemy.orm import Session
 
 from ..db import (
@@ -20,7 +21,8 @@ from ..schemas import (
     PollingPullRequest,
     PollingPullResponse,
 )
-from ..security import TenantAuthContext, enforce_rate_limit, require_scopes
+from ..security import TenantAuthContext, enforce_rate_limit, require_scopes, verify_artifact_signature
+from ..utils.serialization import dumps
 
 router = APIRouter(prefix="/v1", tags=["jobs"])
 
@@ -53,6 +55,27 @@ async def get_job_status(
     return JobStatusResponse(data=response)
 
 
+@router.get("/jobs/{job_id}/artifacts/{artifact}")
+async def get_job_artifact(
+    job_id: str,
+    artifact: str,
+    expires: int = Query(...),
+    sig: str = Query(...),
+    session: Session = Depends(get_session),
+) -> Response:
+    """Serve webhook attachments; the pre-signed query string is the credential."""
+    verify_artifact_signature(job_id, artifact, expires, sig)
+    job = get_job_by_id(session, job_id)
+    if job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+
+    if artifact == "features" and job.features is not None:
+        return Response(content=dumps(job.features.json_encrypted or {}), media_type="application/json")
+    if artifact == "memo" and job.result is not None:
+        return PlainTextResponse(job.result.memo_markdown or "", media_type="text/markdown")
+    raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Artifact not found")
+
+
 @router.post("/jobs/pull", response_model=PollingPullResponse)
 async def polling_pull_jobs(
     request: PollingPullRequest,
@@ -3,10 +3,11 @@ from __future__ import annotations
 import datetime as dt
 
 from fastapi import APIRouter, Depends, status
+from sqlalchemy.orm import Session
 
+from ..db import enqueue_webhook, get_session
 from ..schemas import WebhookTestRequest
 from ..security import TenantAuthContext, enforce_rate_limit, require_scopes, sign_json
-from ..utils.webhooks import emit
 
 router = APIRouter(prefix="/v1", tags=["webhooks"])
 
@@ -14,6 +15,7 @@ router = APIRouter(prefix="/v1", tags=["webhooks"])
 @router.post("/webhooks/test", status_code=status.HTTP_202_ACCEPTED)
 async def send_test_webhook(
     request: WebhookTestRequest,
+    session: Session = Depends(get_session),
     ctx: TenantAuthContext = Depends(require_scopes("underwrite:read")),
     _: TenantAuthContext = Depends(enforce_rate_limit),
 ) -> dict[str, str]:
@@ -31,5 +33,11 @@ async def send_test_webhook(
         "timestamp": dt.datetime.utcnow().isoformat() + "Z",
     }
     payload["signature"] = sign_json(payload, ctx.webhook_secret)
-    emit(request.url, payload, ctx.webhook_secret)
-    return {"status": "queued"}
+    delivery = enqueue_webhook(
+        session,
+        tenant_id=ctx.tenant_id,
+        url=str(request.url),
+        event="memo.generated.test",
+        payload=payload,
+    )
+    return {"status": "queued", "delivery_id": delivery.id}
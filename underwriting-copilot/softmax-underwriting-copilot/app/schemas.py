@@ -57,6 +57,22 @@ class UnderwriteAcceptedResponse(BaseModel):
     status: str = "queued"
 
 
+class BulkUnderwriteItem(BaseModel):
+    index: int
+    client_job_id: Optional[str] = None
+    job_id: Optional[str] = None
+    status: str
+    duplicate: bool = False
+    errors: Optional[List[Dict[str, Any]]] = None
+
+
+class BulkUnderwriteResponse(BaseModel):
+    accepted: int
+    duplicates: int
+    rejected: int
+    items: List[BulkUnderwriteItem]
+
+
 class JobResult(BaseModel):
     job_id: str
     status: str
@@ -166,6 +182,24 @@ class DashboardSummary(BaseModel):
     average_processing_seconds: Optional[float] = None
 
 
+class WebhookDeliverySummary(BaseModel):
+    delivery_id: str
+    job_id: Optional[str] = None
+    tenant_id: str
+    event: str
+    status: str
+    attempts: int
+    last_error: Optional[str] = None
+    next_attempt_at: Optional[datetime] = None
+    delivered_at: Optional[datetime] = None
+    created_at: datetime
+    updated_at: datetime
+
+
+class WebhookDeliveriesResponse(BaseModel):
+    deliveries: List[WebhookDeliverySummary]
+
+
 class DashboardJobDetail(BaseModel):
     summary: DashboardJobSummary
     raw_input: Optional[Dict[str, Any]] = None
@@ -173,6 +207,24 @@ class DashboardJobDetail(BaseModel):
     llm_output_markdown: Optional[str] = None
     llm_output_metadata: Optional[Dict[str, Any]] = None
     audits: List[Dict[str, Any]]
+    webhook_deliveries: List[WebhookDeliverySummary] = Field(default_factory=list)
+    # Seconds per pipeline stage (queue_wait, download, detect, parse, ...).
+    stage_timings: Dict[str, float] = Field(default_factory=dict)
+
+
+class StageTimingPercentiles(BaseModel):
+    tenant_id: str
+    stage: str
+    count: int
+    mean_seconds: float
+    p50_seconds: float
+    p90_seconds: float
+    p99_seconds: float
+
+
+class StageTimingBreakdownResponse(BaseModel):
+    lookback_hours: int
+    stages: List[StageTimingPercentiles]
 
 
 class DashboardJobsResponse(BaseModel):
@@ -2,14 +2,16 @@ from __future__ import annotations
 
 import base64
 import hmac
-import json
 import secrets
 import time
 from collections import defaultdict, deque
+from functools import lru_cache
 from hashlib import sha256
 from threading import Lock
 from typing import Deque, Iterable, Optional, Sequence
 
+from cryptography.hazmat.primitives import hashes
+from cryptography.hazmat.primitives.kdf.hkdf import HKDF
 from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import APIKeyHeader, HTTPAuthorizationCredentials, HTTPBearer
 from jose import JWTError, jwt
@@ -18,6 +20,7 @@ from sqlalchemy.orm import Session
 from .config import get_settings
 from .db import get_session, get_tenant_by_api_key, get_tenant_by_id
 from .models import Tenant
+from .utils.serialization import dumps_signed
 
 api_key_scheme = APIKeyHeader(name="X-Api-Key", auto_error=False)
 bearer_scheme = HTTPBearer(auto_error=False)
@@ -118,24 +121,25 @@ async def verify_inbound_signature(
 
 
 class RateLimiter:
-    def __init__(self) -> None:
+    def __init__(self, window_seconds: float = 1.0) -> None:
         self._events: dict[str, Deque[float]] = defaultdict(deque)
         self._lock = Lock()
-        self._window_seconds = 1.0
+        self._window_seconds = window_seconds
 
-    def allow(self, tenant_id: str, rate_limit_rps: int) -> bool:
+    def allow(self, tenant_id: str, limit: int, cost: int = 1) -> bool:
         now = time.time()
         with self._lock:
             window = self._events[tenant_id]
             while window and window[0] <= now - self._window_seconds:
                 window.popleft()
-            if len(window) >= rate_limit_rps:
+            if len(window) + cost > limit:
                 return False
-            window.append(now)
+            window.extend([now] * cost)
             return True
 
 
 _rate_limiter = RateLimiter()
+_bulk_item_limiter = RateLimiter(window_seconds=60.0)
 
 
 async def enforce_rate_limit(ctx: TenantAuthContext = Depends(get_auth_context)) -> TenantAuthContext:
@@ -144,6 +148,13 @@ async def enforce_rate_limit(ctx: TenantAuthContext = Depends(get_auth_context))
     return ctx
 
 
+def enforce_bulk_item_limit(tenant: Tenant, items: int) -> None:
+    """Charge a bulk request one token per item against the tenant's per-minute item budget."""
+    limit = (tenant.rate_limit_cfg or {}).get("bulk_items_per_minute") or get_settings().bulk_ingest_items_per_minute
+    if not _bulk_item_limiter.allow(tenant.id, int(limit), cost=items):
+        raise HTTPException(status_code=status.HTTP_429_TOO_MANY_REQUESTS, detail="Bulk item rate limit exceeded")
+
+
 def require_scopes(*needed_scopes: str):
     async def dependency(ctx: TenantAuthContext = Depends(get_auth_context)) -> TenantAuthContext:
         ctx.ensure_scopes(needed_scopes)
@@ -168,5 +179,40 @@ def sign_payload(body: bytes, secret: str) -> str:
 
 
 def sign_json(payload: dict, secret: str) -> str:
-    body = json.dumps(payload, separators=(",", ":"), ensure_ascii=False).encode()
-    return sign_payload(body, secret)
+    return sign_payload(dumps_signed(payload), secret)
+
+
+@lru_cache(maxsize=4)
+def _derive_key(master: str, purpose: bytes) -> bytes:
+    return HKDF(algorithm=hashes.SHA256(), length=32, salt=None, info=purpose).derive(master.encode())
+
+
+def _artifact_key() -> bytes:
+    """``ARTIFACT_URL_SECRET``, else an HKDF subkey of ``ENCRYPTION_KEY``; never the Fernet key itself."""
+    settings = get_settings()
+    if settings.artifact_url_secret:
+        return settings.artifact_url_secret.encode()
+    return _derive_key(settings.resolved_encryption_key(), b"softmax-underwriting/artifact-url")
+
+
+def _artifact_signature(job_id: str, artifact: str, expires: int) -> str:
+    key = _artifact_key()
+    message = f"{job_id}:{artifact}:{expires}".encode()
+    return base64.urlsafe_b64encode(hmac.new(key, message, sha256).digest()).decode().rstrip("=")
+
+
+def signed_artifact_url(job_id: str, artifact: str, ttl_seconds: Optional[int] = None) -> tuple[str, int]:
+    """Return a pre-signed fetch URL for a job artifact and its expiry (unix seconds)."""
+    settings = get_settings()
+    expires = int(time.time()) + (ttl_seconds or settings.artifact_url_ttl_seconds)
+    signature = _artifact_signature(job_id, artifact, expires)
+    base = settings.public_base_url.rstrip("/")
+    return f"{base}/v1/jobs/{job_id}/artifacts/{artifact}?expires={expires}&sig={signature}", expires
+
+
+def verify_artifact_signature(job_id: str, artifact: str, expires: int, signature: str) -> None:
+    if expires < int(time.time()):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Link expired")
+    expected = _artifact_signature(job_id, artifact, expires)
+    if not hmac.compare_digest(signature, expected):
+        raise SignatureVerificationError("Invalid link signature")
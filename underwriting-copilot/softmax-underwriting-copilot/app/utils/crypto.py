@@ -1,12 +1,12 @@
 from __future__ import annotations
 
-import json
 from functools import lru_cache
 from typing import Any
 
 from cryptography.fernet import Fernet
 
 from ..config import get_settings
+from .serialization import dumps, loads
 
 
 @lru_cache(maxsize=1)
@@ -18,11 +18,9 @@ def get_cipher() -> Fernet:
 
 def encrypt_json(payload: Any) -> bytes:
     cipher = get_cipher()
-    data = json.dumps(payload, ensure_ascii=False).encode()
-    return cipher.encrypt(data)
+    return cipher.encrypt(dumps(payload))
 
 
 def decrypt_json(blob: bytes) -> Any:
     cipher = get_cipher()
-    data = cipher.decrypt(blob)
-    return json.loads(data)
+    return loads(cipher.decrypt(blob))
@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import datetime as dt
+import json
+from decimal import Decimal
+from typing import Any
+
+import orjson
+
+_DEFAULT_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+_CANONICAL_OPTIONS = _DEFAULT_OPTIONS | orjson.OPT_SORT_KEYS
+
+_IMMUTABLE_SCALARS = (str, int, float, bool, type(None), Decimal, dt.date, dt.time)
+
+
+def _default(value: Any) -> Any:
+    """Fallback encoder for types orjson does not handle natively."""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if hasattr(value, "isoformat"):
+        # pandas.Timestamp / pandas.Period and similar date-likes
+        return value.isoformat()
+    if hasattr(value, "item"):
+        # numpy scalar types not covered by OPT_SERIALIZE_NUMPY
+        return value.item()
+    # pydantic Url objects and anything else with a sensible text form
+    return str(value)
+
+
+def dumps(value: Any) -> bytes:
+    """Encode to compact UTF-8 JSON bytes."""
+    return orjson.dumps(value, default=_default, option=_DEFAULT_OPTIONS)
+
+
+def dumps_canonical(value: Any) -> bytes:
+    """Encode to canonical JSON (sorted keys, no whitespace) for request hashing."""
+    return orjson.dumps(value, default=_default, option=_CANONICAL_OPTIONS)
+
+
+def dumps_signed(value: Any) -> bytes:
+    """Encode the byte form ``sign_json`` signs: stdlib json, compact, insertion order.
+
+    Webhook receivers verify the embedded ``signature`` over exactly these bytes, and
+    orjson writes some floats differently (``1e-07`` vs ``1e-7``), so this stays on the
+    stdlib to keep existing signatures valid. It is not a canonical form: keys are not sorted.
+    """
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+def loads(data: bytes | bytearray | memoryview | str) -> Any:
+    return orjson.loads(data)
+
+
+def copy_json(value: Any) -> Any:
+    """Deep-copy a JSON-shaped value without an encode/decode round-trip.
+
+    Containers are rebuilt (tuples become lists, matching what a JSON round-trip
+    produced); immutable scalars are shared rather than copied.
+    """
+    if isinstance(value, dict):
+        return {key: copy_json(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [copy_json(item) for item in value]
+    if isinstance(value, _IMMUTABLE_SCALARS):
+        return value
+    return loads(dumps(value))
+
+
+__all__ = ["copy_json", "dumps", "dumps_canonical", "dumps_signed", "loads"]
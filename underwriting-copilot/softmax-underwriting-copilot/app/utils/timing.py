@@ -0,0 +1,72 @@
+"""Per-job stage timing ledger.
+
+A worker stage opens ``collect()`` and everything underneath it (parser adapter,
+collateral client, ...) wraps its work in ``stage(name)``. Outside a ``collect()``
+block ``stage`` is a no-op apart from the clock read, so pipeline modules can be
+instrumented without threading a recorder through every call.
+
+Dotted names (``parser.header``, ``parser.tables``, ...) are sub-stages nested
+inside a top-level stage; they show up in benchmarks but are not persisted.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+
+# Stage names, in pipeline order.
+STAGES = (
+    "queue_wait",
+    "download",
+    "detect",
+    "parse",
+    "collateral_ml",
+    "market_search",
+    "fuse",
+    "score",
+    "llm",
+    "persist",
+    "webhook",
+)
+
+_ledger: ContextVar[Optional[Dict[str, float]]] = ContextVar("stage_ledger", default=None)
+
+
+@contextmanager
+def collect() -> Iterator[Dict[str, float]]:
+    timings: Dict[str, float] = {}
+    token = _ledger.set(timings)
+    try:
+        yield timings
+    finally:
+        _ledger.reset(token)
+
+
+def add(name: str, seconds: float) -> None:
+    timings = _ledger.get()
+    if timings is not None:
+        timings[name] = timings.get(name, 0.0) + max(seconds, 0.0)
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        add(name, time.perf_counter() - start)
+
+
+def seconds_since(moment: Optional[dt.datetime]) -> float:
+    """Wall-clock seconds since a DB timestamp; naive values are taken as UTC."""
+    if moment is None:
+        return 0.0
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=dt.timezone.utc)
+    return max(time.time() - moment.timestamp(), 0.0)
+
+
+__all__ = ["STAGES", "add", "collect", "seconds_since", "stage"]
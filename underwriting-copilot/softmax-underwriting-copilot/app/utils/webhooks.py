@@ -1,16 +1,20 @@
 from __future__ import annotations
 
 import base64
+import gzip
 import hashlib
 import hmac
-import json
+import random
 import time
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional, Tuple
 
 import requests
 
+from .serialization import dumps
+
 DEFAULT_MAX_ATTEMPTS = 3
 DEFAULT_BACKOFF_SECONDS = 2
+SIGNATURE_HEADER = "X-Softmax-Signature"
 
 
 def sign(body: bytes, secret: str) -> str:
@@ -18,6 +22,81 @@ def sign(body: bytes, secret: str) -> str:
     return base64.b64encode(digest).decode()
 
 
+def build_request(
+    payload: Dict[str, Any],
+    secret: str,
+    gzip_threshold: Optional[int] = None,
+) -> Tuple[bytes, Dict[str, str]]:
+    """Serialize and sign a webhook body.
+
+    The signature always covers the uncompressed JSON, so receivers verify it the
+    same way whether or not the body arrived with ``Content-Encoding: gzip``.
+    """
+    body = dumps(payload)
+    headers = {
+        "Content-Type": "application/json",
+        SIGNATURE_HEADER: sign(body, secret),
+    }
+    if gzip_threshold is not None and len(body) > gzip_threshold:
+        body = gzip.compress(body, compresslevel=6)
+        headers["Content-Encoding"] = "gzip"
+    return body, headers
+
+
+def compute_backoff(
+    attempt: int,
+    *,
+    base_seconds: float,
+    max_seconds: float,
+    rand: Callable[[], float] = random.random,
+) -> float:
+    """Exponential back-off with equal jitter: half the step is fixed, half is random."""
+    step = min(max_seconds, base_seconds * (2 ** max(attempt - 1, 0)))
+    return step / 2 + rand() * step / 2
+
+
+class CircuitBreaker:
+    """Per-host breaker: opens after consecutive failures, half-opens after a cool-down."""
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_seconds: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    def seconds_until_retry(self) -> float:
+        if self._opened_at is None:
+            return 0.0
+        return max(self.reset_seconds - (self._clock() - self._opened_at), 0.0)
+
+    def allow(self) -> bool:
+        if self._opened_at is None:
+            return True
+        if self.seconds_until_retry() > 0 or self._trial_in_flight:
+            return False
+        # Cool-down elapsed: let exactly one trial request through (half-open).
+        self._trial_in_flight = True
+        return True
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._trial_in_flight or self._failures >= self.failure_threshold:
+            self._opened_at = self._clock()
+        self._trial_in_flight = False
+
+
 def emit(
     url: str,
     payload: Dict[str, Any],
@@ -25,13 +104,14 @@ def emit(
     timeout: int = 10,
     max_attempts: int = DEFAULT_MAX_ATTEMPTS,
     backoff_seconds: int = DEFAULT_BACKOFF_SECONDS,
+    gzip_threshold: Optional[int] = None,
 ) -> None:
-    body = json.dumps(payload, ensure_ascii=False).encode()
-    signature = sign(body, secret)
-    headers = {
-        "Content-Type": "application/json",
-        "X-Softmax-Signature": signature,
-    }
+    """Deliver synchronously with blocking retries.
+
+    Job webhooks go through the outbox (``db.enqueue_webhook``) and the async
+    dispatcher instead; this helper remains for scripts and manual re-sends.
+    """
+    body, headers = build_request(payload, secret, gzip_threshold)
 
     last_error: Optional[Exception] = None
     for attempt in range(1, max_attempts + 1):
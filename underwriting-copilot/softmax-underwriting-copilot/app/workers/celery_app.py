@@ -2,16 +2,33 @@ from __future__ import annotations
 
 import structlog
 from celery import Celery
+from celery.signals import worker_process_init
 from opentelemetry.metrics import Observation
 
 from ..config import get_settings
+from ..db import dispose_engine_after_fork
 from ..metrics import register_queue_depth_callback
 from ..observability import init_observability
 
 logger = structlog.get_logger("workers.celery")
 
+# One queue per resource profile so each worker pool can be sized and scaled on its own:
+# parsing is CPU-bound (prefork, one process per core); collateral/search and the LLM
+# call spend their time waiting on the network (thread pool, high concurrency).
+PARSE_QUEUE = "underwrite.parse"
+ENRICH_QUEUE = "underwrite.enrich"
+LLM_QUEUE = "underwrite.llm"
+UNDERWRITE_QUEUES = (PARSE_QUEUE, ENRICH_QUEUE, LLM_QUEUE)
 
-def _register_queue_depth_metric(broker_url: str, queue_name: str) -> None:
+TASK_ROUTES = {
+    "app.workers.tasks.underwrite": {"queue": PARSE_QUEUE},
+    "app.workers.tasks.parse_statement": {"queue": PARSE_QUEUE},
+    "app.workers.tasks.enrich_features": {"queue": ENRICH_QUEUE},
+    "app.workers.tasks.generate_memo": {"queue": LLM_QUEUE},
+}
+
+
+def _register_queue_depth_metric(broker_url: str, queue_names: tuple[str, ...]) -> None:
     if not broker_url.startswith("redis"):
         return
     try:
@@ -24,14 +41,23 @@ def _register_queue_depth_metric(broker_url: str, queue_name: str) -> None:
 
     def _callback() -> list[Observation]:
         try:
-            depth = client.llen(queue_name)
+            pipe = client.pipeline(transaction=False)
+            for queue_name in queue_names:
+                pipe.llen(queue_name)
+            depths = pipe.execute()
         except Exception as exc:  # pragma: no cover - redis connection issues
             logger.warning("queue_metric_sample_failed", error=str(exc))
             return []
-        return [Observation(depth, {"queue": queue_name})]
+        return [Observation(depth, {"queue": name}) for name, depth in zip(queue_names, depths)]
 
     register_queue_depth_callback(_callback)
-    logger.info("queue_metric_registered", queue=queue_name, broker=broker_url)
+    logger.info("queue_metric_registered", queues=list(queue_names), broker=broker_url)
+
+
+@worker_process_init.connect
+def _reset_db_pool(**_: object) -> None:
+    # Each prefork child builds its own pool instead of sharing the parent's connections.
+    dispose_engine_after_fork()
 
 
 def create_celery() -> Celery:
@@ -44,6 +70,7 @@ def create_celery() -> Celery:
         result_serializer="json",
         accept_content=["json"],
         timezone="UTC",
+        task_routes=TASK_ROUTES,
     )
 
     if broker_url.startswith("rediss://"):
@@ -51,7 +78,8 @@ def create_celery() -> Celery:
             "ssl_cert_reqs": "required",
         }
     init_observability("worker", instrument_celery=True)
-    _register_queue_depth_metric(broker_url, celery.conf.task_default_queue or "celery")
+    default_queue = celery.conf.task_default_queue or "celery"
+    _register_queue_depth_metric(broker_url, (default_queue, *UNDERWRITE_QUEUES))
     return celery
 
 
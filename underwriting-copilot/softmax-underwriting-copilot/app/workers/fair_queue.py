@@ -0,0 +1,175 @@
+"""Per-tenant, per-lane staging queues in Redis used for fair-share admission.
+
+Ingest pushes job ids here instead of straight onto the Celery parse queue; the
+fair scheduler (``app.workers.fair_scheduler``) drains them with weighted
+round-robin so one tenant's backlog cannot starve the others. A popped job
+sits in a processing list until its chain is published (``ack``), so a
+scheduler that dies in between loses nothing: ``requeue_in_flight`` puts such
+jobs back at the head of their queues.
+"""
+
+from __future__ import annotations
+
+import time
+from functools import lru_cache
+from typing import Dict, Iterable, Optional, Tuple
+
+import structlog
+
+from ..config import get_settings
+from ..models import PriorityLane
+
+logger = structlog.get_logger("workers.fair_queue")
+
+KEY_PREFIX = "uw:fair"
+
+
+def _queue_key(lane: str, tenant_id: str) -> str:
+    return f"{KEY_PREFIX}:{lane}:{tenant_id}"
+
+
+def _tenants_key(lane: str) -> str:
+    return f"{KEY_PREFIX}:{lane}:tenants"
+
+
+def _processing_key(lane: str, tenant_id: str) -> str:
+    return f"{KEY_PREFIX}:processing:{lane}:{tenant_id}"
+
+
+def _entry(job_id: str, enqueued_at: float) -> str:
+    # ack/release remove the entry by value, so it must format the same way every time
+    return f"{job_id}|{float(enqueued_at)}"
+
+
+def _lane_value(lane: PriorityLane | str) -> str:
+    return lane.value if isinstance(lane, PriorityLane) else str(lane)
+
+
+class SmoothWeightedRoundRobin:
+    """Smooth weighted round-robin (as in nginx): picks interleave in proportion to weight."""
+
+    def __init__(self) -> None:
+        self._current: Dict[str, int] = {}
+
+    def pick(self, weights: Dict[str, int]) -> Optional[str]:
+        if not weights:
+            return None
+        for stale in set(self._current) - set(weights):
+            del self._current[stale]
+
+        total = 0
+        best: Optional[str] = None
+        for key, weight in weights.items():
+            weight = max(int(weight), 1)
+            total += weight
+            self._current[key] = self._current.get(key, 0) + weight
+            if best is None or self._current[key] > self._current[best]:
+                best = key
+        assert best is not None
+        self._current[best] -= total
+        return best
+
+
+class FairQueue:
+    def __init__(self, client) -> None:
+        self.client = client
+
+    def push(
+        self,
+        job_id: str,
+        tenant_id: str,
+        lane: PriorityLane | str,
+        enqueued_at: Optional[float] = None,
+    ) -> None:
+        self.push_many([(job_id, tenant_id, lane)], enqueued_at=enqueued_at)
+
+    def push_many(
+        self,
+        items: Iterable[Tuple[str, str, PriorityLane | str]],
+        enqueued_at: Optional[float] = None,
+    ) -> None:
+        stamp = enqueued_at if enqueued_at is not None else time.time()
+        pipe = self.client.pipeline(transaction=False)
+        for job_id, tenant_id, lane in items:
+            lane_value = _lane_value(lane)
+            pipe.rpush(_queue_key(lane_value, tenant_id), _entry(job_id, stamp))
+            pipe.sadd(_tenants_key(lane_value), tenant_id)
+        pipe.execute()
+
+    def pop(self, lane: str, tenant_id: str) -> Optional[Tuple[str, float]]:
+        """Claim the oldest job; it stays in the processing list until ``ack`` or ``release``."""
+        raw = self.client.lmove(_queue_key(lane, tenant_id), _processing_key(lane, tenant_id), "LEFT", "RIGHT")
+        if raw is None:
+            return None
+        if isinstance(raw, bytes):
+            raw = raw.decode()
+        job_id, _, stamp = raw.partition("|")
+        return job_id, float(stamp or 0.0)
+
+    def ack(self, job_id: str, tenant_id: str, lane: str, enqueued_at: float) -> None:
+        """Forget a claimed job once its chain has been published."""
+        self.client.lrem(_processing_key(lane, tenant_id), 1, _entry(job_id, enqueued_at))
+
+    def release(self, job_id: str, tenant_id: str, lane: str, enqueued_at: float) -> None:
+        """Return a claimed job to the head of its queue, e.g. when dispatch failed."""
+        entry = _entry(job_id, enqueued_at)
+        pipe = self.client.pipeline()
+        pipe.lrem(_processing_key(lane, tenant_id), 1, entry)
+        pipe.lpush(_queue_key(lane, tenant_id), entry)
+        pipe.execute()
+
+    def requeue_in_flight(self) -> int:
+        """Move every claimed but unacknowledged job back to the head of its queue, oldest first.
+
+        Only safe while no scheduler is dispatching, i.e. on scheduler start (it runs
+        as one replica). A job whose chain went out just before a crash is admitted
+        twice rather than lost.
+        """
+        moved = 0
+        for lane, tenant_id in self._known_queues():
+            source, target = _processing_key(lane, tenant_id), _queue_key(lane, tenant_id)
+            while self.client.lmove(source, target, "RIGHT", "LEFT") is not None:
+                moved += 1
+        return moved
+
+    def _known_queues(self) -> list[Tuple[str, str]]:
+        lanes = [lane.value for lane in PriorityLane]
+        pipe = self.client.pipeline(transaction=False)
+        for lane in lanes:
+            pipe.smembers(_tenants_key(lane))
+        members = pipe.execute()
+
+        keys: list[Tuple[str, str]] = []
+        for lane, tenants in zip(lanes, members):
+            for tenant in tenants:
+                keys.append((lane, tenant.decode() if isinstance(tenant, bytes) else tenant))
+        return keys
+
+    def depths(self) -> Dict[Tuple[str, str], int]:
+        """Queue length keyed by ``(lane, tenant_id)``."""
+        keys = self._known_queues()
+        if not keys:
+            return {}
+        pipe = self.client.pipeline(transaction=False)
+        for lane, tenant in keys:
+            pipe.llen(_queue_key(lane, tenant))
+        return dict(zip(keys, pipe.execute()))
+
+
+@lru_cache(maxsize=1)
+def get_fair_queue() -> Optional[FairQueue]:
+    """Shared queue handle, or ``None`` when fair scheduling is off or Redis is not configured."""
+    settings = get_settings()
+    if not settings.fair_scheduling_enabled or not settings.redis_url:
+        return None
+    if not settings.redis_url.startswith("redis"):
+        return None
+    try:
+        from redis import Redis
+    except Exception as exc:  # pragma: no cover - defensive guard
+        logger.warning("fair_queue_redis_missing", error=str(exc))
+        return None
+    return FairQueue(Redis.from_url(settings.redis_url))
+
+
+__all__ = ["FairQueue", "SmoothWeightedRoundRobin", "get_fair_queue"]
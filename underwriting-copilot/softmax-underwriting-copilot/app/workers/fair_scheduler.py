@@ -0,0 +1,147 @@
+"""Fair-share admission of underwriting jobs into the Celery pipeline.
+
+Run with ``python -m app.workers.fair_scheduler`` (one replica). Jobs wait in
+per-tenant Redis lists (see ``fair_queue``); this loop keeps the parse queue
+topped up to ``FAIR_SCHEDULER_MAX_READY`` by picking a lane (interactive vs
+bulk, weighted by ``FAIR_LANE_WEIGHTS``) and then a tenant within that lane
+(weighted by ``rate_limit_cfg["weight"]``). Keeping the Celery queue short is
+what lets a newly arrived interactive job overtake a large bulk backlog.
+A job is acknowledged only after its chain is published; on start the loop
+re-queues whatever a previous run claimed but never acknowledged.
+"""
+
+from __future__ import annotations
+
+import signal
+import time
+from typing import Callable, Dict, Optional
+
+import structlog
+from opentelemetry.metrics import Observation
+
+from .. import metrics
+from ..config import Settings, get_settings
+from ..db import list_tenants, session_scope
+from ..logging import configure_logging
+from ..observability import init_observability
+from .celery_app import PARSE_QUEUE
+from .fair_queue import FairQueue, SmoothWeightedRoundRobin, get_fair_queue
+from .tasks import underwrite_chain
+
+logger = structlog.get_logger("workers.fair_scheduler")
+
+
+class FairScheduler:
+    def __init__(
+        self,
+        queue: FairQueue,
+        ready_depth: Callable[[], int],
+        settings: Optional[Settings] = None,
+    ) -> None:
+        self.queue = queue
+        self.settings = settings or get_settings()
+        self._ready_depth = ready_depth
+        self._lane_rr = SmoothWeightedRoundRobin()
+        self._tenant_rr: Dict[str, SmoothWeightedRoundRobin] = {}
+        self._tenant_weights: Dict[str, int] = {}
+        self._weights_loaded_at = 0.0
+        self._stopping = False
+
+    def stop(self) -> None:
+        self._stopping = True
+
+    def _weights(self) -> Dict[str, int]:
+        now = time.monotonic()
+        if now - self._weights_loaded_at >= self.settings.fair_scheduler_weight_refresh_seconds:
+            with session_scope() as session:
+                self._tenant_weights = {
+                    tenant.id: int((tenant.rate_limit_cfg or {}).get("weight", 1))
+                    for tenant in list_tenants(session)
+                }
+            self._weights_loaded_at = now
+        return self._tenant_weights
+
+    def run_once(self) -> int:
+        capacity = self.settings.fair_scheduler_max_ready - self._ready_depth()
+        if capacity <= 0:
+            return 0
+
+        depths = self.queue.depths()
+        tenant_weights = self._weights()
+        lane_weights = self.settings.fair_lane_weights
+        dispatched = 0
+        while dispatched < capacity:
+            active: Dict[str, Dict[str, int]] = {}
+            for (lane, tenant_id), depth in depths.items():
+                if depth > 0:
+                    active.setdefault(lane, {})[tenant_id] = tenant_weights.get(tenant_id, 1)
+            lane = self._lane_rr.pick({name: lane_weights.get(name, 1) for name in active})
+            if lane is None:
+                break
+            tenant_id = self._tenant_rr.setdefault(lane, SmoothWeightedRoundRobin()).pick(active[lane])
+            assert tenant_id is not None
+
+            item = self.queue.pop(lane, tenant_id)
+            if item is None:
+                depths[(lane, tenant_id)] = 0
+                continue
+            depths[(lane, tenant_id)] -= 1
+            job_id, enqueued_at = item
+            try:
+                underwrite_chain(job_id).apply_async()
+            except Exception:
+                self.queue.release(job_id, tenant_id, lane, enqueued_at)
+                raise
+            self.queue.ack(job_id, tenant_id, lane, enqueued_at)
+            metrics.queue_wait_seconds.labels(tenant_id=tenant_id, lane=lane).observe(
+                max(time.time() - enqueued_at, 0.0)
+            )
+            dispatched += 1
+        return dispatched
+
+    def run_forever(self) -> None:
+        recovered = self.queue.requeue_in_flight()
+        if recovered:
+            logger.warning("fair_scheduler_requeued_in_flight", jobs=recovered)
+        while not self._stopping:
+            try:
+                dispatched = self.run_once()
+            except Exception as exc:  # pragma: no cover - resilience
+                logger.exception("fair_scheduler_error", error=str(exc))
+                dispatched = 0
+            if dispatched == 0:
+                time.sleep(self.settings.fair_scheduler_poll_seconds)
+
+
+def _register_fair_queue_depth_metric(queue: FairQueue) -> None:
+    def _callback() -> list[Observation]:
+        try:
+            depths = queue.depths()
+        except Exception as exc:  # pragma: no cover - redis connection issues
+            logger.warning("fair_queue_metric_sample_failed", error=str(exc))
+            return []
+        return [
+            Observation(depth, {"queue": "underwrite.fair", "tenant_id": tenant_id, "lane": lane})
+            for (lane, tenant_id), depth in depths.items()
+        ]
+
+    metrics.register_queue_depth_callback(_callback)
+
+
+def main() -> None:
+    configure_logging()
+    init_observability("fair-scheduler")
+    queue = get_fair_queue()
+    if queue is None:
+        raise SystemExit("Fair scheduling requires FAIR_SCHEDULING_ENABLED and a redis:// REDIS_URL")
+    _register_fair_queue_depth_metric(queue)
+
+    scheduler = FairScheduler(queue, ready_depth=lambda: int(queue.client.llen(PARSE_QUEUE)))
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(sig, lambda *_: scheduler.stop())
+    logger.info("fair_scheduler_started", max_ready=scheduler.settings.fair_scheduler_max_ready)
+    scheduler.run_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,5 @@
 from __future__ import annotations
 
-import json
 import time
 from typing import Any, Dict, List
 
@@ -10,12 +9,12 @@ import structlog
 from ..pipeline import collateral, fuse, llm, parser_adapter
 from ..security import sign_payload
 from ..utils import pdf, storage
+from ..utils.serialization import dumps
 
 logger = structlog.get_logger("polling_worker")
 
 
-def _headers(api_key: str, tenant_secret: str, body: Dict[str, Any]) -> Dict[str, str]:
-    data = json.dumps(body, ensure_ascii=False).encode()
+def _headers(api_key: str, tenant_secret: str, data: bytes) -> Dict[str, str]:
     signature = sign_payload(data, tenant_secret)
     return {
         "Content-Type": "application/json",
@@ -42,11 +41,11 @@ class PollingWorker:
             time.sleep(self.interval_seconds)
 
     def _pull_jobs(self) -> List[Dict[str, Any]]:
-        body = {"max_jobs": 1}
+        data = dumps({"max_jobs": 1})
         response = requests.post(
             f"{self.base_url}/v1/jobs/pull",
-            headers=_headers(self.api_key, self.tenant_secret, body),
-            json=body,
+            headers=_headers(self.api_key, self.tenant_secret, data),
+            data=data,
             timeout=30,
         )
         response.raise_for_status()
@@ -77,10 +76,11 @@ class PollingWorker:
                     "llm_raw_response": meta.get("raw_response"),
                 },
             }
+            data = dumps(body)
             response = requests.post(
                 f"{self.base_url}/v1/jobs/complete",
-                headers=_headers(self.api_key, self.tenant_secret, body),
-                json=body,
+                headers=_headers(self.api_key, self.tenant_secret, data),
+                data=data,
                 timeout=30,
             )
             response.raise_for_status()
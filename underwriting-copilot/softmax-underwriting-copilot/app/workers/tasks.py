@@ -1,167 +1,483 @@
 from __future__ import annotations
 
 import datetime as dt
+import time
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Sequence, Tuple
 
 import structlog
+from celery import chain
 from opentelemetry import trace
 from opentelemetry.trace import Status, StatusCode
+from sqlalchemy.orm import Session
 
 from .. import metrics
 from ..metrics import underwrite_duration_seconds
+from ..config import get_settings
 from ..db import (
-    append_audit,
+    complete_job,
     get_job_by_id,
+    hash_account,
+    load_stage_output,
+    load_statement_aggregate,
     persist_features,
-    persist_result,
+    record_stage_timings,
+    save_stage_output,
+    save_statement_aggregate,
     session_scope,
-    update_job_status,
+    set_job_status,
 )
-from ..models import JobStatus
-from ..pipeline import collateral, fuse, llm, parser_adapter
-from ..security import sign_json
-from ..utils import pdf, storage, webhooks
+from ..models import Job, JobStatus, PriorityLane, WebhookPayloadMode, _uuid
+from ..pipeline import collateral, fuse, llm, parser_adapter, scoring
+from ..pipeline.statement_aggregates import StatementAggregates
+from ..security import sign_json, signed_artifact_url
+from ..utils import pdf, storage, timing
 from .celery_app import celery_app
+from .fair_queue import get_fair_queue
 
 logger = structlog.get_logger("workers.tasks")
 tracer = trace.get_tracer("app.workers.tasks")
 
+# Keys for the per-stage outputs handed along the chain by job id.
+STAGE_PARSE = "parse"
+STAGE_ENRICH = "enrich"
+STAGE_SCORE = "score"
+STAGE_LLM = "llm"
+# worker seconds spent by the stages so far; the last stage reports the sum
+STAGE_PROCESSING = "processing"
 
-@celery_app.task(name="app.workers.tasks.underwrite")
-def underwrite(job_id: str) -> None:
-    with tracer.start_as_current_span("underwrite.job", attributes={"job.id": job_id}) as span:
-        with session_scope() as session:
-            job = get_job_by_id(session, job_id)
-            if job is None:
-                span.set_status(Status(StatusCode.ERROR, "job_missing"))
-                logger.warning("job_missing", job_id=job_id)
-                return
-
-            tenant_id = job.tenant_id
+
+@dataclass(frozen=True)
+class JobContext:
+    """Plain snapshot of the job fields a stage needs after its read session has closed."""
+
+    job_id: str
+    tenant_id: str
+    client_job_id: str
+    callback_url: Optional[str]
+    webhook_secret: str
+    webhook_payload_mode: WebhookPayloadMode
+
+    @classmethod
+    def from_job(cls, job: Job) -> "JobContext":
+        return cls(
+            job_id=job.id,
+            tenant_id=job.tenant_id,
+            client_job_id=job.client_job_id,
+            callback_url=job.callback_url,
+            webhook_secret=job.tenant.webhook_secret,
+            webhook_payload_mode=_webhook_payload_mode(job.tenant.rate_limit_cfg),
+        )
+
+
+def _large_tx_threshold(cfg: Optional[Dict[str, Any]]) -> float:
+    """Tenant's ``rate_limit_cfg["large_tx_threshold"]``, else ``LARGE_TX_THRESHOLD``."""
+    # LargeTransactions brings pandas; keep it off the worker's import path
+    from ..pipeline.bank_parser.LargeTransactions import tenant_threshold
+
+    return tenant_threshold(cfg)
+
+
+def _webhook_payload_mode(cfg: Optional[Dict[str, Any]]) -> WebhookPayloadMode:
+    """Tenant's ``rate_limit_cfg["webhook_payload_mode"]``; anything unknown falls back to ``full``."""
+    value = (cfg or {}).get("webhook_payload_mode", WebhookPayloadMode.full.value)
+    try:
+        return WebhookPayloadMode(value)
+    except ValueError:
+        logger.warning("invalid_webhook_payload_mode", value=value)
+        return WebhookPayloadMode.full
+
+
+def build_webhook_payload(
+    ctx: JobContext,
+    *,
+    decision: Any,
+    interest: Any,
+    risk_score: Any,
+    features: Dict[str, Any],
+    memo_markdown: str,
+    audit_id: str,
+) -> Dict[str, Any]:
+    """Assemble the ``memo.generated`` body for the tenant's payload mode.
+
+    In ``reference`` mode the features and memo are left out and only the signed,
+    expiring attachment URLs are sent; ``full`` mode keeps them inline.
+    """
+    attachments = []
+    for name, artifact, media_type in (
+        ("features.json", "features", "application/json"),
+        ("memo.md", "memo", "text/markdown"),
+    ):
+        url, expires = signed_artifact_url(ctx.job_id, artifact)
+        attachments.append(
+            {
+                "type": media_type,
+                "name": name,
+                "url": url,
+                "expires_at": dt.datetime.utcfromtimestamp(expires).isoformat() + "Z",
+            }
+        )
+
+    payload: Dict[str, Any] = {
+        "event": "memo.generated",
+        "job_id": ctx.job_id,
+        "client_job_id": ctx.client_job_id,
+        "decision": decision,
+        "interest_rate_suggestion": interest,
+        "risk_score": risk_score,
+        "payload_mode": WebhookPayloadMode.full.value,
+        "attachments": attachments,
+        "audit_ref": audit_id,
+        "timestamp": dt.datetime.utcnow().isoformat() + "Z",
+    }
+    if ctx.webhook_payload_mode == WebhookPayloadMode.reference:
+        payload["payload_mode"] = WebhookPayloadMode.reference.value
+    else:
+        payload["llm_input"] = features
+        payload["credit_memo_markdown"] = memo_markdown
+    return payload
+
+
+def _processed_seconds(session: Session, job_id: str) -> float:
+    stored = load_stage_output(session, job_id, STAGE_PROCESSING) or {}
+    return float(stored.get("seconds", 0.0))
+
+
+def _observe_durations(tenant_id: str, processing_seconds: float, created_at: Optional[dt.datetime]) -> None:
+    """``total`` is worker processing time across the stages; ``end_to_end`` runs from ingest, queueing included."""
+    underwrite_duration_seconds.labels(tenant_id=tenant_id, stage="total").observe(processing_seconds)
+    underwrite_duration_seconds.labels(tenant_id=tenant_id, stage="end_to_end").observe(
+        timing.seconds_since(created_at)
+    )
+
+
+def _mark_failed(job_id: str, stage: str, exc: Exception, task_start: Optional[float] = None) -> None:
+    """Record a stage failure in its own short transaction."""
+    span = trace.get_current_span()
+    span.record_exception(exc)
+    span.set_status(Status(StatusCode.ERROR, str(exc)))
+    logger.exception("underwrite_failed", job_id=job_id, stage=stage, error=str(exc))
+    with session_scope() as session:
+        job = get_job_by_id(session, job_id)
+        if job is None:
+            return
+        set_job_status(session, job_id, JobStatus.failed)
+        metrics.jobs_failed_total.labels(tenant_id=job.tenant_id).inc()
+        if task_start is not None:
+            processing = _processed_seconds(session, job_id) + time.perf_counter() - task_start
+            _observe_durations(job.tenant_id, processing, job.created_at)
+
+
+# Each stage opens a session only around its reads and its writes; no connection is
+# checked out while downloading, parsing or waiting on collateral/LLM services.
+# Stage timings are collected with ``timing.collect()`` and written in that same
+# write transaction, so the ledger costs no extra round trip.
+
+
+def _parse_statement(tenant_id: str, pdf_path: str) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """Parse a statement; with ``INCREMENTAL_STATEMENTS_ENABLED``, merged into the account's stored aggregates.
+
+    Returns the parse output and the ``save_statement_aggregate`` arguments to
+    write along with it (None when nothing is to be stored). Two jobs for the
+    same account racing each other both merge into the same stored state and the
+    later save wins, which can drop a statement from the history but never
+    counts one twice.
+    """
+    settings = get_settings()
+    max_rows = settings.statement_max_rows
+    if not settings.incremental_statements_enabled:
+        return parser_adapter.parse(pdf_path, max_rows=max_rows), None
+
+    header = parser_adapter.read_header(pdf_path)
+    if not header.get("account_number"):
+        return parser_adapter.parse(pdf_path, max_rows=max_rows), None
+    account_hash = hash_account(header["bank_code"], header["account_number"])
+    with session_scope() as session:
+        stored = load_statement_aggregate(session, tenant_id, account_hash)
+    previous = StatementAggregates.from_dict(stored) if stored else None
+
+    parse_out, merged = parser_adapter.parse_incremental(pdf_path, previous, max_rows=max_rows)
+    pending = {
+        "account_hash": account_hash,
+        "bank_code": header["bank_code"],
+        "data": merged.to_dict(),
+        "period_from": merged.period_from,
+        "period_to": merged.period_to,
+    }
+    return parse_out, pending
+
+
+@celery_app.task(name="app.workers.tasks.parse_statement")
+def parse_statement(job_id: str, started_at: Optional[float] = None) -> Optional[str]:
+    """Stage 1 (CPU queue): download and parse the bank statement."""
+    task_start = time.perf_counter()
+    with tracer.start_as_current_span(
+        "underwrite.parse_bank_statement", attributes={"job.id": job_id}
+    ) as span, timing.collect() as timings:
+        try:
+            with session_scope() as session:
+                job = get_job_by_id(session, job_id)
+                if job is None:
+                    span.set_status(Status(StatusCode.ERROR, "job_missing"))
+                    logger.warning("job_missing", job_id=job_id)
+                    return None
+
+                tenant_id = job.tenant_id
+                span.set_attribute("tenant.id", tenant_id)
+                payload_row = job.payload
+                if payload_row is None or payload_row.json_encrypted is None:
+                    span.set_status(Status(StatusCode.ERROR, "payload_missing"))
+                    logger.error("payload_missing", job_id=job_id)
+                    set_job_status(session, job_id, JobStatus.failed)
+                    metrics.jobs_failed_total.labels(tenant_id=tenant_id).inc()
+                    return None
+                set_job_status(session, job_id, JobStatus.processing)
+                payload_data: Dict[str, Any] = payload_row.json_encrypted
+                timing.add("queue_wait", timing.seconds_since(job.created_at))
+
+            # Try to process bank statement if provided, but continue without it if unavailable
+            parse_out: Dict[str, Any] = {}
+            aggregate: Optional[Dict[str, Any]] = None
+            bank_statement_url = payload_data.get("documents", {}).get("bank_statement_url")
+            if bank_statement_url and bank_statement_url != "null":
+                tmp_path: Path | None = None
+                try:
+                    with timing.stage("download"):
+                        tmp_path = storage.download_to_tmp(bank_statement_url)
+                    pdf.validate_pdf(tmp_path)
+                    with metrics.latency_timer(metrics.parser_seconds, tenant_id=tenant_id):
+                        parse_out, aggregate = _parse_statement(tenant_id, str(tmp_path))
+                    logger.info("bank_statement_processed", job_id=job_id)
+                except Exception as exc:
+                    span.record_exception(exc)
+                    logger.warning("bank_statement_unavailable", job_id=job_id, error=str(exc))
+                    parse_out = {}  # Empty - don't include in LLM input
+                    aggregate = None
+                finally:
+                    if tmp_path:
+                        storage.cleanup_tmp(tmp_path)
+            else:
+                logger.info("no_bank_statement_provided", job_id=job_id)
+
+            with session_scope() as session:
+                save_stage_output(session, job_id, STAGE_PARSE, parse_out)
+                save_stage_output(session, job_id, STAGE_PROCESSING, {"seconds": time.perf_counter() - task_start})
+                if aggregate is not None:
+                    save_statement_aggregate(session, tenant_id, **aggregate)
+                record_stage_timings(session, job_id, tenant_id, timings)
+        except Exception as exc:
+            _mark_failed(job_id, STAGE_PARSE, exc, task_start)
+            raise
+    return job_id
+
+
+def _prescore(
+    tenant_id: str,
+    rate_limit_cfg: Optional[Dict[str, Any]],
+    payload_data: Dict[str, Any],
+    parse_out: Dict[str, Any],
+    collateral_out: Dict[str, Any],
+) -> Optional[Dict[str, Any]]:
+    """Deterministic risk pre-score for the memo stage; None when the tenant's policy is off.
+
+    A scoring failure is logged and also gives None, so the job falls back to
+    the LLM alone.
+    """
+    policy = scoring.policy_for(rate_limit_cfg, get_settings().risk_prescore_mode)
+    if policy.mode == "off":
+        return None
+    try:
+        with timing.stage("score"):
+            return scoring.score_application(payload_data, parse_out, collateral_out, policy).to_dict()
+    except Exception as exc:
+        logger.warning("risk_prescore_failed", tenant_id=tenant_id, error=str(exc))
+        return None
+
+
+@celery_app.task(name="app.workers.tasks.enrich_features")
+def enrich_features(job_id: Optional[str], started_at: Optional[float] = None) -> Optional[str]:
+    """Stage 2 (I/O queue): collateral valuation and feature fusion."""
+    if job_id is None:
+        return None
+    task_start = time.perf_counter()
+    with tracer.start_as_current_span(
+        "underwrite.collateral_enrichment", attributes={"job.id": job_id}
+    ) as span, timing.collect() as timings:
+        try:
+            with session_scope() as session:
+                job = get_job_by_id(session, job_id)
+                if job is None:
+                    logger.warning("job_missing", job_id=job_id)
+                    return None
+                tenant_id = job.tenant_id
+                rate_limit_cfg = job.tenant.rate_limit_cfg
+                payload_data: Dict[str, Any] = job.payload.json_encrypted
+                parse_out = load_stage_output(session, job_id, STAGE_PARSE) or {}
+                processed = _processed_seconds(session, job_id)
             span.set_attribute("tenant.id", tenant_id)
-            update_job_status(session, job, JobStatus.processing)
-
-            payload_row = job.payload
-            if payload_row is None or payload_row.json_encrypted is None:
-                span.set_status(Status(StatusCode.ERROR, "payload_missing"))
-                logger.error("payload_missing", job_id=job.id)
-                update_job_status(session, job, JobStatus.failed)
-                metrics.jobs_failed_total.labels(tenant_id=tenant_id).inc()
-                return
-
-            payload_data: Dict[str, Any] = payload_row.json_encrypted
-            tmp_path: Path | None = None
-            try:
-                with metrics.latency_timer(underwrite_duration_seconds, tenant_id=tenant_id, stage="total"):
-                    # Try to process bank statement if provided, but continue without it if unavailable
-                    parse_out: Dict[str, Any] = {}
-                    bank_statement_url = payload_data.get("documents", {}).get("bank_statement_url")
-
-                    if bank_statement_url and bank_statement_url != "null":
-                        with tracer.start_as_current_span(
-                            "underwrite.parse_bank_statement",
-                            attributes={"job.id": job.id, "tenant.id": tenant_id},
-                        ):
-                            try:
-                                tmp_path = storage.download_to_tmp(bank_statement_url)
-                                pdf.validate_pdf(tmp_path)
-                                with metrics.latency_timer(metrics.parser_seconds, tenant_id=tenant_id):
-                                    parse_out = parser_adapter.parse(str(tmp_path))
-                                logger.info("bank_statement_processed", job_id=job.id)
-                            except Exception as exc:
-                                trace.get_current_span().record_exception(exc)
-                                logger.warning("bank_statement_unavailable", job_id=job.id, error=str(exc))
-                                parse_out = {}  # Empty - don't include in LLM input
-                    else:
-                        logger.info("no_bank_statement_provided", job_id=job.id)
-                        parse_out = {}  # Empty - don't include in LLM input
-
-                    with tracer.start_as_current_span(
-                        "underwrite.collateral_enrichment",
-                        attributes={"tenant.id": tenant_id, "job.id": job.id},
-                    ):
-                        with metrics.latency_timer(metrics.collateral_seconds, tenant_id=tenant_id):
-                            collateral_out = collateral.valuate_collateral(payload_data)
-
-                    with tracer.start_as_current_span(
-                        "underwrite.feature_fusion",
-                        attributes={"tenant.id": tenant_id, "job.id": job.id},
-                    ):
-                        features = fuse.fuse_features(payload_data, parse_out, collateral_out)
-                        persist_features(session, job, features)
-
-                    with tracer.start_as_current_span(
-                        "underwrite.generate_memo",
-                        attributes={"tenant.id": tenant_id, "job.id": job.id},
-                    ):
-                        with metrics.latency_timer(metrics.llm_seconds, tenant_id=tenant_id):
-                            memo_markdown, meta = llm.generate_memo(features)
-
-                    decision = meta.get("decision")
-                    interest = meta.get("interest_rate_suggestion")
-                    risk_score = meta.get("risk_score")
-                json_tail = {
-                    "parser": parse_out,
-                    "collateral": collateral_out,
-                    "llm_raw_response": meta.get("raw_response"),
-                }
-                persist_result(
-                    session,
-                    job,
-                    memo_markdown=memo_markdown,
-                    memo_pdf_url=None,
-                    risk_score=risk_score,
-                    decision=decision,
-                    interest_rate=interest,
-                    json_tail=json_tail,
-                )
 
-                update_job_status(session, job, JobStatus.succeeded)
-                audit = append_audit(
-                    session,
-                    job,
-                    actor="underwrite_worker",
-                    action="job_completed",
-                    hash_value=None,
+            with metrics.latency_timer(metrics.collateral_seconds, tenant_id=tenant_id):
+                collateral_out = collateral.valuate_collateral(payload_data)
+
+            with tracer.start_as_current_span(
+                "underwrite.feature_fusion",
+                attributes={"tenant.id": tenant_id, "job.id": job_id},
+            ):
+                with timing.stage("fuse"):
+                    features = fuse.fuse_features(
+                        payload_data, parse_out, collateral_out, _large_tx_threshold(rate_limit_cfg)
+                    )
+            assessment = _prescore(tenant_id, rate_limit_cfg, payload_data, parse_out, collateral_out)
+
+            with session_scope() as session:
+                persist_features(session, job_id, features)
+                save_stage_output(session, job_id, STAGE_ENRICH, collateral_out)
+                if assessment is not None:
+                    save_stage_output(session, job_id, STAGE_SCORE, assessment)
+                save_stage_output(
+                    session, job_id, STAGE_PROCESSING, {"seconds": processed + time.perf_counter() - task_start}
                 )
+                record_stage_timings(session, job_id, tenant_id, timings)
+        except Exception as exc:
+            _mark_failed(job_id, STAGE_ENRICH, exc, task_start)
+            raise
+    return job_id
 
-                webhook_payload = {
+
+@celery_app.task(name="app.workers.tasks.generate_memo")
+def generate_memo(job_id: Optional[str], started_at: Optional[float] = None) -> Optional[str]:
+    """Stage 3 (I/O queue): LLM memo, then the completion transaction."""
+    if job_id is None:
+        return None
+    task_start = time.perf_counter()
+    with tracer.start_as_current_span(
+        "underwrite.generate_memo", attributes={"job.id": job_id}
+    ) as span, timing.collect() as timings:
+        try:
+            with session_scope() as session:
+                job = get_job_by_id(session, job_id)
+                if job is None:
+                    logger.warning("job_missing", job_id=job_id)
+                    return None
+                ctx = JobContext.from_job(job)
+                features: Dict[str, Any] = job.features.json_encrypted if job.features else {}
+                parse_out = load_stage_output(session, job_id, STAGE_PARSE) or {}
+                collateral_out = load_stage_output(session, job_id, STAGE_ENRICH)
+                assessment = load_stage_output(session, job_id, STAGE_SCORE)
+                processed = _processed_seconds(session, job_id)
+                created_at = job.created_at
+            span.set_attribute("tenant.id", ctx.tenant_id)
+
+            prescore: Dict[str, Any] = assessment or {}
+            if prescore.get("auto"):
+                # clear approve / decline under the tenant's policy: no LLM call
+                memo_markdown, meta = scoring.render_memo(prescore), {}
+                outcome = f"auto_{prescore['decision'].lower()}"
+            else:
+                with metrics.latency_timer(metrics.llm_seconds, tenant_id=ctx.tenant_id):
+                    with timing.stage("llm"):
+                        memo_markdown, meta = llm.generate_memo(features)
+                outcome = "llm"
+            if assessment is not None:
+                metrics.risk_prescore_total.labels(tenant_id=ctx.tenant_id, outcome=outcome).inc()
+            span.set_attribute("risk_prescore.outcome", outcome)
+
+            # whatever the LLM returns explicitly wins over the pre-score
+            decision = meta.get("decision", prescore.get("decision"))
+            interest = meta.get("interest_rate_suggestion", prescore.get("interest_rate_suggestion"))
+            risk_score = meta.get("risk_score", prescore.get("risk_score"))
+            json_tail = {
+                "parser": parse_out,
+                "collateral": collateral_out,
+                "llm_raw_response": meta.get("raw_response"),
+                "risk_assessment": assessment,
+            }
+            audit_id = _uuid("audit")
+            webhook = None
+            if ctx.callback_url:
+                webhook_payload = build_webhook_payload(
+                    ctx,
+                    decision=decision,
+                    interest=interest,
+                    risk_score=risk_score,
+                    features=features,
+                    memo_markdown=memo_markdown,
+                    audit_id=audit_id,
+                )
+                webhook_payload["signature"] = sign_json(webhook_payload, ctx.webhook_secret)
+                # Delivery happens out of band: the outbox row commits with the result
+                # and the webhook dispatcher handles retries, back-off and dead-lettering.
+                webhook = {
+                    "tenant_id": ctx.tenant_id,
+                    "url": ctx.callback_url,
                     "event": "memo.generated",
-                    "job_id": job.id,
-                    "client_job_id": job.client_job_id,
-                    "decision": decision,
-                    "interest_rate_suggestion": interest,
-                    "risk_score": risk_score,
-                    "llm_input": features,
-                    "credit_memo_markdown": memo_markdown,
-                    "attachments": [
-                        {"type": "json", "name": "features.json", "url": "https://example.com/features"}
-                    ],
-                    "audit_ref": audit.id,
-                    "timestamp": dt.datetime.utcnow().isoformat() + "Z",
+                    "payload": webhook_payload,
                 }
-                webhook_payload["signature"] = sign_json(webhook_payload, job.tenant.webhook_secret)
-                try:
-                    webhooks.emit(job.callback_url, webhook_payload, job.tenant.webhook_secret)
-                    metrics.webhook_attempts_total.labels(tenant_id=tenant_id, status="success").inc()
-                except Exception as exc:  # pragma: no cover
-                    trace.get_current_span().record_exception(exc)
-                    metrics.webhook_attempts_total.labels(tenant_id=tenant_id, status="error").inc()
-                    metrics.webhook_failures_total.labels(tenant_id=tenant_id).inc()
-                    logger.warning("webhook_failed", job_id=job.id, error=str(exc))
-
-            except Exception as exc:  # pragma: no cover
-                span.record_exception(exc)
-                span.set_status(Status(StatusCode.ERROR, str(exc)))
-                logger.exception("underwrite_failed", job_id=job.id, error=str(exc))
-                update_job_status(session, job, JobStatus.failed)
-                metrics.jobs_failed_total.labels(tenant_id=job.tenant_id).inc()
-                raise
-            finally:
-                if tmp_path:
-                    storage.cleanup_tmp(tmp_path)
-
-
-def enqueue_underwrite_job(job_id: str) -> None:
-    celery_app.send_task("app.workers.tasks.underwrite", args=[job_id])
+
+            with session_scope() as session:
+                with timing.stage("persist"):
+                    complete_job(
+                        session,
+                        job_id,
+                        memo_markdown=memo_markdown,
+                        risk_score=risk_score,
+                        decision=decision,
+                        interest_rate=interest,
+                        json_tail=json_tail,
+                        audit_id=audit_id,
+                        webhook=webhook,
+                    )
+                record_stage_timings(session, job_id, ctx.tenant_id, timings)
+        except Exception as exc:
+            _mark_failed(job_id, STAGE_LLM, exc, task_start)
+            raise
+    _observe_durations(ctx.tenant_id, processed + time.perf_counter() - task_start, created_at)
+    return job_id
+
+
+def underwrite_chain(job_id: str):
+    # the stages still accept the ``started_at`` that chains built by earlier releases pass
+    return chain(parse_statement.s(job_id), enrich_features.s(), generate_memo.s())
+
+
+@celery_app.task(name="app.workers.tasks.underwrite")
+def underwrite(job_id: str) -> None:
+    """Compatibility entry point for messages queued before the pipeline was split."""
+    underwrite_chain(job_id).apply_async()
+
+
+def enqueue_underwrite_job(
+    job_id: str,
+    *,
+    tenant_id: Optional[str] = None,
+    lane: PriorityLane | str = PriorityLane.interactive,
+) -> None:
+    """Queue a job for processing.
+
+    With fair scheduling on, the job waits in its tenant's lane until the fair
+    scheduler admits it; otherwise the chain is published straight to Celery.
+    """
+    queue = get_fair_queue() if tenant_id else None
+    if queue is None:
+        underwrite_chain(job_id).apply_async()
+        return
+    queue.push(job_id, tenant_id, lane)
+
+
+def enqueue_underwrite_jobs(
+    job_ids: Sequence[str],
+    *,
+    tenant_id: str,
+    lane: PriorityLane | str = PriorityLane.bulk,
+) -> None:
+    """Queue many jobs with a single Redis pipeline (or one broker connection)."""
+    if not job_ids:
+        return
+    queue = get_fair_queue()
+    if queue is not None:
+        queue.push_many((job_id, tenant_id, lane) for job_id in job_ids)
+        return
+    with celery_app.producer_or_acquire() as producer:
+        for job_id in job_ids:
+            underwrite_chain(job_id).apply_async(producer=producer)
@@ -0,0 +1,240 @@
+"""Async dispatcher draining the webhook outbox.
+
+Run with ``python -m app.workers.webhook_dispatcher``. Deliveries are leased from
+``webhook_outbox`` in short transactions, posted concurrently with httpx, and
+rescheduled with jittered exponential back-off. Each outcome is written as soon
+as its request finishes; rows that cannot start before their lease runs short
+are handed back unsent, so another dispatcher never re-claims a row in flight. Each callback host has its own
+concurrency limit and circuit breaker so one failing bank cannot starve the rest.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import datetime as dt
+import signal
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import httpx
+import structlog
+from opentelemetry.metrics import Observation
+
+from .. import metrics
+from ..config import Settings, get_settings
+from ..db import (
+    claim_due_webhooks,
+    mark_webhook_delivered,
+    mark_webhook_failed,
+    pending_webhook_count,
+    session_scope,
+)
+from ..logging import configure_logging
+from ..observability import init_observability
+from ..utils.webhooks import CircuitBreaker, build_request, compute_backoff
+
+logger = structlog.get_logger("workers.webhook_dispatcher")
+
+
+@dataclass
+class _Claimed:
+    id: str
+    tenant_id: str
+    url: str
+    payload: Dict[str, Any]
+    secret: str
+    attempts: int
+
+
+@dataclass
+class _Outcome:
+    delivery: _Claimed
+    ok: bool
+    error: Optional[str] = None
+    # Circuit-open skips are rescheduled without consuming an attempt.
+    skipped_until: Optional[float] = None
+
+
+class WebhookDispatcher:
+    def __init__(self, settings: Optional[Settings] = None, client: Optional[httpx.AsyncClient] = None) -> None:
+        self.settings = settings or get_settings()
+        self._client = client
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._stopping = False
+
+    def stop(self) -> None:
+        self._stopping = True
+
+    def _host(self, url: str) -> str:
+        return urlsplit(url).netloc.lower()
+
+    def _semaphore(self, host: str) -> asyncio.Semaphore:
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.settings.webhook_per_host_concurrency)
+        return self._host_limits[host]
+
+    def _breaker(self, host: str) -> CircuitBreaker:
+        if host not in self._breakers:
+            self._breakers[host] = CircuitBreaker(
+                self.settings.webhook_circuit_failure_threshold,
+                self.settings.webhook_circuit_reset_seconds,
+            )
+        return self._breakers[host]
+
+    def _claim(self) -> List[_Claimed]:
+        with session_scope() as session:
+            rows = claim_due_webhooks(
+                session,
+                limit=self.settings.webhook_dispatch_batch_size,
+                lease_seconds=self.settings.webhook_claim_lease_seconds,
+            )
+            return [
+                _Claimed(
+                    id=row.id,
+                    tenant_id=row.tenant_id,
+                    url=row.url,
+                    payload=row.payload or {},
+                    secret=row.tenant.webhook_secret,
+                    attempts=row.attempts,
+                )
+                for row in rows
+            ]
+
+    def _start_window(self) -> float:
+        """Seconds after the claim in which a delivery may still start and finish within its lease."""
+        # httpx applies the timeout to connect, write, read and pool acquisition separately
+        worst_request = 4 * self.settings.webhook_timeout_seconds
+        return max(self.settings.webhook_claim_lease_seconds - worst_request, 0.0)
+
+    async def _deliver(
+        self, client: httpx.AsyncClient, delivery: _Claimed, deadline: Optional[float] = None
+    ) -> _Outcome:
+        host = self._host(delivery.url)
+        breaker = self._breaker(host)
+        async with self._semaphore(host):
+            if deadline is not None and time.monotonic() > deadline:
+                # waited too long behind a slow host: release the row without using an attempt
+                return _Outcome(delivery, ok=False, error="lease_expiring", skipped_until=0.0)
+            # checked only once a slot is free: the deliveries queued ahead of this one
+            # may have opened the breaker while it waited
+            if not breaker.allow():
+                return _Outcome(delivery, ok=False, error="circuit_open", skipped_until=breaker.seconds_until_retry())
+            body, headers = build_request(
+                delivery.payload, delivery.secret, self.settings.webhook_gzip_threshold_bytes
+            )
+            start = time.perf_counter()
+            try:
+                response = await client.post(delivery.url, content=body, headers=headers)
+                response.raise_for_status()
+            except httpx.HTTPError as exc:
+                breaker.record_failure()
+                return _Outcome(delivery, ok=False, error=f"{type(exc).__name__}: {exc}")
+            finally:
+                metrics.webhook_delivery_seconds.labels(tenant_id=delivery.tenant_id).observe(
+                    time.perf_counter() - start
+                )
+        breaker.record_success()
+        return _Outcome(delivery, ok=True)
+
+    def _record(self, outcomes: List[_Outcome]) -> None:
+        now = dt.datetime.now(dt.timezone.utc)
+        with session_scope() as session:
+            for outcome in outcomes:
+                delivery = outcome.delivery
+                if outcome.ok:
+                    mark_webhook_delivered(session, delivery.id)
+                    metrics.webhook_attempts_total.labels(tenant_id=delivery.tenant_id, status="success").inc()
+                    continue
+
+                if outcome.skipped_until is not None:
+                    mark_webhook_failed(
+                        session,
+                        delivery.id,
+                        error=outcome.error or "circuit_open",
+                        retry_at=now + dt.timedelta(seconds=max(outcome.skipped_until, 1.0)),
+                        count_attempt=False,
+                    )
+                    continue
+
+                metrics.webhook_attempts_total.labels(tenant_id=delivery.tenant_id, status="error").inc()
+                metrics.webhook_failures_total.labels(tenant_id=delivery.tenant_id).inc()
+                attempt = delivery.attempts + 1
+                retry_at: Optional[dt.datetime] = None
+                if attempt < self.settings.webhook_max_attempts:
+                    delay = compute_backoff(
+                        attempt,
+                        base_seconds=self.settings.webhook_backoff_base_seconds,
+                        max_seconds=self.settings.webhook_backoff_max_seconds,
+                    )
+                    retry_at = now + dt.timedelta(seconds=delay)
+                else:
+                    metrics.webhook_dead_letter_total.labels(tenant_id=delivery.tenant_id).inc()
+                    logger.warning("webhook_dead_lettered", delivery_id=delivery.id, error=outcome.error)
+                mark_webhook_failed(session, delivery.id, error=outcome.error or "unknown", retry_at=retry_at)
+
+    async def run_once(self, client: httpx.AsyncClient) -> int:
+        claimed = await asyncio.to_thread(self._claim)
+        if not claimed:
+            return 0
+        deadline = time.monotonic() + self._start_window()
+        tasks = [asyncio.ensure_future(self._deliver(client, item, deadline)) for item in claimed]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                outcome = await finished
+                await asyncio.to_thread(self._record, [outcome])
+        finally:
+            for task in tasks:
+                task.cancel()
+        return len(claimed)
+
+    async def run_forever(self) -> None:
+        timeout = httpx.Timeout(self.settings.webhook_timeout_seconds)
+        client = self._client or httpx.AsyncClient(timeout=timeout)
+        try:
+            while not self._stopping:
+                try:
+                    processed = await self.run_once(client)
+                except Exception as exc:  # pragma: no cover - resilience
+                    logger.exception("webhook_dispatch_error", error=str(exc))
+                    processed = 0
+                if processed == 0:
+                    await asyncio.sleep(self.settings.webhook_dispatch_poll_seconds)
+        finally:
+            if self._client is None:
+                await client.aclose()
+
+
+def _register_outbox_depth_metric() -> None:
+    def _callback() -> list[Observation]:
+        try:
+            with session_scope() as session:
+                depth = pending_webhook_count(session)
+        except Exception as exc:  # pragma: no cover - database connectivity
+            logger.warning("outbox_metric_sample_failed", error=str(exc))
+            return []
+        return [Observation(depth, {"queue": "webhook_outbox"})]
+
+    metrics.register_queue_depth_callback(_callback)
+
+
+def main() -> None:
+    configure_logging()
+    init_observability("webhook-dispatcher")
+    _register_outbox_depth_metric()
+    dispatcher = WebhookDispatcher()
+
+    loop = asyncio.new_event_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, dispatcher.stop)
+    logger.info("webhook_dispatcher_started")
+    try:
+        loop.run_until_complete(dispatcher.run_forever())
+    finally:
+        loop.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+"""Benchmark for ``AnalyzeDescription.analyze_customer_data`` on a synthetic statement.
+
+Descriptions are assembled from seeded random words (salary, transfer, POS,
+QPay and loan phrasing plus counterparty names and reference numbers), so the
+vocabulary grows with the statement the way real ones do:
+
+    python scripts/bench_descriptions.py --rows 2000 20000 100000
+
+``--reference-rows N`` also times the per-word re-scan the function used
+before the postings index (every distinct word re-tokenises every row) on the
+first N rows and checks that both give the same per-word sums. It is quadratic,
+so keep N small. The script exits 1 on a mismatch.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import random
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Tuple
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+
+import pandas as pd  # noqa: E402
+
+from app.pipeline.bank_parser.AnalyzeDescription import (  # noqa: E402
+    analyze_customer_data,
+    contains_word,
+    tokenize,
+)
+
+_PHRASES = (
+    "цалин 2024 оны",
+    "данс хооронд шилжүүлэг",
+    "карт зарлага pos терминал",
+    "qpay худалдан авалт",
+    "интернэт банк гүйлгээ",
+    "зээлийн төлөлт",
+    "түрээсийн төлбөр",
+    "e-mongolia хураамж",
+    "хадгаламжаас",
+    "бэлэн мөнгө атм",
+)
+_NAMES = ("батэрдэнэ", "наранцэцэг", "ганбаатар", "оюунчимэг", "тэмүүжин", "анхбаяр", "болд", "сарнай")
+
+
+def synthetic_statement(rows: int, seed: int) -> pd.DataFrame:
+    rng = random.Random(seed)
+    references = [str(rng.randint(10**5, 10**7)) for _ in range(max(rows // 20, 1))]
+    descriptions, credit, debit = [], [], []
+    for _ in range(rows):
+        words = [rng.choice(_PHRASES), rng.choice(_NAMES)]
+        if rng.random() < 0.6:
+            words.append(rng.choice(references))
+        descriptions.append(" ".join(words))
+        amount = float(rng.randint(1, 2000) * 500)
+        incoming = rng.random() < 0.4
+        credit.append(amount if incoming else 0.0)
+        debit.append(0.0 if incoming else amount)
+    return pd.DataFrame(
+        {
+            "customer_id": 1,
+            "description": descriptions,
+            "credit_transaction": credit,
+            "debit_transaction": debit,
+        }
+    )
+
+
+def reference_sums(data: pd.DataFrame) -> Dict[str, Tuple[float, float]]:
+    """Per-word (credit, debit) sums the way analyze_customer_data computed them before."""
+    descriptions = data["description"].dropna()
+    counts = Counter(word for description in descriptions for word in tokenize(description))
+    sums = {}
+    for word, _freq in counts.most_common():
+        relevant = data[data["description"].apply(lambda x: pd.notna(x) and contains_word(x, word))]
+        sums[word] = (relevant["credit_transaction"].sum(), relevant["debit_transaction"].sum())
+    return sums
+
+
+def reported_sums(report: pd.DataFrame) -> Dict[str, Tuple[float, float]]:
+    # the word itself is the upper-cased <span> text in the formatted column
+    words = report["Давтагдсан Үгнүүд"].str.extract(r"<span class='main-word'>(.*?)</span>")[0]
+    return {
+        word.lower(): (credit, debit)
+        for word, credit, debit in zip(words, report["Орлого"], report["Зарлага"])
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[2000, 20000, 100000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--reference-rows", type=int, default=0, metavar="N")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    print(f"{'rows':>8} {'words':>7} {'best s':>8} {'rows/s':>10}")
+    for rows in args.rows:
+        data = synthetic_statement(rows, args.seed)
+        timings = []
+        for _ in range(args.repeat):
+            started = time.perf_counter()
+            report = analyze_customer_data(1, data)
+            timings.append(time.perf_counter() - started)
+        words = len({word for description in data["description"] for word in tokenize(description)})
+        best = min(timings)
+        print(f"{rows:>8} {words:>7} {best:>8.3f} {rows / best:>10.0f}")
+
+    if args.reference_rows:
+        data = synthetic_statement(args.reference_rows, args.seed)
+        started = time.perf_counter()
+        report = analyze_customer_data(1, data)
+        indexed = time.perf_counter() - started
+        started = time.perf_counter()
+        expected = reference_sums(data)
+        rescan = time.perf_counter() - started
+        print(
+            f"\nreference on {args.reference_rows} rows: per-word re-scan {rescan:.2f}s, "
+            f"postings index {indexed:.3f}s ({rescan / indexed:.0f}x)"
+        )
+        mismatched = [word for word, sums in reported_sums(report).items() if expected.get(word) != sums]
+        if mismatched:
+            print(f"MISMATCH for {len(mismatched)} words, e.g. {mismatched[:5]}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
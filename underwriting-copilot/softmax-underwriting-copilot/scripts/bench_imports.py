@@ -0,0 +1,129 @@
+#!/usr/bin/env python
+"""Cold-import benchmark for the API and worker entry points.
+
+Each module is imported in a fresh interpreter under ``python -X importtime``;
+the script reports the median cumulative import time over ``--repeat`` runs,
+the process peak RSS right after the import, and the heaviest imports below
+it, so a dependency that creeps back onto the startup path shows up by name:
+
+    python scripts/bench_imports.py --save-baseline imports_baseline.json
+    python scripts/bench_imports.py --baseline imports_baseline.json
+
+Modules in ``--forbid`` must not be loaded by importing any target (PDF
+libraries are imported on the first statement, charting only by the reports).
+The script exits 1 when one is, and with ``--baseline`` also when a target's
+import time or RSS grows by more than ``--tolerance``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+
+TARGETS = ("app.workers.tasks", "app.main", "app.pipeline.parser_adapter")
+FORBIDDEN = ("fitz", "pymupdf", "pdfplumber", "pdfminer", "pandas", "plotly", "matplotlib", "sklearn")
+
+# __import__, not importlib.import_module: the latter bypasses -X importtime
+_PROBE = (
+    "import json, resource, sys\n"
+    "__import__(sys.argv[1])\n"
+    "print(json.dumps({'rss_kb': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,"
+    " 'modules': sorted(sys.modules)}))\n"
+)
+
+
+def _run(module: str) -> Tuple[List[Tuple[str, float]], Dict[str, Any]]:
+    """One cold import: the modules it pulled in with their cumulative ms, plus the probe's report."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE, module],
+        cwd=BASE_DIR,
+        env={**os.environ, "PYTHONDONTWRITEBYTECODE": "1"},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    # lines come in post-order, indented by depth: a module's imports are the
+    # deeper lines directly above it
+    lines: List[Tuple[int, str, float]] = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _self, total, name = line[len("import time:") :].split("|", 2)
+        if total.strip().isdigit():
+            depth = (len(name) - len(name.lstrip())) // 2
+            lines.append((depth, name.strip(), int(total) / 1000))
+    below: List[Tuple[str, float]] = []
+    for index, (depth, name, ms) in enumerate(lines):
+        if name == module:
+            below.append((name, ms))
+            for inner_depth, inner_name, inner_ms in reversed(lines[:index]):
+                if inner_depth <= depth:
+                    break
+                below.append((inner_name, inner_ms))
+            break
+    return below, json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def measure(module: str, repeat: int, top: int) -> Dict[str, Any]:
+    runs = [_run(module) for _ in range(repeat)]
+    times = [below[0][1] if below else 0.0 for below, _ in runs]
+    below, report = runs[-1]
+    return {
+        "import_ms": statistics.median(times),
+        "rss_mb": max(r["rss_kb"] for _, r in runs) / 1024,
+        "heaviest": sorted(below[1:], key=lambda item: -item[1])[:top],
+        "modules": report["modules"],
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modules", nargs="+", default=list(TARGETS))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8, help="Heaviest imports listed per target")
+    parser.add_argument("--forbid", nargs="*", default=list(FORBIDDEN))
+    parser.add_argument("--save-baseline", type=Path)
+    parser.add_argument("--baseline", type=Path, help="Compare against a saved result; exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.20, help="Allowed growth before failing")
+    args = parser.parse_args()
+
+    results: Dict[str, Dict[str, Any]] = {}
+    failures: List[str] = []
+    for module in args.modules:
+        result = measure(module, args.repeat, args.top)
+        results[module] = result
+        print(f"{module}: {result['import_ms']:.0f} ms, peak RSS {result['rss_mb']:.0f} MB")
+        for name, ms in result["heaviest"]:
+            print(f"    {ms:8.1f} ms  {name}")
+        loaded = [name for name in args.forbid if name in result["modules"]]
+        if loaded:
+            failures.append(f"{module} loads {', '.join(loaded)}")
+
+    summary = {module: {k: r[k] for k in ("import_ms", "rss_mb")} for module, r in results.items()}
+    if args.save_baseline:
+        args.save_baseline.write_text(json.dumps(summary, indent=2))
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text())
+        for module, current in summary.items():
+            previous = baseline.get(module)
+            if not previous:
+                continue
+            for metric in ("import_ms", "rss_mb"):
+                if current[metric] > previous[metric] * (1 + args.tolerance):
+                    failures.append(f"{module} {metric} {previous[metric]:.0f} -> {current[metric]:.0f}")
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,587 @@
+#!/usr/bin/env python
+"""Per-bank statement parser micro-benchmark on synthetic PDFs.
+
+Every parser registered in ``registry.BANK_DETECTORS`` has a synthetic layout
+below that mimics the geometry of the real statement (page size, header lines,
+ruling and column positions) closely enough for its checker and table
+extraction to accept it. The statements are generated with PyMuPDF from random
+but seeded transactions, so no customer data is needed and runs are repeatable.
+
+For each parser and page count the script reports pages/s, rows/s, the child
+process peak RSS and the time split across detect, header extraction, guide
+drawing and table extraction (the ``parser.*`` sub-stages in ``DataHandler``).
+Each case runs in a fresh process so RSS is per parser, not cumulative:
+
+    python scripts/bench_parsers.py --pages 5 25 --save-baseline parsers_baseline.json
+    python scripts/bench_parsers.py --pages 5 25 --baseline parsers_baseline.json
+
+``--stream`` runs the statements through ``parser_adapter.parse(...,
+keep_rows=False)`` instead, i.e. page-at-a-time with rows aggregated and
+dropped, and prints how peak RSS grows with the page count. Together with
+``--max-rss-mb`` it is the memory check for the streaming parser:
+
+    python scripts/bench_parsers.py --stream --pages 10 100 400 --repeat 1 --max-rss-mb 250
+
+The script exits 1 when a parser does not extract exactly the generated rows,
+with ``--baseline`` also when a parser's pages/s drops by more than
+``--tolerance``, and with ``--max-rss-mb`` when a case's peak RSS exceeds it.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from multiprocessing import get_context
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+
+import fitz  # PyMuPDF  # noqa: E402
+
+# Phases reported per parser; "detect" comes from the registry, the rest from DataHandler.
+PHASES = ("detect", "parser.header", "parser.guides", "parser.tables")
+
+# Fonts with Mongolian Cyrillic (Ө, Ү). PyMuPDF's bundled CJK font is the fallback;
+# it lacks those two letters, so header fields that contain them will not match.
+_FONT_CANDIDATES = (
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/dejavu/DejaVuSans.ttf",
+    "/usr/share/fonts/TTF/DejaVuSans.ttf",
+    "/Library/Fonts/Arial Unicode.ttf",
+    "C:/Windows/Fonts/arial.ttf",
+)
+
+_DESCRIPTIONS = (
+    "ЦАЛИН 2024 ОНЫ",
+    "ДАНС ХООРОНД ШИЛЖҮҮЛЭГ",
+    "КАРТ ЗАРЛАГА POS ТЕРМИНАЛ",
+    "QPAY ХУДАЛДАН АВАЛТ",
+    "ИНТЕРНЭТ БАНК ГҮЙЛГЭЭ",
+    "ЗЭЭЛИЙН ТӨЛӨЛТ",
+    "ТҮРЭЭСИЙН ТӨЛБӨР",
+    "E-MONGOLIA ХУРААМЖ",
+    "ХАДГАЛАМЖААС",
+    "БЭЛЭН МӨНГӨ АТМ",
+)
+_NAMES = ("БАТ-ЭРДЭНЭ ДОРЖ", "НАРАНЦЭЦЭГ СЭРЖ", "ГАНБААТАР ТЭМҮҮЖИН", "ОЮУНЧИМЭГ АНХБАЯР")
+
+
+def _load_font(path: Optional[str]) -> fitz.Font:
+    for candidate in ([path] if path else list(_FONT_CANDIDATES)):
+        if candidate and Path(candidate).exists():
+            return fitz.Font(fontfile=candidate)
+    return fitz.Font("cjk")
+
+
+# ---------------------------------------------------------------------------
+# Synthetic statements
+
+
+class _Transactions:
+    """Seeded stream of (timestamp, amount, balance, description, account)."""
+
+    def __init__(self, seed: int) -> None:
+        self.rng = random.Random(seed)
+        self.moment = datetime(2024, 1, 2, 8, 0)
+        self.balance = self.rng.uniform(50_000, 5_000_000)
+
+    def __iter__(self) -> Iterator[Tuple[datetime, float, float, str, str]]:
+        return self
+
+    def __next__(self) -> Tuple[datetime, float, float, str, str]:
+        self.moment += timedelta(minutes=self.rng.randint(7, 600))
+        if self.rng.random() < 0.3:
+            amount = round(self.rng.uniform(100_000, 1_500_000), 2)
+        else:
+            amount = -round(self.rng.uniform(500, max(min(self.balance * 0.3, 600_000), 1_000)), 2)
+        self.balance = round(self.balance + amount, 2)
+        description = f"{self.rng.choice(_DESCRIPTIONS)} {self.rng.randint(100000, 999999)}"
+        account = str(self.rng.randint(10**9, 10**10 - 1))
+        return self.moment, amount, self.balance, description, account
+
+
+def _money(value: float) -> str:
+    return f"{value:,.2f}"
+
+
+class _Page:
+    """Thin drawing helper: one TextWriter per page, text anchored at its top edge."""
+
+    def __init__(self, doc: fitz.Document, font: fitz.Font, width: float, height: float) -> None:
+        self.page = doc.new_page(width=width, height=height)
+        self.font = font
+        self.writer = fitz.TextWriter(self.page.rect)
+        self.width = width
+        self.height = height
+
+    def text(self, x: float, top: float, value: str, size: float, right: Optional[float] = None) -> None:
+        if right is not None:
+            x = right - self.font.text_length(value, fontsize=size)
+        self.writer.append((x, top + size), value, font=self.font, fontsize=size)
+
+    def hline(self, x0: float, x1: float, y: float, width: float = 0.5) -> None:
+        self.page.draw_line((x0, y), (x1, y), color=(0, 0, 0), width=width)
+
+    def vline(self, x: float, y0: float, y1: float, width: float = 0.5) -> None:
+        self.page.draw_line((x, y0), (x, y1), color=(0, 0, 0), width=width)
+
+    def rect(self, x0: float, y0: float, x1: float, y1: float, width: float = 0.5) -> None:
+        self.page.draw_rect(fitz.Rect(x0, y0, x1, y1), color=(0, 0, 0), width=width)
+
+    def finish(self) -> None:
+        self.writer.write_text(self.page)
+
+
+def _khan(doc: fitz.Document, font: fitz.Font, pages: int, tx: _Transactions, name: str, account: str) -> int:
+    """Khan "Printed" statement: 820x1200, one bordered band per row, 9 columns."""
+    columns = (15, 71, 119, 183, 313, 403, 493, 603, 723)
+    rows = 0
+    for index in range(pages):
+        page = _Page(doc, font, 820, 1200)
+        top = 135
+        if index == 0:
+            page.text(630, 14, "Printed Date: 2024/06/30 13:53:05", 9)
+            page.text(15, 78, f"Хэрэглэгч: {name}        Интервал: 2024/01/01 - 2024/06/30", 10)
+            page.text(15, 106, f"Дансны дугаар: {account}", 10)
+        else:
+            top = 39
+        page.rect(10, top, 810, top + 28)
+        for x, label in zip(columns, ("Огноо", "Цаг", "Салбар", "Эхний", "Дебит", "Кредит", "Эцсийн", "Утга", "Данс")):
+            page.text(x, top + 9, label, 9)
+        y = top + 28
+        while y + 25 <= 1160:
+            moment, amount, balance, description, counterparty = next(tx)
+            page.rect(10, y, 810, y + 25)
+            cells = (
+                moment.strftime("%Y/%m/%d"),
+                moment.strftime("%H:%M"),
+                "5000",
+                _money(balance - amount),
+                _money(amount if amount < 0 else 0),
+                _money(amount if amount > 0 else 0),
+                _money(balance),
+                description[:16],
+                counterparty,
+            )
+            for x, value in zip(columns, cells):
+                page.text(x, y + 8, value, 8)
+            y += 25
+            rows += 1
+        page.finish()
+    return rows
+
+
+def _khan_kiosk(doc: fitz.Document, font: fitz.Font, pages: int, tx: _Transactions, name: str, account: str) -> int:
+    """Khan kiosk statement: A4, unruled rows of ~6pt text (the parser draws the columns)."""
+    rows = 0
+    for index in range(pages):
+        page = _Page(doc, font, 595, 842)
+        y = 30
+        if index == 0:
+            page.text(31, 20, f"Харилцагчийн нэр: {name}", 7)
+            page.text(31, 40, f"Дансны дугаар: {account}", 7)
+            page.text(31, 60, "Эхлэх огноо: 2024-01-01 Дуусах огноо: 2024-06-30", 7)
+            y = 140
+        while y + 9 <= 800:
+            moment, amount, balance, description, counterparty = next(tx)
+            size = 5.2
+            page.text(31, y, str(rows + 1), size)
+            page.text(46, y, moment.strftime("%m/%d/%Y"), size)
+            page.text(86, y, "5008", size)
+            page.text(112, y, str(44705428 + rows), size)
+            page.text(162, y, counterparty, size)
+            page.text(207, y, moment.strftime("%H:%M"), size)  # DejaVu digits are wider than the bank font
+            page.text(239, y, description[:34], size)
+            if amount > 0:
+                page.text(0, y, _money(amount), size, right=418)
+                page.text(0, y, "0.00", size, right=478)
+            else:
+                page.text(0, y, "0.00", size, right=418)
+                page.text(0, y, _money(amount), size, right=478)
+            page.text(0, y, _money(balance), size, right=528)
+            page.text(533, y, moment.strftime("%m/%d/%Y"), size)
+            y += 9
+            rows += 1
+        page.finish()
+    return rows
+
+
+def _golomt(doc: fitz.Document, font: fitz.Font, pages: int, tx: _Transactions, name: str, account: str) -> int:
+    """Golomt statement: A4, a date line followed by that day's ORLOGO/ZARLAGA rows."""
+    rows = 0
+    current_day = None
+    for index in range(pages):
+        page = _Page(doc, font, 595, 842)
+        y = 40
+        if index == 0:
+            page.text(69, 26, "ГОЛОМТ БАНК", 12)
+            page.text(30, 80, f"Данс: {account}[MNT]", 9)
+            page.text(30, 100, f"Харилцагчийн нэр: {name}(R0000000)", 9)
+            page.text(30, 120, "Хамрах хугацаа: 2024.01.01 - 2024.06.30", 9)
+            y = 210
+        current_day = None
+        while y + 13 <= 820:
+            moment, amount, balance, description, counterparty = next(tx)
+            if moment.date() != current_day:
+                current_day = moment.date()
+                page.text(30, y, moment.strftime("%Y.%m.%d"), 8)
+                y += 13
+                if y + 13 > 820:
+                    break
+            page.text(0, y, _money(abs(amount)), 8, right=235)
+            page.text(259, y, "ОРЛОГО" if amount > 0 else "ЗАРЛАГА", 8)
+            # Card narrations run past the right guide, as in the real statements.
+            page.text(311, y, f"420733******{counterparty[-4:]}:{moment:%d-%m-%Y %H:%M:%S}:{description}"[:62], 8)
+            y += 13
+            rows += 1
+        page.finish()
+    return rows
+
+
+def _state(doc: fitz.Document, font: fitz.Font, pages: int, tx: _Transactions, name: str, account: str) -> int:
+    """State Bank statement: A4 landscape, fully ruled 12-column grid with a header row per page."""
+    edges = (33, 88, 120, 175, 288, 400, 462, 525, 587, 649, 711, 774, 812)
+    labels = ("Огноо", "Цаг", "Журнал", "Байршил", "Утга", "Орлого", "Зарлага", "Үлдэгдэл",
+              "Харьцсан данс", "Дансны нэр", "Банк", "Ханш")
+    rows = 0
+    for index in range(pages):
+        page = _Page(doc, font, 842, 595)
+        top = 30
+        if index == 0:
+            page.text(36, 20, "Хэвлэсэн огноо: 2024.06.30 18:09:29", 8)
+            page.text(36, 60, f"Харилцагч: {name}", 8)
+            page.text(36, 80, f"Дансны дугаар: {account}", 8)
+            page.text(36, 100, "Хамрах хугацаа: 2024.01.01 - 2024.06.30", 8)
+            top = 185
+        lines = [top, top + 20]
+        for x, label in zip(edges, labels):
+            page.text(x + 3, top + 6, label, 6)
+        y = top + 20
+        while y + 18 <= 570:
+            moment, amount, balance, description, counterparty = next(tx)
+            cells = (
+                moment.strftime("%Y.%m.%d"),
+                moment.strftime("%H:%M"),
+                str(rows + 1000),
+                "ОНЛАЙН",
+                description[:22],
+                _money(amount) if amount > 0 else "0.00",
+                _money(-amount) if amount < 0 else "0.00",
+                _money(balance),
+                counterparty,
+                "НЭР",
+                "ХААН",
+                "1",
+            )
+            for x, value in zip(edges, cells):
+                page.text(x + 3, y + 5, value, 6.5)
+            y += 18
+            lines.append(y)
+            rows += 1
+        for line_y in lines:
+            page.hline(edges[0], edges[-1], line_y)
+        for x in edges:
+            page.vline(x, lines[0], lines[-1])
+        page.finish()
+    return rows
+
+
+def _tdb(doc: fitz.Document, font: fitz.Font, pages: int, tx: _Transactions, name: str, account: str) -> int:
+    """TDB statement: A4, horizontally ruled rows; the parser adds the column guides."""
+    columns = (14, 41, 82, 132, 252, 292, 320, 357, 422, 487)
+    rows = 0
+    for index in range(pages):
+        page = _Page(doc, font, 595, 842)
+        y = 40
+        if index == 0:
+            page.text(20, 20, "Хэвлэсэн огноо: 2024/06/30 18:09:29", 8)
+            page.text(20, 60, f"Харилцагч: {name}", 8)
+            page.text(20, 80, f"Дансны дугаар: {account}", 8)
+            page.text(20, 100, "Хамрах хугацаа: 2024.01.01 - 2024.06.30", 8)
+            y = 170
+        page.hline(13, 585, y)
+        while y + 16 <= 780:
+            moment, amount, balance, description, counterparty = next(tx)
+            cells = (
+                moment.strftime("%Y.%m.%d"),
+                moment.strftime("%I:%M:%S%p"),
+                "ТӨВ",
+                _money(amount) if amount > 0 else "0.00",
+                _money(-amount) if amount < 0 else "0.00",
+                "MNT",
+                counterparty,
+                "1",
+                _money(balance),
+                description[:18],
+            )
+            for x, value in zip(columns, cells):
+                page.text(x, y + 5, value, 4)
+            y += 16
+            page.hline(13, 585, y)
+            rows += 1
+        page.vline(13, 170 if index == 0 else 40, y)
+        page.vline(585, 170 if index == 0 else 40, y)
+        page.finish()
+    return rows
+
+
+def _khas(doc: fitz.Document, font: fitz.Font, pages: int, tx: _Transactions, name: str, account: str) -> int:
+    """Khas Bank statement: US letter, fully ruled 7-column grid."""
+    edges = (30, 83, 187, 287, 387, 457, 527, 590)
+    rows = 0
+    for index in range(pages):
+        page = _Page(doc, font, 612, 792)
+        top = 30
+        if index == 0:
+            page.text(250, 20, "ДАНСНЫ ХУУЛГА", 11)
+            page.text(34, 60, f"Үндсэн эзэмшигч: {name}", 8)
+            page.text(34, 80, f"Дансны дугаар : {account}", 8)
+            page.text(34, 94, "Эхлэх өдөр : 2024-01-01", 8)
+            page.text(34, 106, "Дуусах огноо : 2024-06-30", 8)
+            top = 120
+        lines = [top, top + 20]
+        for x, label in zip(edges, ("Огноо", "Утга", "Харьцсан данс", "Дугаар", "Орлого", "Зарлага", "Үлдэгдэл")):
+            page.text(x + 3, top + 6, label, 6)
+        y = top + 20
+        while y + 18 <= 760:
+            moment, amount, balance, description, counterparty = next(tx)
+            cells = (
+                moment.strftime("%Y-%m-%d"),
+                description[:20],
+                counterparty,
+                str(900000 + rows),
+                _money(amount) if amount > 0 else "-",
+                _money(-amount) if amount < 0 else "-",
+                _money(balance),
+            )
+            for x, value in zip(edges, cells):
+                page.text(x + 3, y + 5, value, 6.5)
+            y += 18
+            lines.append(y)
+            rows += 1
+        for line_y in lines:
+            page.hline(edges[0], edges[-1], line_y)
+        for x in edges:
+            page.vline(x, lines[0], lines[-1])
+        page.finish()
+    return rows
+
+
+Generator = Callable[[fitz.Document, fitz.Font, int, _Transactions, str, str], int]
+
+# Registered parser function -> synthetic layout it accepts.
+LAYOUTS: Dict[str, Generator] = {
+    "getKhanData": _khan,
+    "getKhanKioskData": _khan_kiosk,
+    "getGolomtData": _golomt,
+    "getStateData": _state,
+    "getTDBData": _tdb,
+    "getKhasData": _khas,
+}
+
+
+def generate(parser_name: str, pages: int, path: Path, seed: int, font: fitz.Font) -> int:
+    """Write a synthetic statement for ``parser_name``; returns the number of transactions."""
+    rng = random.Random(f"{parser_name}:{seed}")
+    tx = _Transactions(rng.randint(0, 2**31))
+    name = rng.choice(_NAMES)
+    account = str(rng.randint(10**9, 10**10 - 1))
+    with fitz.open() as doc:
+        rows = LAYOUTS[parser_name](doc, font, pages, tx, name, account)
+        doc.subset_fonts()
+        doc.save(str(path), garbage=3, deflate=True)
+    return rows
+
+
+# ---------------------------------------------------------------------------
+# Measurement (runs in a child process)
+
+
+def _measure(path: str, repeat: int, stream: bool) -> Dict[str, Any]:
+    import logging
+
+    logging.disable(logging.INFO)  # the parsers log every header line at INFO
+    from app.pipeline import parser_adapter
+    from app.pipeline.bank_parser.registry import clear_detection_cache, detect_bank
+    from app.utils import timing
+
+    runs: List[Dict[str, float]] = []
+    bank, row_count = None, 0
+    for _ in range(repeat):
+        clear_detection_cache()  # measure cold detection, not the page-1 hash cache
+        start = time.perf_counter()
+        with timing.collect() as timings:
+            if stream:
+                parsed = parser_adapter.parse(path, keep_rows=False)
+                bank, row_count = parsed["bank_code"], parsed["stats"]["row_count"]
+            else:
+                rows, bank, _name, _account = detect_bank(path)
+                row_count = len(rows or [])
+        timings["total"] = time.perf_counter() - start
+        runs.append(timings)
+    return {
+        "bank": bank,
+        "rows": row_count,
+        "runs": runs,
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def run_case(
+    parser_name: str, pages: int, path: Path, expected_rows: int, repeat: int, stream: bool = False
+) -> Dict[str, Any]:
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+        measured = pool.submit(_measure, str(path), repeat, stream).result()
+    runs = measured["runs"]
+    total = statistics.median(run["total"] for run in runs)
+    phases = {phase: round(statistics.median(run.get(phase, 0.0) for run in runs), 4) for phase in PHASES}
+    phases["other"] = round(max(total - sum(phases.values()), 0.0), 4)
+    return {
+        "parser": parser_name,
+        "bank": measured["bank"],
+        "pages": pages,
+        "generated_rows": expected_rows,
+        "rows": measured["rows"],
+        "seconds": round(total, 4),
+        "pages_per_s": round(pages / total, 2) if total else 0.0,
+        "rows_per_s": round(measured["rows"] / total, 1) if total else 0.0,
+        "peak_rss_mb": measured["peak_rss_mb"],
+        "phases": phases,
+    }
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+
+
+def _key(case: Dict[str, Any]) -> str:
+    return f"{case['parser']}@{case['pages']}"
+
+
+def print_report(cases: Sequence[Dict[str, Any]]) -> None:
+    header = f"{'parser':<18}{'bank':<12}{'pages':>6}{'rows':>7}{'s':>8}{'pages/s':>9}{'rows/s':>9}{'RSS MB':>8}"
+    split = "".join(f"{phase.split('.')[-1]:>8}" for phase in (*PHASES, "other"))
+    print(header + "   split %:" + split)
+    for case in cases:
+        total = case["seconds"] or 1.0
+        shares = "".join(f"{100 * case['phases'][phase] / total:>8.1f}" for phase in (*PHASES, "other"))
+        print(
+            f"{case['parser']:<18}{str(case['bank']):<12}{case['pages']:>6}{case['rows']:>7}{case['seconds']:>8.2f}"
+            f"{case['pages_per_s']:>9.2f}{case['rows_per_s']:>9.1f}{case['peak_rss_mb']:>8.1f}{' ' * 11}{shares}"
+        )
+
+
+def print_rss_growth(cases: Sequence[Dict[str, Any]]) -> None:
+    """Peak RSS slope between each parser's smallest and largest page count."""
+    by_parser: Dict[str, List[Dict[str, Any]]] = {}
+    for case in cases:
+        by_parser.setdefault(case["parser"], []).append(case)
+    print("Peak RSS growth:")
+    for name, runs in by_parser.items():
+        low, high = min(runs, key=lambda c: c["pages"]), max(runs, key=lambda c: c["pages"])
+        if high["pages"] == low["pages"]:
+            continue
+        slope = (high["peak_rss_mb"] - low["peak_rss_mb"]) / (high["pages"] - low["pages"])
+        print(
+            f"  {name:<18}{low['peak_rss_mb']:>8.1f} MB @ {low['pages']} pages -> "
+            f"{high['peak_rss_mb']:>8.1f} MB @ {high['pages']} pages ({100 * slope:+.1f} MB per 100 pages)"
+        )
+
+
+def compare(cases: Sequence[Dict[str, Any]], baseline: Dict[str, Any], tolerance: float) -> List[str]:
+    """Print pages/s deltas against the baseline; return the cases that regressed."""
+    previous_cases = {_key(case): case for case in baseline.get("cases", [])}
+    regressions: List[str] = []
+    print(f"Compared with baseline (tolerance {tolerance:.0%}):")
+    for case in cases:
+        key = _key(case)
+        previous = previous_cases.get(key)
+        if not previous or not previous.get("pages_per_s"):
+            continue
+        delta = (case["pages_per_s"] - previous["pages_per_s"]) / previous["pages_per_s"]
+        worse = delta < -tolerance or case["rows"] < previous["rows"]
+        flag = "  REGRESSION" if worse else ""
+        print(
+            f"  {key:<26}{previous['pages_per_s']:>9.2f} -> {case['pages_per_s']:>9.2f} pages/s ({delta:+.1%}), "
+            f"rows {previous['rows']} -> {case['rows']}{flag}"
+        )
+        if worse:
+            regressions.append(key)
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-bank parser micro-benchmark on synthetic statements")
+    parser.add_argument("--pages", type=int, nargs="+", default=[5, 25], help="Page counts to generate per bank")
+    parser.add_argument("--parsers", nargs="*", help=f"Subset of {', '.join(LAYOUTS)}")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case; the median is reported")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--font", help="TTF with Mongolian Cyrillic glyphs (default: DejaVu Sans if installed)")
+    parser.add_argument("--keep-pdfs", type=Path, help="Write the generated statements here instead of a temp dir")
+    parser.add_argument("--json", type=Path, help="Write the full result as JSON")
+    parser.add_argument("--save-baseline", type=Path)
+    parser.add_argument("--baseline", type=Path, help="Compare against a saved result; exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.20, help="Allowed pages/s drop before failing")
+    parser.add_argument(
+        "--stream", action="store_true", help="Parse page at a time via parser_adapter.parse(keep_rows=False)"
+    )
+    parser.add_argument("--max-rss-mb", type=float, help="Fail when any case's peak RSS exceeds this")
+    args = parser.parse_args()
+
+    from app.pipeline.bank_parser import plugins  # noqa: F401 - registers the parsers
+    from app.pipeline.bank_parser.registry import BANK_DETECTORS
+
+    registered = [fn.__name__ for _checker, fn in BANK_DETECTORS]
+    selected = [name for name in registered if not args.parsers or name in args.parsers]
+    font = _load_font(args.font)
+
+    cases: List[Dict[str, Any]] = []
+    failures: List[str] = []
+    with tempfile.TemporaryDirectory(prefix="uw_parsers_") as tmp:
+        workdir = args.keep_pdfs or Path(tmp)
+        workdir.mkdir(parents=True, exist_ok=True)
+        for name in selected:
+            if name not in LAYOUTS:
+                print(f"{name}: no synthetic layout, skipped")
+                continue
+            for pages in args.pages:
+                path = workdir / f"{name}_{pages}p.pdf"
+                generated = generate(name, pages, path, args.seed, font)
+                case = run_case(name, pages, path, generated, args.repeat, args.stream)
+                cases.append(case)
+                if case["rows"] != generated:
+                    failures.append(
+                        f"{name}@{pages}: detected as {case['bank']!r}, {case['rows']} of {generated} rows extracted"
+                    )
+                if args.max_rss_mb and case["peak_rss_mb"] > args.max_rss_mb:
+                    failures.append(f"{name}@{pages}: peak RSS {case['peak_rss_mb']} MB > {args.max_rss_mb} MB")
+
+    print_report(cases)
+    if len(args.pages) > 1:
+        print_rss_growth(cases)
+    for failure in failures:
+        print(f"FAILED {failure}")
+    result = {"pages": args.pages, "repeat": args.repeat, "seed": args.seed, "stream": args.stream, "cases": cases}
+    for target in (args.json, args.save_baseline):
+        if target:
+            target.write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
+    regressions: List[str] = []
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare(cases, baseline, args.tolerance)
+    if failures or regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,403 @@
+#!/usr/bin/env python
+"""End-to-end underwriting benchmark against local stand-ins.
+
+Runs ``tasks.underwrite`` (eager Celery, one job per worker thread) for the
+``mockdata`` applicants, with every external dependency served by an in-process
+HTTP stand-in: statement file server, Gemini ``generateContent``, the collateral
+ML API and the SerpApi / Tavily search providers. Latencies of the stand-ins are
+configurable so results are reproducible across machines and network conditions.
+
+Reports throughput, p50/p95/p99 per pipeline stage (from the job stage timing
+ledger) and the process memory high-water mark. Results can be saved as a
+baseline and later runs compared against it:
+
+    python scripts/bench_pipeline.py --jobs 8 --save-baseline bench_baseline.json
+    python scripts/bench_pipeline.py --jobs 8 --baseline bench_baseline.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import logging
+import os
+import random
+import resource
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+from urllib.parse import parse_qs, urlsplit
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+
+MOCK_DIR = BASE_DIR / "mockdata"
+
+# Applicant payload -> statement PDF, as in scripts/run_simulations.py.
+PDF_MAP: Dict[str, Optional[str]] = {
+    "LoanApplicant_001.json": "20230322-0622.pdf",
+    "LoanApplicant_002.json": "425590.pdf",
+    "LoanApplicant_003.json": "535971.pdf",
+    "LoanApplicant_004.json": "556468.pdf",
+    "LoanApplicant_005.json": None,
+}
+
+# Metrics compared against the baseline and the direction that counts as worse.
+_LOWER_IS_BETTER = ("p50", "p95", "p99")
+
+
+# ---------------------------------------------------------------------------
+# Stand-in services
+
+
+class _Latency:
+    """Fixed latency plus uniform jitter, in seconds."""
+
+    def __init__(self, millis: float, jitter: float) -> None:
+        self.seconds = millis / 1000.0
+        self.jitter = jitter
+
+    def sleep(self) -> None:
+        if self.seconds > 0:
+            time.sleep(self.seconds * (1 + random.uniform(-self.jitter, self.jitter)))
+
+
+def _make_handler(latencies: Dict[str, _Latency], memo_chars: int):
+    memo = "## Зээлийн шинжилгээ\n\n" + ("Орлого тогтвортой, эрсдэл дунд түвшинд байна. " * 400)[:memo_chars]
+
+    def _listing(query: str, index: int) -> Dict[str, str]:
+        seed = int(hashlib.sha256(f"{query}|{index}".encode()).hexdigest()[:8], 16)
+        size = 46 + seed % 9
+        price = size * (5 + seed % 4)
+        return {
+            "title": f"{query} {size} мкв байр",
+            "snippet": f"{size} мкв байр зарна. Үнэ {price} сая төгрөг",
+            "link": f"https://listings.example/{seed}",
+        }
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format: str, *args: Any) -> None:  # noqa: A002 - stdlib signature
+            return
+
+        def _send(self, status: int, body: bytes, content_type: str = "application/json") -> None:
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _json(self, payload: Dict[str, Any]) -> None:
+            self._send(200, json.dumps(payload, ensure_ascii=False).encode())
+
+        def _read_body(self) -> bytes:
+            length = int(self.headers.get("Content-Length") or 0)
+            return self.rfile.read(length) if length else b""
+
+        def do_GET(self) -> None:  # noqa: N802 - stdlib naming
+            parts = urlsplit(self.path)
+            if parts.path.startswith("/statements/"):
+                path = MOCK_DIR / Path(parts.path).name
+                if not path.is_file():
+                    self._send(404, b"{}")
+                    return
+                latencies["download"].sleep()
+                self._send(200, path.read_bytes(), "application/pdf")
+            elif parts.path == "/serpapi/search.json":
+                latencies["search"].sleep()
+                query = parse_qs(parts.query).get("q", [""])[0]
+                self._json({"organic_results": [_listing(query, idx) for idx in range(8)]})
+            else:
+                self._send(404, b"{}")
+
+        def do_POST(self) -> None:  # noqa: N802 - stdlib naming
+            body = self._read_body()
+            path = urlsplit(self.path).path
+            if path.endswith(":generateContent"):
+                latencies["llm"].sleep()
+                self._json(
+                    {
+                        "candidates": [{"content": {"role": "model", "parts": [{"text": memo}]}}],
+                        "usageMetadata": {"promptTokenCount": len(body) // 4},
+                    }
+                )
+            elif path == "/api/predict-price/":
+                latencies["collateral"].sleep()
+                self._json({"predicted_price": 48_500_000, "confidence": 0.82})
+            elif path == "/tavily/search":
+                latencies["search"].sleep()
+                query = json.loads(body or b"{}").get("query", "")
+                results = [_listing(query, idx) for idx in range(5)]
+                self._json({"results": [{"title": r["title"], "content": r["snippet"], "url": r["link"]} for r in results]})
+            else:
+                self._send(404, b"{}")
+
+    return Handler
+
+
+def start_standins(latencies: Dict[str, _Latency], memo_chars: int) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(latencies, memo_chars))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="bench-standins", daemon=True).start()
+    return server
+
+
+def configure_environment(base_url: str, database_url: Optional[str], workdir: Path) -> None:
+    """Point the service at the stand-ins. Must run before ``app`` is imported."""
+    from cryptography.fernet import Fernet
+
+    os.environ.update(
+        {
+            "DATABASE_URL": database_url or f"sqlite+pysqlite:///{workdir / 'bench.sqlite'}",
+            "ENCRYPTION_KEY": os.environ.get("ENCRYPTION_KEY") or Fernet.generate_key().decode(),
+            "LLM_API_KEY": "bench",
+            "LLM_API_BASE_URL": base_url,
+            "SOFTMAX_COLLATERAL_URL": base_url,
+            "COLLATERAL_API_KEY": "bench",
+            "SERPAPI_API_KEY": "bench",
+            "SERPAPI_BASE_URL": f"{base_url}/serpapi/search.json",
+            "TAVILY_API_KEY": "bench",
+            "TAVILY_BASE_URL": f"{base_url}/tavily/search",
+            "FAIR_SCHEDULING_ENABLED": "false",
+            "OTEL_ENABLED": "false",
+            "TMPDIR": str(workdir),
+        }
+    )
+    os.environ.pop("REDIS_URL", None)
+    os.environ.pop("GEMINI_API_KEY", None)
+
+
+# ---------------------------------------------------------------------------
+# Pipeline run
+
+
+def _percentile(values: Sequence[float], fraction: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    position = fraction * (len(ordered) - 1)
+    lower = int(position)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (position - lower)
+
+
+def _summarize(values: Sequence[float]) -> Dict[str, float]:
+    return {
+        "count": len(values),
+        "p50": round(_percentile(values, 0.50), 4),
+        "p95": round(_percentile(values, 0.95), 4),
+        "p99": round(_percentile(values, 0.99), 4),
+    }
+
+
+def _load_applicants(names: Sequence[str], base_url: str) -> List[Dict[str, Any]]:
+    applicants = []
+    for name in names:
+        payload = json.loads((MOCK_DIR / name).read_text(encoding="utf-8"))
+        pdf_name = PDF_MAP.get(name)
+        payload["documents"] = {"bank_statement_url": f"{base_url}/statements/{pdf_name}" if pdf_name else None}
+        applicants.append(payload)
+    return applicants
+
+
+def run_benchmark(args: argparse.Namespace, base_url: str) -> Dict[str, Any]:
+    from app.db import create_job, hash_api_key, init_db, session_scope
+    from app.models import Job, JobStageTiming, JobStatus, Tenant
+    from app.workers import tasks
+    from app.workers.celery_app import celery_app
+
+    celery_app.conf.task_always_eager = True
+    celery_app.conf.task_eager_propagates = False
+    init_db()
+
+    names = args.applicants or list(PDF_MAP)
+    applicants = _load_applicants(names, base_url)
+    with session_scope() as session:
+        tenant = session.get(Tenant, "tenant_bench")
+        if tenant is None:
+            tenant = Tenant(
+                id="tenant_bench",
+                name="Benchmark",
+                api_key_hash=hash_api_key(f"bench-{time.time()}"),
+                tenant_secret="bench",
+                webhook_secret="bench",
+            )
+            session.add(tenant)
+
+    def _create(payloads: Sequence[Dict[str, Any]]) -> List[str]:
+        with session_scope() as session:
+            tenant = session.get(Tenant, "tenant_bench")
+            return [
+                create_job(session, tenant, payload, None, f"bench-{time.time_ns()}-{index}", None).id
+                for index, payload in enumerate(payloads)
+            ]
+
+    def _run(job_id: str) -> float:
+        start = time.perf_counter()
+        tasks.underwrite(job_id)
+        return time.perf_counter() - start
+
+    if args.warmup:
+        # Pays one-off costs (lazy imports, first PDF open) outside the measured window.
+        _run(_create([dict(applicants[0], job_id="BENCH-warmup")])[0])
+
+    # All jobs are created up front, so ``queue_wait`` is the time a job waited for a
+    # free worker thread, as it would behind a saturated Celery queue.
+    job_ids = _create(
+        [dict(applicants[index % len(applicants)], job_id=f"BENCH-{index}") for index in range(args.jobs)]
+    )
+
+    if args.tracemalloc:
+        tracemalloc.start()
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+        totals = list(pool.map(_run, job_ids))
+    elapsed = time.perf_counter() - started
+    heap_peak = tracemalloc.get_traced_memory()[1] if args.tracemalloc else None
+    if args.tracemalloc:
+        tracemalloc.stop()
+
+    per_stage: Dict[str, List[float]] = {}
+    with session_scope() as session:
+        rows = session.query(JobStageTiming).filter(JobStageTiming.job_id.in_(job_ids)).all()
+        for row in rows:
+            per_stage.setdefault(row.stage, []).append(row.seconds)
+        statuses = [job.status for job in (session.get(Job, job_id) for job_id in job_ids) if job]
+    failed = sum(1 for status in statuses if status != JobStatus.succeeded)
+
+    from app.utils.timing import STAGES
+
+    stages = {stage: _summarize(per_stage[stage]) for stage in STAGES if stage in per_stage}
+    stages["total"] = _summarize(totals)
+    return {
+        "jobs": args.jobs,
+        "concurrency": args.concurrency,
+        "failed": failed,
+        "elapsed_seconds": round(elapsed, 3),
+        "throughput_jobs_per_s": round(args.jobs / elapsed, 4) if elapsed else 0.0,
+        "stages": stages,
+        # ru_maxrss is KiB on Linux.
+        "peak_rss_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "peak_python_heap_mb": round(heap_peak / 2**20, 1) if heap_peak is not None else None,
+        "standins_ms": {
+            "download": args.download_ms,
+            "llm": args.llm_ms,
+            "collateral": args.collateral_ms,
+            "search": args.search_ms,
+        },
+    }
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+
+
+def print_report(result: Dict[str, Any]) -> None:
+    print(
+        f"jobs={result['jobs']} concurrency={result['concurrency']} failed={result['failed']} "
+        f"elapsed={result['elapsed_seconds']}s throughput={result['throughput_jobs_per_s']} jobs/s"
+    )
+    print(f"{'stage':<14}{'n':>5}{'p50 s':>10}{'p95 s':>10}{'p99 s':>10}")
+    for stage, stats in result["stages"].items():
+        print(f"{stage:<14}{stats['count']:>5}{stats['p50']:>10.3f}{stats['p95']:>10.3f}{stats['p99']:>10.3f}")
+    heap = result.get("peak_python_heap_mb")
+    print(f"peak RSS {result['peak_rss_mb']} MB" + (f", peak Python heap {heap} MB" if heap is not None else ""))
+
+
+def compare(result: Dict[str, Any], baseline: Dict[str, Any], tolerance: float, min_delta: float) -> List[str]:
+    """Print deltas against the baseline and return the metrics that regressed beyond ``tolerance``.
+
+    Stage timings must also move by at least ``min_delta`` seconds, so millisecond
+    stages (fuse, persist) do not flag on noise.
+    """
+    regressions: List[str] = []
+
+    def _check(name: str, current: float, previous: float, lower_is_better: bool, floor: float = 0.0) -> None:
+        if not previous:
+            return
+        delta = (current - previous) / previous
+        if abs(current - previous) < floor:
+            worse = False
+        else:
+            worse = delta > tolerance if lower_is_better else delta < -tolerance
+        flag = "  REGRESSION" if worse else ""
+        print(f"  {name:<28}{previous:>12.4f} -> {current:>12.4f} ({delta:+.1%}){flag}")
+        if worse:
+            regressions.append(name)
+
+    print(f"Compared with baseline (tolerance {tolerance:.0%}):")
+    _check("throughput_jobs_per_s", result["throughput_jobs_per_s"], baseline.get("throughput_jobs_per_s", 0), False)
+    for stage, stats in result["stages"].items():
+        previous = baseline.get("stages", {}).get(stage)
+        if not previous:
+            continue
+        for key in _LOWER_IS_BETTER:
+            _check(f"{stage}.{key}", stats[key], previous.get(key, 0), True, floor=min_delta)
+    _check("peak_rss_mb", result["peak_rss_mb"], baseline.get("peak_rss_mb", 0), True)
+    return regressions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="End-to-end pipeline benchmark with local stand-ins")
+    parser.add_argument("--jobs", type=int, default=8)
+    parser.add_argument("--concurrency", type=int, default=4, help="Worker threads running jobs")
+    parser.add_argument("--applicants", nargs="*", help=f"Subset of {', '.join(PDF_MAP)}")
+    parser.add_argument("--llm-ms", type=float, default=1500.0, help="Stand-in Gemini latency")
+    parser.add_argument("--collateral-ms", type=float, default=150.0, help="Stand-in collateral ML latency")
+    parser.add_argument("--search-ms", type=float, default=300.0, help="Stand-in SerpApi/Tavily latency per query")
+    parser.add_argument("--download-ms", type=float, default=20.0, help="Stand-in statement download latency")
+    parser.add_argument("--jitter", type=float, default=0.2, help="Uniform ± jitter fraction on stand-in latency")
+    parser.add_argument("--memo-chars", type=int, default=6000)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--database-url", help="Defaults to a throwaway SQLite file")
+    parser.add_argument("--no-warmup", dest="warmup", action="store_false")
+    parser.add_argument("--tracemalloc", action="store_true", help="Also track the Python heap peak (slower)")
+    parser.add_argument("--log-level", default="WARNING", choices=["DEBUG", "INFO", "WARNING", "ERROR"])
+    parser.add_argument("--json", type=Path, help="Write the full result as JSON")
+    parser.add_argument("--save-baseline", type=Path)
+    parser.add_argument("--baseline", type=Path, help="Compare against a saved result; exit 1 on regression")
+    parser.add_argument("--tolerance", type=float, default=0.15)
+    parser.add_argument("--min-delta-ms", type=float, default=50.0, help="Ignore stage changes smaller than this")
+    args = parser.parse_args()
+
+    random.seed(args.seed)
+    latencies = {
+        "download": _Latency(args.download_ms, args.jitter),
+        "llm": _Latency(args.llm_ms, args.jitter),
+        "collateral": _Latency(args.collateral_ms, args.jitter),
+        "search": _Latency(args.search_ms, args.jitter),
+    }
+    server = start_standins(latencies, args.memo_chars)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    with tempfile.TemporaryDirectory(prefix="uw_bench_") as workdir:
+        configure_environment(base_url, args.database_url, Path(workdir))
+        from app.logging import configure_logging
+
+        configure_logging(getattr(logging, args.log_level))
+        try:
+            result = run_benchmark(args, base_url)
+        finally:
+            server.shutdown()
+
+    print_report(result)
+    for target in (args.json, args.save_baseline):
+        if target:
+            target.write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        regressions = compare(result, baseline, args.tolerance, args.min_delta_ms / 1000.0)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
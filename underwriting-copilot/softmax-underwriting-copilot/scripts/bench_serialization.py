@@ -0,0 +1,136 @@
+#!/usr/bin/env python
+"""Measure per-job JSON serialization CPU: stdlib json (legacy) vs app.utils.serialization."""
+
+from __future__ import annotations
+
+import argparse
+import datetime as dt
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List
+
+BASE_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BASE_DIR))
+
+from app.utils import serialization  # noqa: E402
+
+MOCK_DIR = BASE_DIR / "mockdata"
+
+
+def _synthetic_rows(count: int) -> List[List[Any]]:
+    start = dt.datetime(2024, 1, 1, 9, 30)
+    rows: List[List[Any]] = []
+    for idx in range(count):
+        stamp = start + dt.timedelta(hours=7 * idx)
+        credit = float((idx * 7919) % 450_000) if idx % 3 == 0 else 0.0
+        debit = float((idx * 104_729) % 120_000) if idx % 3 else 0.0
+        rows.append(
+            [
+                stamp.isoformat(),
+                "Гүйлгээ",
+                None,
+                debit,
+                credit,
+                1_500_000.0 + idx,
+                f"QPAY NOMIN SUPERMARKET {idx % 40}, гүйлгээний утга",
+                f"5000{idx % 60:04d}",
+            ]
+        )
+    return rows
+
+
+def build_job(row_count: int) -> Dict[str, Any]:
+    applicant = json.loads((MOCK_DIR / "LoanApplicant_001.json").read_text(encoding="utf-8"))
+    rows = _synthetic_rows(row_count)
+    parse_out = {
+        "bank_code": "KHAN",
+        "customer_name": "Бат-Эрдэнэ",
+        "account_number": "5000123456",
+        "rows": rows,
+        "stats": {"row_count": len(rows), "period_from": rows[0][0][:10], "period_to": rows[-1][0][:10]},
+    }
+    features = {
+        "credit_bureau_data": applicant,
+        "loan_request": applicant.get("requestedLoan"),
+        "bank_statement": {"average_monthly_income_mnt": 2_450_000.0, "statement_period": "2024-01 to 2024-12"},
+        "collateral": {"original_payload": (applicant.get("collateralOffered") or [{}])[0]},
+    }
+    memo = "## Кредит мемо\n\n" + ("Орлого тогтвортой, эрсдэл дунд. " * 120)
+    webhook = {
+        "event": "memo.generated",
+        "job_id": "uwo_bench",
+        "client_job_id": "BANK-1",
+        "decision": "REVIEW",
+        "interest_rate_suggestion": 3.4,
+        "risk_score": 0.42,
+        "llm_input": features,
+        "credit_memo_markdown": memo,
+        "attachments": [],
+        "audit_ref": "audit_bench",
+        "timestamp": "2025-01-01T00:00:00Z",
+    }
+    return {
+        "payload": applicant,
+        "parse_out": parse_out,
+        "features": features,
+        "json_tail": {"parser": parse_out, "collateral": features["collateral"], "llm_raw_response": {"text": memo}},
+        "webhook": webhook,
+    }
+
+
+def legacy_job(job: Dict[str, Any]) -> None:
+    def _copy(value: Any) -> Any:
+        return json.loads(json.dumps(value, ensure_ascii=False))
+
+    for key in ("credit_bureau_data", "loan_request", "collateral"):
+        _copy(job["features"][key])
+    json.dumps(job["payload"], ensure_ascii=False).encode()  # encrypt_json(payload)
+    json.dumps(job["features"], ensure_ascii=False).encode()  # encrypt_json(features)
+    json.dumps(job["features"], ensure_ascii=False).encode("utf-8")  # generate_memo prompt
+    json.dumps(job["json_tail"], ensure_ascii=False).encode()  # encrypt_json(json_tail)
+    json.dumps(job["webhook"], separators=(",", ":"), ensure_ascii=False).encode()  # sign_json
+    json.dumps(job["webhook"], ensure_ascii=False).encode()  # webhooks.emit body
+    json.loads(json.dumps(job["json_tail"], ensure_ascii=False))  # decrypt_json on read
+
+
+def current_job(job: Dict[str, Any]) -> None:
+    for key in ("credit_bureau_data", "loan_request", "collateral"):
+        serialization.copy_json(job["features"][key])
+    serialization.dumps(job["payload"])
+    serialization.dumps(job["features"])
+    serialization.dumps(job["features"])
+    serialization.dumps(job["json_tail"])
+    serialization.dumps_signed(job["webhook"])  # sign_json
+    serialization.dumps(job["webhook"])
+    serialization.loads(serialization.dumps(job["json_tail"]))
+
+
+def measure(fn: Callable[[Dict[str, Any]], None], job: Dict[str, Any], iterations: int) -> float:
+    fn(job)  # warm-up
+    start = time.process_time()
+    for _ in range(iterations):
+        fn(job)
+    return (time.process_time() - start) / iterations
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Per-job serialization CPU benchmark")
+    parser.add_argument("--rows", type=int, default=2000, help="Statement rows carried in the parser output")
+    parser.add_argument("--iterations", type=int, default=200)
+    args = parser.parse_args()
+
+    job = build_job(args.rows)
+    legacy = measure(legacy_job, job, args.iterations)
+    current = measure(current_job, job, args.iterations)
+
+    print(f"Rows per job: {args.rows}")
+    print(f"stdlib json   : {legacy * 1000:8.3f} ms CPU/job")
+    print(f"orjson module : {current * 1000:8.3f} ms CPU/job")
+    if current > 0:
+        print(f"speed-up      : {legacy / current:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
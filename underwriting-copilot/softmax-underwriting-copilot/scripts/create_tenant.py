@@ -12,7 +12,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from app.config import get_settings
 from app.db import hash_secret, session_scope
-from app.models import Tenant
+from app.models import Tenant, WebhookPayloadMode
 
 
 def generate_client_secret(length: int = 32) -> str:
@@ -20,7 +20,7 @@ def generate_client_secret(length: int = 32) -> str:
     return secrets.token_urlsafe(length)
 
 
-def create_tenant(name: str, client_id: str) -> dict:
+def create_tenant(name: str, client_id: str, webhook_payload_mode: str = "full") -> dict:
     """Create a new tenant with the given parameters."""
     settings = get_settings()
 
@@ -57,6 +57,7 @@ def create_tenant(name: str, client_id: str) -> dict:
             tenant_secret=tenant_secret,
             webhook_secret=webhook_secret,
             rate_limit_rps=10,
+            rate_limit_cfg={"webhook_payload_mode": WebhookPayloadMode(webhook_payload_mode).value},
         )
         session.add(tenant)
         session.commit()
@@ -86,13 +87,19 @@ def main():
         required=True,
         help="Unique client ID (e.g., 'admin_prod', 'bank_xyz')",
     )
+    parser.add_argument(
+        "--webhook-payload-mode",
+        choices=[mode.value for mode in WebhookPayloadMode],
+        default="full",
+        help="'reference' sends signed fetch URLs instead of inline features/memo",
+    )
     args = parser.parse_args()
 
     print(f"Creating tenant: {args.name}")
     print(f"Client ID: {args.client_id}")
     print()
 
-    result = create_tenant(args.name, args.client_id)
+    result = create_tenant(args.name, args.client_id, args.webhook_payload_mode)
 
     if "error" in result:
         sys.exit(1)
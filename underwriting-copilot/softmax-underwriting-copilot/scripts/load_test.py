@@ -1,16 +1,37 @@
 #!/usr/bin/env python
-"""Simple load generator for the underwriting API sandbox."""
+"""Open-loop load generator for the underwriting API.
+
+Requests are issued on an arrival schedule (constant or Poisson, optionally in
+rate steps) regardless of how fast the server answers, with at most
+``--concurrency`` requests in flight. Each request's latency is measured twice:
+
+* ``corrected``   - from its *scheduled* send time, so queueing behind a slow
+  server counts (coordinated-omission corrected);
+* ``uncorrected`` - from the moment it actually went on the wire (service time).
+
+Traffic is a weighted mix of ``POST /v1/underwrite``, ``GET /v1/jobs/{id}``,
+dashboard reads and the loan-assistant chat. Accepted underwriting jobs are
+polled to completion, which yields an end-to-end latency distribution as well.
+Per-endpoint histograms can be exported in HdrHistogram's ``.hgrm`` percentile
+format for plotting.
+
+    python scripts/load_test.py --base-url http://localhost:8080 --api-key KEY \\
+        --tenant-secret SECRET --tenant-id TENANT --rate 20 --duration 60 \\
+        --arrival poisson --mix underwrite=70,job=20,dashboard=10 --hgrm-dir out/
+"""
 
 from __future__ import annotations
 
 import argparse
 import asyncio
 import json
-import statistics
+import math
+import random
 import sys
 import time
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 # Add project root to sys.path
 sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
@@ -18,56 +39,386 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
 import httpx
 
 from app.security import sign_payload
+from app.utils.serialization import dumps
+
+TERMINAL_STATUSES = {"succeeded", "failed"}
+ENDPOINTS = ("underwrite", "job", "dashboard", "chat")
+
+
+# ---------------------------------------------------------------------------
+# Latency histogram
+
+
+class LatencyHistogram:
+    """HdrHistogram-style log-linear histogram over integer microseconds.
+
+    Values keep ``significant_figures`` of precision: each power-of-two range is
+    split into ``2 * 10**significant_figures`` (rounded up to a power of two)
+    linear sub-buckets, so recording is O(1) and memory is bounded by the range.
+    """
+
+    def __init__(self, significant_figures: int = 3) -> None:
+        self.sub_bucket_bits = math.ceil(math.log2(2 * 10**significant_figures))
+        self.sub_bucket_count = 1 << self.sub_bucket_bits
+        self._counts: Dict[Tuple[int, int], int] = {}
+        self.total = 0
+        self.max_us = 0
+        self._sum = 0.0
+        self._sum_sq = 0.0
+
+    def _key(self, value: int) -> Tuple[int, int]:
+        shift = max(value.bit_length() - self.sub_bucket_bits, 0)
+        return shift, value >> shift
+
+    @staticmethod
+    def _highest_equivalent(key: Tuple[int, int]) -> int:
+        shift, sub = key
+        return ((sub + 1) << shift) - 1
+
+    def record(self, seconds: float) -> None:
+        value = max(int(seconds * 1_000_000), 0)
+        key = self._key(value)
+        self._counts[key] = self._counts.get(key, 0) + 1
+        self.total += 1
+        self.max_us = max(self.max_us, value)
+        self._sum += value
+        self._sum_sq += value * value
+
+    def mean_ms(self) -> float:
+        return self._sum / self.total / 1000.0 if self.total else 0.0
+
+    def stddev_ms(self) -> float:
+        if not self.total:
+            return 0.0
+        mean = self._sum / self.total
+        return math.sqrt(max(self._sum_sq / self.total - mean * mean, 0.0)) / 1000.0
+
+    def _cumulative(self) -> Iterator[Tuple[int, int]]:
+        running = 0
+        for key in sorted(self._counts):
+            running += self._counts[key]
+            yield min(self._highest_equivalent(key), self.max_us), running
+
+    def value_at_ms(self, percentile: float) -> float:
+        if not self.total:
+            return 0.0
+        target = max(math.ceil(percentile / 100.0 * self.total), 1)
+        for value, running in self._cumulative():
+            if running >= target:
+                return value / 1000.0
+        return self.max_us / 1000.0
+
+    def _percentile_ticks(self, ticks_per_half_distance: int) -> Iterator[float]:
+        # Each halving of the distance to 100% gets the same number of rows.
+        level = 0
+        while True:
+            low, high = 1 - 0.5**level, 1 - 0.5 ** (level + 1)
+            for tick in range(ticks_per_half_distance):
+                percentile = low + (high - low) * tick / ticks_per_half_distance
+                if 1 - percentile < 1 / self.total:
+                    yield 1.0
+                    return
+                yield percentile
+            level += 1
+
+    def to_hgrm(self, ticks_per_half_distance: int = 5) -> str:
+        """Percentile distribution in the text format HdrHistogram's plotter reads (values in ms)."""
+        lines = [f"{'Value':>12} {'Percentile':>14} {'TotalCount':>10} {'1/(1-Percentile)':>14}", ""]
+        if self.total:
+            cumulative = list(self._cumulative())
+            index = 0
+            for percentile in self._percentile_ticks(ticks_per_half_distance):
+                target = max(math.ceil(percentile * self.total), 1)
+                while cumulative[index][1] < target:
+                    index += 1
+                value, running = cumulative[index]
+                inverse = f"{1 / (1 - percentile):14.2f}" if percentile < 1 else f"{'inf':>14}"
+                lines.append(f"{value / 1000.0:12.3f} {percentile:14.12f} {running:10d} {inverse}")
+        lines.append(f"#[Mean    = {self.mean_ms():12.3f}, StdDeviation   = {self.stddev_ms():12.3f}]")
+        lines.append(f"#[Max     = {self.max_us / 1000.0:12.3f}, Total count    = {self.total:12d}]")
+        lines.append(f"#[Buckets = {len({shift for shift, _ in self._counts}):12d}, SubBuckets     = {self.sub_bucket_count:12d}]")
+        return "\n".join(lines) + "\n"
+
+
+@dataclass
+class EndpointStats:
+    corrected: LatencyHistogram = field(default_factory=LatencyHistogram)
+    uncorrected: LatencyHistogram = field(default_factory=LatencyHistogram)
+    errors: Dict[str, int] = field(default_factory=dict)
+
+    def error(self, kind: str) -> None:
+        self.errors[kind] = self.errors.get(kind, 0) + 1
+
 
-FIXTURES = Path(__file__).resolve().parents[1] / "tests" / "fixtures"
+# ---------------------------------------------------------------------------
+# Arrival schedule
 
 
-def load_payload() -> Dict[str, Any]:
-    return json.loads((FIXTURES / "payload.json").read_text())
+def parse_steps(raw: Optional[str], rate: float, duration: float) -> List[Tuple[float, float]]:
+    """``"5:30,10:30,20:60"`` -> [(rate, seconds), ...]; defaults to one ``rate`` x ``duration`` step."""
+    if not raw:
+        return [(rate, duration)]
+    steps = []
+    for chunk in raw.split(","):
+        step_rate, _, seconds = chunk.partition(":")
+        steps.append((float(step_rate), float(seconds)))
+    return steps
 
 
-async def submit_job(
-    client: httpx.AsyncClient,
-    url: str,
-    payload: Dict[str, Any],
-    api_key: str,
-    tenant_secret: str,
-) -> float:
-    body = json.dumps(payload, ensure_ascii=False).encode()
-    headers = {
-        "Content-Type": "application/json",
-        "X-Api-Key": api_key,
-        "X-Signature": sign_payload(body, tenant_secret),
+def arrival_offsets(steps: List[Tuple[float, float]], process: str, rng: random.Random) -> Iterator[float]:
+    """Scheduled send times in seconds from the start of the run."""
+    step_start = 0.0
+    for rate, seconds in steps:
+        step_end = step_start + seconds
+        if rate > 0:
+            at = step_start
+            while True:
+                at += rng.expovariate(rate) if process == "poisson" else 1.0 / rate
+                if at >= step_end:
+                    break
+                yield at
+        step_start = step_end
+
+
+def parse_mix(raw: str) -> Dict[str, float]:
+    mix: Dict[str, float] = {}
+    for chunk in raw.split(","):
+        name, _, weight = chunk.partition("=")
+        name = name.strip()
+        if name not in ENDPOINTS:
+            raise SystemExit(f"Unknown endpoint in --mix: {name!r} (expected one of {', '.join(ENDPOINTS)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+# ---------------------------------------------------------------------------
+# Load generator
+
+
+def default_payload(statement_url: Optional[str]) -> Dict[str, Any]:
+    return {
+        "job_id": "load",
+        "tenant_id": "tenant",
+        "applicant": {"citizen_id": "УБ99010112", "full_name": "Load Test", "phone": "99119911"},
+        "loan": {"type": "consumer", "amount": 5_000_000, "term_months": 12},
+        "documents": {"bank_statement_url": statement_url} if statement_url else None,
+        "callback_url": "https://example.com/callback",
     }
-    start = time.perf_counter()
-    response = await client.post(url, content=body, headers=headers)
-    response.raise_for_status()
-    return time.perf_counter() - start
+
+
+class LoadGenerator:
+    def __init__(self, args: argparse.Namespace, client: httpx.AsyncClient) -> None:
+        self.args = args
+        self.client = client
+        self.rng = random.Random(args.seed)
+        self.semaphore = asyncio.Semaphore(args.concurrency)
+        self.stats: Dict[str, EndpointStats] = {}
+        self.end_to_end = EndpointStats()
+        self.job_ids: List[str] = []
+        self.bearer: Optional[str] = None
+        self.template = self._load_template()
+        self.submitted = 0
+        self._pollers: List[asyncio.Task] = []
+
+    def _load_template(self) -> Dict[str, Any]:
+        if self.args.payload:
+            template = json.loads(Path(self.args.payload).read_text(encoding="utf-8"))
+        else:
+            template = default_payload(self.args.statement_url)
+        template["tenant_id"] = self.args.tenant_id
+        return template
+
+    def _stats(self, endpoint: str) -> EndpointStats:
+        return self.stats.setdefault(endpoint, EndpointStats())
+
+    async def fetch_dashboard_token(self) -> None:
+        response = await self.client.post(
+            "/oauth/token",
+            json={
+                "grant_type": "client_credentials",
+                "client_id": self.args.client_id,
+                "client_secret": self.args.client_secret,
+                "scope": "underwrite:read dashboard:read",
+            },
+        )
+        response.raise_for_status()
+        self.bearer = response.json()["access_token"]
+
+    def _request_for(self, endpoint: str) -> Tuple[str, str, Dict[str, Any]]:
+        if endpoint == "job" and self.job_ids:
+            job_id = self.rng.choice(self.job_ids)
+            return "GET", f"/v1/jobs/{job_id}", {"headers": {"X-Api-Key": self.args.api_key}}
+        if endpoint == "dashboard" and self.bearer:
+            path = self.rng.choice(("/v1/dashboard/tenant/jobs", "/v1/dashboard/tenant/summary"))
+            return "GET", path, {"headers": {"Authorization": f"Bearer {self.bearer}"}}
+        if endpoint == "chat":
+            body = {"messages": [{"role": "user", "content": "Хэрэглээний зээлийн нөхцөл юу вэ?"}]}
+            return "POST", "/v1/chat/loan-assistant", {"json": body}
+
+        # underwrite, and the fallback for job reads before any job exists.
+        self.submitted += 1
+        # Shallow copy: only the top-level job_id differs between requests.
+        body = dumps(dict(self.template, job_id=f"{self.args.job_prefix}-{self.submitted}"))
+        headers = {
+            "Content-Type": "application/json",
+            "X-Api-Key": self.args.api_key,
+            "X-Signature": sign_payload(body, self.args.tenant_secret),
+        }
+        if self.args.priority:
+            headers["X-Priority"] = self.args.priority
+        return "POST", "/v1/underwrite", {"content": body, "headers": headers}
+
+    async def fire(self, endpoint: str, scheduled: float) -> None:
+        method, path, kwargs = self._request_for(endpoint)
+        name = "underwrite" if path == "/v1/underwrite" else endpoint
+        stats = self._stats(name)
+        async with self.semaphore:
+            sent = time.perf_counter()
+            try:
+                response = await self.client.request(method, path, **kwargs)
+            except httpx.HTTPError as exc:
+                stats.error(type(exc).__name__)
+                return
+            finally:
+                done = time.perf_counter()
+                stats.corrected.record(done - scheduled)
+                stats.uncorrected.record(done - sent)
+        if response.status_code >= 400:
+            stats.error(str(response.status_code))
+            return
+        if name == "underwrite":
+            job_id = response.json().get("job_id")
+            if job_id:
+                self.job_ids.append(job_id)
+                if self.args.poll:
+                    self._pollers.append(asyncio.create_task(self.poll(job_id, scheduled)))
+
+    async def poll(self, job_id: str, scheduled: float) -> None:
+        deadline = time.perf_counter() + self.args.poll_timeout
+        headers = {"X-Api-Key": self.args.api_key}
+        while time.perf_counter() < deadline:
+            await asyncio.sleep(self.args.poll_interval)
+            try:
+                response = await self.client.get(f"/v1/jobs/{job_id}", headers=headers)
+            except httpx.HTTPError as exc:
+                self.end_to_end.error(type(exc).__name__)
+                continue
+            if response.status_code != 200:
+                continue
+            status = response.json()["data"]["status"]
+            if status in TERMINAL_STATUSES:
+                elapsed = time.perf_counter() - scheduled
+                self.end_to_end.corrected.record(elapsed)
+                if status == "failed":
+                    self.end_to_end.error("job_failed")
+                return
+        self.end_to_end.error("poll_timeout")
+
+    async def run(self) -> float:
+        mix = parse_mix(self.args.mix)
+        if mix.get("dashboard"):
+            if self.args.client_id and self.args.client_secret:
+                await self.fetch_dashboard_token()
+            else:
+                print("dashboard traffic needs --client-id/--client-secret; dropping it from the mix")
+                mix.pop("dashboard")
+        names, weights = zip(*mix.items())
+
+        steps = parse_steps(self.args.steps, self.args.rate, self.args.duration)
+        in_flight: List[asyncio.Task] = []
+        start = time.perf_counter()
+        for offset in arrival_offsets(steps, self.args.arrival, self.rng):
+            scheduled = start + offset
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            endpoint = self.rng.choices(names, weights)[0]
+            in_flight.append(asyncio.create_task(self.fire(endpoint, scheduled)))
+        await asyncio.gather(*in_flight)
+        elapsed = time.perf_counter() - start
+        if self._pollers:
+            await asyncio.gather(*self._pollers)
+        return elapsed
+
+
+# ---------------------------------------------------------------------------
+# Reporting
+
+
+def _row(label: str, histogram: LatencyHistogram) -> str:
+    values = [histogram.value_at_ms(p) for p in (50, 90, 99, 99.9)]
+    return (
+        f"  {label:<12}{histogram.total:>8}"
+        + "".join(f"{value:>11.1f}" for value in values)
+        + f"{histogram.max_us / 1000.0:>11.1f}"
+    )
+
+
+def report(generator: LoadGenerator, elapsed: float, hgrm_dir: Optional[Path]) -> Dict[str, Any]:
+    print(f"Run time {elapsed:.1f}s, {sum(s.corrected.total for s in generator.stats.values())} requests")
+    print(f"  {'':<12}{'count':>8}{'p50 ms':>11}{'p90 ms':>11}{'p99 ms':>11}{'p99.9 ms':>11}{'max ms':>11}")
+    summary: Dict[str, Any] = {"elapsed_seconds": round(elapsed, 3), "endpoints": {}}
+    sections = dict(generator.stats)
+    if generator.end_to_end.corrected.total or generator.end_to_end.errors:
+        sections["end_to_end"] = generator.end_to_end
+    for name, stats in sections.items():
+        print(f"{name}  ({stats.corrected.total / elapsed if elapsed else 0:.2f}/s, errors {stats.errors or 0})")
+        print(_row("corrected", stats.corrected))
+        if stats.uncorrected.total:
+            print(_row("uncorrected", stats.uncorrected))
+        summary["endpoints"][name] = {
+            "count": stats.corrected.total,
+            "errors": stats.errors,
+            **{
+                f"{kind}_p{p}_ms": histogram.value_at_ms(p)
+                for kind, histogram in (("corrected", stats.corrected), ("uncorrected", stats.uncorrected))
+                if histogram.total
+                for p in (50, 90, 99, 99.9)
+            },
+        }
+        if hgrm_dir:
+            hgrm_dir.mkdir(parents=True, exist_ok=True)
+            (hgrm_dir / f"{name}.corrected.hgrm").write_text(stats.corrected.to_hgrm())
+            if stats.uncorrected.total:
+                (hgrm_dir / f"{name}.uncorrected.hgrm").write_text(stats.uncorrected.to_hgrm())
+    return summary
 
 
 async def main() -> None:
-    parser = argparse.ArgumentParser(description="Softmax underwriting load test")
-    parser.add_argument("--api", default="http://localhost:8080/v1/underwrite")
-    parser.add_argument("--jobs", type=int, default=100)
+    parser = argparse.ArgumentParser(description="Softmax underwriting open-loop load test")
+    parser.add_argument("--base-url", default="http://localhost:8080")
     parser.add_argument("--api-key", required=True)
     parser.add_argument("--tenant-secret", required=True)
     parser.add_argument("--tenant-id", required=False, default="tenant")
+    parser.add_argument("--client-id", help="OAuth client id, needed for dashboard traffic")
+    parser.add_argument("--client-secret")
+    parser.add_argument("--rate", type=float, default=10.0, help="Arrivals per second")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds of arrivals")
+    parser.add_argument("--steps", help='Rate ramp as "RATE:SECONDS,..." (overrides --rate/--duration)')
+    parser.add_argument("--arrival", choices=["constant", "poisson"], default="poisson")
+    parser.add_argument("--concurrency", type=int, default=64, help="Maximum requests in flight")
+    parser.add_argument("--mix", default="underwrite=70,job=20,dashboard=10", help="Weighted endpoint mix")
+    parser.add_argument("--payload", help="Canonical payload JSON used as the underwrite template")
+    parser.add_argument("--statement-url", help="bank_statement_url for the built-in payload")
+    parser.add_argument("--priority", choices=["interactive", "bulk"], help="X-Priority header for submissions")
+    parser.add_argument("--job-prefix", default=f"load-{int(time.time())}")
+    parser.add_argument("--no-poll", dest="poll", action="store_false", help="Do not follow jobs to completion")
+    parser.add_argument("--poll-interval", type=float, default=1.0)
+    parser.add_argument("--poll-timeout", type=float, default=300.0)
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--hgrm-dir", type=Path, help="Write per-endpoint .hgrm percentile distributions here")
+    parser.add_argument("--json", type=Path, help="Write the summary as JSON")
     args = parser.parse_args()
 
-    payload_template = load_payload()
-
-    async with httpx.AsyncClient(timeout=30) as client:
-        durations = []
-        for i in range(args.jobs):
-            payload = json.loads(json.dumps(payload_template))
-            payload["job_id"] = f"load-{i}"
-            payload["tenant_id"] = args.tenant_id
-            duration = await submit_job(client, args.api, payload, args.api_key, args.tenant_secret)
-            durations.append(duration)
+    limits = httpx.Limits(max_connections=args.concurrency * 2, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=args.timeout, limits=limits) as client:
+        generator = LoadGenerator(args, client)
+        elapsed = await generator.run()
 
-    p95 = statistics.quantiles(durations, n=100, method="inclusive")[94] if len(durations) >= 20 else max(durations)
-    print(f"Jobs sent: {len(durations)}")
-    print(f"p95 latency: {p95:.2f}s")
+    summary = report(generator, elapsed, args.hgrm_dir)
+    if args.json:
+        args.json.write_text(json.dumps(summary, indent=2) + "\n", encoding="utf-8")
 
 
 if __name__ == "__main__":
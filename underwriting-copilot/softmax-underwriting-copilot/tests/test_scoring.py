@@ -0,0 +1,147 @@
+"""Unit tests for the deterministic risk pre-score (app/pipeline/scoring.py)."""
+
+from __future__ import annotations
+
+import copy
+from typing import Any, Dict
+
+import pytest
+
+from app.pipeline import scoring
+from app.pipeline.scoring import APPROVE, DECLINE, REVIEW, RiskPolicy, policy_for, score_application
+
+
+def _payload(
+    *,
+    salary: float = 5_000_000,
+    monthly_debt: float = 300_000,
+    max_dpd: int = 0,
+    loan_amount: float = 10_000_000,
+    installment: float = 400_000,
+    with_bureau: bool = True,
+) -> Dict[str, Any]:
+    payload: Dict[str, Any] = {
+        "requestedLoan": {
+            "amountMNT": loan_amount,
+            "termMonths": 36,
+            "aprPct": 18.0,
+            "estimatedMonthlyInstallmentMNT": installment,
+        },
+        "collateralOffered": [{"type": "VEHICLE", "estimatedValueMNT": 40_000_000}],
+        "social_insurance_data": {
+            "listData": [
+                {"year": 2024, "month": month, "salary": salary, "isPayed": "Төлсөн", "orgName": "ХХК"}
+                for month in range(1, 13)
+            ]
+        },
+    }
+    if with_bureau:
+        payload["credit_bureau_data"] = {
+            "summary": {
+                "openAccounts": 1,
+                "totalMonthlyPaymentMNT": monthly_debt,
+                "maxDPDLast24M": max_dpd,
+                "numDPD1to29Last12M": 0,
+                "numInquiriesLast6M": 0,
+            },
+            "accounts": [],
+        }
+    return payload
+
+
+def _score(payload: Dict[str, Any], policy: RiskPolicy = RiskPolicy(mode="annotate")) -> scoring.RiskAssessment:
+    return score_application(payload, None, None, policy)
+
+
+def test_clean_application_is_not_declined():
+    assessment = _score(_payload())
+    assert assessment.decision in (APPROVE, REVIEW)
+    assert assessment.reasons == []
+    assert assessment.interest_rate_suggestion is not None
+    assert 0.0 <= assessment.risk_score <= 1.0
+
+
+@pytest.mark.parametrize(
+    "overrides, reason",
+    [
+        ({"monthly_debt": 3_000_000, "installment": 2_000_000}, "dsr_above_max"),
+        ({"max_dpd": 120}, "dpd_above_max"),
+        ({"loan_amount": 60_000_000}, "ltv_above_max"),
+    ],
+)
+def test_hard_limits_decline_whatever_the_score(overrides, reason):
+    assessment = _score(_payload(**overrides))
+    assert assessment.decision == DECLINE
+    assert reason in assessment.reasons
+    assert assessment.interest_rate_suggestion is None
+
+
+def test_hard_limit_follows_the_policy_threshold():
+    payload = _payload(max_dpd=30)
+    assert "dpd_above_max" not in _score(payload).reasons
+    assessment = _score(payload, RiskPolicy(mode="annotate", max_dpd=30))
+    assert assessment.decision == DECLINE
+    assert "dpd_above_max" in assessment.reasons
+
+
+def test_missing_bureau_only_ever_leads_to_review():
+    assessment = _score(_payload(with_bureau=False), RiskPolicy(mode="auto", approve_below=1.0))
+    assert assessment.decision == REVIEW
+    assert "bureau_missing" in assessment.reasons
+    assert assessment.factors["credit_history"] == 0.5
+    assert assessment.auto is False
+
+
+def test_missing_income_leads_to_review():
+    payload = _payload()
+    del payload["social_insurance_data"]
+    assessment = _score(payload, RiskPolicy(mode="auto", approve_below=1.0))
+    assert assessment.decision == REVIEW
+    assert "income_unknown" in assessment.reasons
+    assert assessment.metrics["dsrPct"] is None
+
+
+def test_auto_settles_only_clear_decisions():
+    declined = _score(_payload(max_dpd=120), RiskPolicy(mode="auto"))
+    assert declined.auto is True
+    annotated = _score(_payload(max_dpd=120), RiskPolicy(mode="annotate"))
+    assert annotated.auto is False
+
+
+def test_score_application_does_not_mutate_the_payload():
+    payload = _payload()
+    before = copy.deepcopy(payload)
+    score_application(payload, None, {"estimatedValue": 50_000_000}, RiskPolicy(mode="annotate"))
+    assert payload == before
+
+
+def test_policy_defaults_to_off():
+    assert policy_for(None).mode == "off"
+    assert policy_for({}).mode == "off"
+    assert RiskPolicy().mode == "off"
+
+
+def test_policy_uses_the_deployment_default_and_tenant_override():
+    assert policy_for({}, "annotate").mode == "annotate"
+    assert policy_for({"risk_policy": {"mode": "auto"}}, "off").mode == "auto"
+    assert policy_for({"risk_policy": {"mode": "off"}}, "auto").mode == "off"
+
+
+def test_policy_unknown_default_mode_falls_back_to_off():
+    assert policy_for({}, "bogus").mode == "off"
+
+
+def test_policy_ignores_invalid_overrides():
+    policy = policy_for(
+        {"risk_policy": {"mode": "bogus", "approve_below": "x", "max_dpd": "30", "max_dsr_pct": None}},
+        "annotate",
+    )
+    defaults = RiskPolicy()
+    assert policy.mode == "annotate"
+    assert policy.approve_below == defaults.approve_below
+    assert policy.max_dsr_pct == defaults.max_dsr_pct
+    assert policy.max_dpd == 30
+
+
+def test_policy_ignores_a_non_mapping_override():
+    assert policy_for({"risk_policy": "auto"}, "annotate") == RiskPolicy(mode="annotate")
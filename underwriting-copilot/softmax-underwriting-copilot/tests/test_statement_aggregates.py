@@ -0,0 +1,234 @@
+"""Unit tests for incremental statement aggregates (app/pipeline/statement_aggregates.py).
+
+The invariant under test: feeding a history statement by statement, with the
+rows already counted filtered out, gives the same aggregates as counting the
+distinct transactions once; a transaction is never counted twice.
+"""
+
+from __future__ import annotations
+
+import datetime as dt
+import random
+from collections import Counter
+from typing import Any, List, Optional
+
+import pytest
+
+from app.pipeline.statement_aggregates import CoveredSpan, OverlapFilter, StatementAggregates, row_fingerprint
+
+START = dt.datetime(2024, 1, 1, 9, 0)
+
+
+def _ledger(days: int = 90, per_day: int = 3) -> List[List[Any]]:
+    """Chronological rows of one account: date, branch, opening, debit, credit, balance, description, account."""
+    rows: List[List[Any]] = []
+    balance = 1_000_000
+    for day in range(days):
+        for slot in range(per_day):
+            moment = START + dt.timedelta(days=day, hours=slot)
+            if (day + slot) % 2:
+                credit, debit = 100_000 + day * 10 + slot, 0
+            else:
+                credit, debit = 0, 50_000 + day * 10 + slot
+            opening, balance = balance, balance + credit - debit
+            rows.append([moment, "ТӨВ", opening, debit, credit, balance, f"гүйлгээ {day}-{slot}", f"ACC{slot}"])
+    return rows
+
+
+def _ingest(previous: Optional[StatementAggregates], rows: List[List[Any]], batch_size: int = 7) -> StatementAggregates:
+    """What ``parser_adapter.parse_incremental`` does with one statement's batches."""
+    statement = StatementAggregates()
+    overlap = OverlapFilter(previous) if previous is not None and previous.spans else None
+    for start in range(0, len(rows), batch_size):
+        statement.add(rows[start : start + batch_size], overlap)
+    if previous is None:
+        return statement
+    # round-trip as the worker stores it between jobs
+    merged = StatementAggregates().merge(previous).merge(statement)
+    return StatementAggregates.from_dict(merged.to_dict())
+
+
+def _counted(rows: List[List[Any]]) -> StatementAggregates:
+    aggregates = StatementAggregates()
+    aggregates.add(rows)
+    return aggregates
+
+
+def _assert_same_counts(actual: StatementAggregates, expected: StatementAggregates) -> None:
+    assert actual.row_count == expected.row_count
+    assert actual.months == expected.months
+    assert actual.counterparties == expected.counterparties
+    assert actual.as_stats() == expected.as_stats()
+
+
+def test_same_statement_resubmitted_adds_nothing():
+    ledger = _ledger()
+    first = _ingest(None, ledger)
+    statement = StatementAggregates()
+    overlap = OverlapFilter(first)
+    statement.add(ledger, overlap)
+    assert statement.row_count == 0
+    assert overlap.skipped == len(ledger)
+    _assert_same_counts(_ingest(first, ledger), _counted(ledger))
+
+
+def test_extension_counts_only_the_new_rows():
+    ledger = _ledger()
+    first = _ingest(None, ledger[:150])
+    merged = _ingest(first, ledger[60:])
+    _assert_same_counts(merged, _counted(ledger))
+    assert [(span.first, span.last) for span in merged.spans] == [(START.date(), ledger[-1][0].date())]
+
+
+def test_day_split_across_statements_is_counted_once():
+    ledger = _ledger()
+    # the first statement stops after the first row of a day; the second covers that whole day again
+    cut = 3 * 40 + 1
+    assert ledger[cut - 1][0].date() == ledger[cut][0].date()
+    first = _ingest(None, ledger[:cut])
+    merged = _ingest(first, ledger[cut - 1 :])
+    _assert_same_counts(merged, _counted(ledger))
+
+
+def test_day_split_without_overlapping_rows_is_counted_once():
+    ledger = _ledger()
+    cut = 3 * 40 + 2
+    merged = _ingest(_ingest(None, ledger[:cut]), ledger[cut:])
+    _assert_same_counts(merged, _counted(ledger))
+
+
+def test_repeated_identical_transactions_on_the_split_day_are_kept():
+    ledger = _ledger(days=10)
+    day = ledger[12][0].date()
+    twin = list(ledger[12])
+    ledger.insert(13, twin)
+    assert row_fingerprint(ledger[12], ledger[12][0]) == row_fingerprint(twin, twin[0])
+    # the first statement has one of the twins, the second has both
+    first = _ingest(None, ledger[:13])
+    merged = _ingest(first, ledger[12:])
+    _assert_same_counts(merged, _counted(ledger))
+    assert merged.months["2024-01"]["rows"] == len(ledger)
+    assert first.spans[0].last == day
+
+
+def test_disjoint_statements_keep_separate_spans():
+    ledger = _ledger()
+    early, late = ledger[:30], ledger[180:]
+    merged = _ingest(_ingest(None, early), late)
+    _assert_same_counts(merged, _counted(early + late))
+    assert [(span.first, span.last) for span in merged.spans] == [
+        (early[0][0].date(), early[-1][0].date()),
+        (late[0][0].date(), late[-1][0].date()),
+    ]
+    assert merged.period_from == early[0][0].date()
+    assert merged.period_to == late[-1][0].date()
+
+
+def test_gap_filling_statement_coalesces_multi_span_history():
+    ledger = _ledger()
+    history = _ingest(_ingest(None, ledger[:30]), ledger[180:])
+    assert len(history.spans) == 2
+    # starts and ends mid-day inside the two earlier statements
+    merged = _ingest(history, ledger[25:200])
+    _assert_same_counts(merged, _counted(ledger))
+    assert len(merged.spans) == 1
+
+
+def test_statement_older_than_the_history_is_merged():
+    ledger = _ledger()
+    merged = _ingest(_ingest(None, ledger[120:]), ledger[:130])
+    _assert_same_counts(merged, _counted(ledger))
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_never_double_counts_random_statement_sequences(seed):
+    ledger = _ledger(days=30, per_day=4)
+    rng = random.Random(seed)
+    aggregates: Optional[StatementAggregates] = None
+    covered: set = set()
+    for _ in range(4):
+        start = rng.randrange(len(ledger))
+        end = rng.randrange(start, len(ledger)) + 1
+        aggregates = _ingest(aggregates, ledger[start:end], batch_size=rng.randint(1, 16))
+        covered.update(range(start, end))
+    assert aggregates is not None
+    # statements are contiguous slices, so the counted rows are every row of every covered slice
+    _assert_same_counts(aggregates, _counted([ledger[index] for index in sorted(covered)]))
+
+
+def test_undated_rows_are_counted_once_and_never_by_a_later_statement():
+    ledger = _ledger(days=5)
+    undated = [None, "", 0, 1_000, 0, 5_000, "шилжүүлэг", "ACC9"]
+    first = _ingest(None, ledger + [undated])
+    assert first.row_count == len(ledger) + 1
+    overlap = OverlapFilter(first)
+    assert overlap.is_new(undated, None) is False
+    assert overlap.skipped == 1
+
+
+def test_add_refuses_a_multi_span_history():
+    ledger = _ledger()
+    history = _ingest(_ingest(None, ledger[:30]), ledger[180:])
+    with pytest.raises(ValueError):
+        history.add(ledger[60:70])
+
+
+def _span(first: str, last: str, head: dict, tail: dict) -> CoveredSpan:
+    return CoveredSpan(dt.date.fromisoformat(first), dt.date.fromisoformat(last), Counter(head), Counter(tail))
+
+
+def test_union_keeps_the_outer_end_days():
+    merged = _span("2024-01-01", "2024-01-10", {"a": 1}, {"b": 1}).union(
+        _span("2024-01-05", "2024-01-20", {"c": 1}, {"d": 2})
+    )
+    assert (merged.first, merged.last) == (dt.date(2024, 1, 1), dt.date(2024, 1, 20))
+    assert merged.head == Counter({"a": 1})
+    assert merged.tail == Counter({"d": 2})
+
+
+def test_union_of_shared_end_days_is_a_multiset_union():
+    left = _span("2024-01-01", "2024-01-10", {"a": 2, "b": 1}, {"x": 1})
+    right = _span("2024-01-01", "2024-01-10", {"a": 1, "c": 1}, {"x": 3, "y": 1})
+    merged = left.union(right)
+    assert merged.head == Counter({"a": 2, "b": 1, "c": 1})
+    assert merged.tail == Counter({"x": 3, "y": 1})
+    # neither side is modified
+    assert left.head == Counter({"a": 2, "b": 1})
+    assert right.tail == Counter({"x": 3, "y": 1})
+
+
+def test_union_is_symmetric_in_its_bounds():
+    left = _span("2024-01-03", "2024-01-10", {"a": 1}, {"b": 1})
+    right = _span("2024-01-01", "2024-01-05", {"c": 1}, {"d": 1})
+    one, other = left.union(right), right.union(left)
+    assert (one.first, one.last, one.head, one.tail) == (other.first, other.last, other.head, other.tail)
+    assert one.head == Counter({"c": 1})
+    assert one.tail == Counter({"b": 1})
+
+
+def test_to_dict_round_trip():
+    ledger = _ledger(days=20)
+    history = _ingest(_ingest(None, ledger[:20]), ledger[40:])
+    restored = StatementAggregates.from_dict(history.to_dict())
+    assert restored.to_dict() == history.to_dict()
+    assert [(span.first, span.last, span.head, span.tail) for span in restored.spans] == [
+        (span.first, span.last, span.head, span.tail) for span in history.spans
+    ]
+
+
+@pytest.mark.parametrize("version", [None, 0, StatementAggregates.VERSION + 1, "1"])
+def test_from_dict_with_another_version_starts_empty(version):
+    data = _counted(_ledger(days=5)).to_dict()
+    data["version"] = version
+    restored = StatementAggregates.from_dict(data)
+    assert restored.row_count == 0
+    assert restored.months == {}
+    assert restored.counterparties == {}
+    assert restored.spans == []
+
+
+def test_rows_with_string_dates_are_filtered_too():
+    day_rows = [[f"2024-02-0{day}", "", 0, 0, 1_000 * day, 1_000 * day, "цалин", "ACC1"] for day in (1, 2, 3)]
+    first = _ingest(None, day_rows[:2])
+    merged = _ingest(first, day_rows)
+    _assert_same_counts(merged, _counted(day_rows))